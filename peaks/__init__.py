@@ -56,8 +56,10 @@ from peaks.core.fileIO.loaders import *
 
 # Import the core functions that should be accessible from the main peaks namespace
 from peaks.core.fileIO.data_loading import load
+from peaks.core.fileIO.data_saving import ZarrWriter
 from peaks.core.fitting.fit import load_fit
 from peaks.core.options import opts
+from peaks.core.utils.cache import peaks_cached
 from peaks.core.display.plotting import (
     plot_grid,
     plot_DCs,
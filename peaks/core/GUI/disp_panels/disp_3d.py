@@ -598,10 +598,9 @@ class _Disp3D(QtWidgets.QMainWindow):
                 self.data.attrs.get("scan_type") == "hv scan"
                 and self.data.attrs.get("eV_type") == "kinetic"
             ):
-                # Due to the particular data structure of an hv scan, take the central slice to estimate EF
-                hv = self.data.hv.data
-                middle_hv = hv[(len(hv) - 1) // 2]
-                EF = self.data.disp_from_hv(middle_hv).estimate_EF()
+                # Due to the particular data structure of an hv scan, estimate EF at each hv and take the median
+                EF = self.data.estimate_EF(dims="hv")
+                EF = float(EF.median()) if EF.notnull().any() else None
             else:
                 EF = self.data.estimate_EF()
             if isinstance(EF, (list, np.ndarray)):
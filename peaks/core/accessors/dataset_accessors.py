@@ -6,7 +6,7 @@ from peaks.core.accessors.accessor_methods import register_lazy_accessor
 functions_to_register = {
     "fileIO.data_saving": ["save"],
     "display.plotting": ["plot_fit"],
-    "fitting.fit": ["save_fit"],
+    "fitting.fit": ["save_fit", "evaluate_fit"],
 }
 
 # Register each function as a lazy accessor on Dataset
@@ -540,7 +540,8 @@ def plot_fit(
     Parameters
     ----------
     fit_results_ds : xarray.Dataset
-        Fit results from :func:`fit`. Must contain a ``fit_model`` variable.
+        Fit results from :func:`fit`. Fits without a stored :class:`lmfit.ModelResult` (from fitting with
+        ``keep_model='none'`` or ``'sample'``) are re-evaluated from the best-fit parameters.
     show_components : bool, optional
         If True (default) overlay individual model components as dashed lines.
     figsize : tuple of float, optional
@@ -560,7 +561,15 @@ def plot_fit(
         # Add the independent variable to the kwargs for plotting
         kwargs.setdefault("xlabel", fit_results_ds.attrs.get("independent_var", "x"))
 
-        fit_model = fit_results["fit_model"].compute().item()
+        fit_model = (
+            fit_results["fit_model"].compute().item()
+            if "fit_model" in fit_results
+            else None
+        )
+        if fit_model is None:
+            _plot_evaluated_fit(fit_results, fig, show_components, **kwargs)
+            return fig
+
         fit_model.plot(fig=fig, **kwargs)
         for a in fig.axes:
             title = a.get_title()
@@ -589,14 +598,20 @@ def plot_fit(
         return fig
 
     # Check the data array contains fit results
-    if "fit_model" not in fit_results_ds:
+    if "fit_model" not in fit_results_ds and "model" not in fit_results_ds.attrs:
         raise ValueError(
             "The passed data does not appear to be a DataSet containing fit results. Generate the relevant fit results "
             "by calling the `fit` method on a suitable DataArray, e.g. "
             "`fit_results = disp1.fit(model, 'eV', params)`"
         )
 
-    if len(fit_results_ds["fit_model"].shape) == 0:
+    # Dimensions over which the fits were performed
+    fit_dims = [
+        dim
+        for dim in fit_results_ds.dims
+        if dim not in (fit_results_ds.attrs.get("independent_var"), "cov_i", "cov_j")
+    ]
+    if len(fit_dims) == 0:
         fig = _plot_single_fit(fit_results_ds, show_components, figsize, **kwargs)
         display(fig)
     else:
@@ -605,7 +620,7 @@ def plot_fit(
 
         # Create sliders for dims
         sliders = {}
-        for dim in fit_results_ds.dims:
+        for dim in fit_dims:
             sliders[dim] = pn.widgets.IntSlider(
                 name=dim, start=0, end=len(fit_results_ds[dim]) - 1, step=1, value=0
             )
@@ -656,6 +671,34 @@ def plot_fit(
         return dashboard
 
 
+def _plot_evaluated_fit(fit_results, fig, show_components, **kwargs):
+    """Plot a single fit re-evaluated from its best-fit parameters, for fit results without the
+    :class:`lmfit.ModelResult`."""
+    from peaks.core.fitting.fit import evaluate_fit
+
+    curves = evaluate_fit(fit_results).compute()
+    independent_var = fit_results.attrs["independent_var"]
+    ax = fig.add_subplot()
+    ax.plot(curves[independent_var], curves["best_fit"], label="best fit")
+    if show_components and len(curves.data_vars) > 2:
+        for name, component in curves.data_vars.items():
+            if name.startswith("component_") and name != "component__gauss_conv":
+                ax.plot(
+                    curves[independent_var],
+                    component,
+                    label=name.removeprefix("component_"),
+                    linestyle="--",
+                )
+    ax.set_title(
+        f"Best fit (re-evaluated), reduced chi-square: {float(fit_results['redchi']):.4g}"
+        if "redchi" in fit_results
+        else "Best fit (re-evaluated)",
+        fontsize="small",
+    )
+    ax.set(**kwargs)
+    ax.legend()
+
+
 def plot_fit_test(data, model, params, show_components=True, **kwargs):
     """Compare a fit model evaluated for some fit parameters to a 1D data array.
 
@@ -1,6 +1,5 @@
 from datetime import datetime
 
-import dask
 import dask.array as da
 import h5py
 import numpy as np
@@ -12,6 +11,112 @@ from peaks.core.fileIO.base_arpes_data_classes.base_arpes_data_class import (
     ureg,
 )
 from peaks.core.fileIO.loc_registry import register_loader
+from peaks.core.options import opts
+
+
+class _FeSuMaImageCube:
+    """Array-like view of the sweep-averaged detector images of each step of a FeSuMa file.
+
+    Used as the source of a :func:`dask.array.from_array` call. Each read opens the file
+    once for the requested block of steps.
+    """
+
+    def __init__(self, hdf5_file):
+        self.hdf5_file = hdf5_file
+
+        with h5py.File(hdf5_file, "r") as f:
+            # Find all groups that start with '0'
+            self.scans_list = [key for key in f.keys() if key.startswith("0")]
+
+            # Get the shape from the first image
+            image0 = f[f"{self.scans_list[0]}/analysisImage"]
+            self.image_shape = image0.shape
+            start = image0.attrs.get("DimOffsetX")
+            delta = image0.attrs.get("DimDeltaX")
+            self.detector_x = np.arange(start, start + delta * image0.shape[0], delta)
+            self.detector_x_unit = image0.attrs.get("ScaleUnitsX")
+            if isinstance(self.detector_x_unit, bytes):
+                self.detector_x_unit = self.detector_x_unit.decode()
+            start = image0.attrs.get("DimOffsetY")
+            delta = image0.attrs.get("DimDeltaY")
+            self.detector_y = np.arange(start, start + delta * image0.shape[1], delta)
+            self.detector_y_unit = image0.attrs.get("ScaleUnitsY")
+            if isinstance(self.detector_y_unit, bytes):
+                self.detector_y_unit = self.detector_y_unit.decode()
+
+            # Parse Acquisition metadata as integers
+            self.steps = np.array(
+                [int(f[f"{scan}/AcquisitionCurrentStep"][0]) for scan in self.scans_list]
+            )
+            self.sweeps = np.array(
+                [
+                    int(f[f"{scan}/AcquisitionCurrentSweep"][0])
+                    for scan in self.scans_list
+                ]
+            )
+
+            # Get acquisition co-ordinate
+            self.acquisition_coord = f["AcquisitionCoordinateNice"][0]
+            if isinstance(self.acquisition_coord, bytes):
+                self.acquisition_coord = self.acquisition_coord.decode()
+
+            # Get the KE scaling
+            try:
+                # If a KE scan, should list the relevant KE values in the common metadata
+                # Don't trust AcquisitionEkinStop - this sometimes includes an extra step
+                self.eV = np.linspace(
+                    float(f["AcquisitionEkinStart"][0]),
+                    float(f["AcquisitionEkinStart"][0])
+                    + (f["AcquisitionEkinStep"][0] * (len(set(self.steps)) - 1)),
+                    len(set(self.steps)),
+                )
+            except KeyError:
+                # Get this from the first scan analyser voltages
+                self.eV = -f[f"{self.scans_list[0]}/AnalyzerUserSetVoltages"][3]
+
+            # Get delay positions if required
+            if self.acquisition_coord == "Delay Stage":
+                self.delay_pos = np.linspace(
+                    float(f["AcquisitionDelayStart"][0]),
+                    float(f["AcquisitionDelayStart"][0])
+                    + (f["AcquisitionDelayStep"][0] * (len(set(self.steps)) - 1)),
+                    len(set(self.steps)),
+                )
+
+        # Indices of the images contributing to each (sorted) step
+        self.unique_steps = np.unique(self.steps)
+        self.step_indices = [
+            np.flatnonzero(self.steps == step) for step in self.unique_steps
+        ]
+        self.shape = (len(self.unique_steps), *self.image_shape)
+        self.ndim = len(self.shape)
+        self.dtype = np.dtype("float64")
+
+    def __getitem__(self, idx):
+        # Read the sweep-averaged images for a block of steps, opening the file only once
+        idx = (idx if isinstance(idx, tuple) else (idx,)) or (slice(None),)
+        # Read an integer step index as a block of one step, dropping the axis at the end
+        single_step = isinstance(idx[0], (int, np.integer))
+        if single_step:
+            step = range(self.shape[0])[idx[0]]
+            idx = (slice(step, step + 1), *idx[1:])
+        step_idx = np.arange(self.shape[0])[idx[0]]
+        block = np.empty((len(step_idx), *self.image_shape), dtype=self.dtype)
+        with h5py.File(self.hdf5_file, "r") as f:
+            for i, step in enumerate(step_idx):
+                images = [
+                    f[f"{self.scans_list[j]}/analysisImage"]
+                    for j in self.step_indices[step]
+                ]
+                images[0].read_direct(block[i])
+                for image in images[1:]:
+                    block[i] += image[()]
+                block[i] /= len(images)
+        block = block[(slice(None), *idx[1:])]
+        return block[0] if single_step else block
+
+    def __len__(self):
+        return self.shape[0]
 
 
 @register_loader
@@ -29,107 +134,16 @@ class BaseFeSuMaDataLoader(BaseARPESDataLoader):
 
     @classmethod
     def _load_data(cls, fpath, lazy):
-        class FeSuMaImageCube:
-            def __init__(self, hdf5_file):
-                self.hdf5_file = hdf5_file
-
-                with h5py.File(hdf5_file, "r") as f:
-                    # Find all groups that start with '0'
-                    self.scans_list = [key for key in f.keys() if key.startswith("0")]
-
-                    # Get the shape and dtype from the first image
-                    image0 = f[f"{self.scans_list[0]}/analysisImage"]
-                    self.image_shape = image0.shape
-                    self.dtype = image0.dtype
-                    start = image0.attrs.get("DimOffsetX")
-                    delta = image0.attrs.get("DimDeltaX")
-                    self.detector_x = np.arange(
-                        start, start + delta * image0.shape[0], delta
-                    )
-                    self.detector_x_unit = image0.attrs.get("ScaleUnitsX")
-                    if isinstance(self.detector_x_unit, bytes):
-                        self.detector_x_unit = self.detector_x_unit.decode()
-                    start = image0.attrs.get("DimOffsetY")
-                    delta = image0.attrs.get("DimDeltaY")
-                    self.detector_y = np.arange(
-                        start, start + delta * image0.shape[1], delta
-                    )
-                    self.detector_y_unit = image0.attrs.get("ScaleUnitsY")
-                    if isinstance(self.detector_y_unit, bytes):
-                        self.detector_y_unit = self.detector_y_unit.decode()
-
-                    # Parse Acquisition metadata as integers
-                    self.steps = np.array(
-                        [
-                            int(f[f"{scan}/AcquisitionCurrentStep"][0])
-                            for scan in self.scans_list
-                        ]
-                    )
-                    self.sweeps = np.array(
-                        [
-                            int(f[f"{scan}/AcquisitionCurrentSweep"][0])
-                            for scan in self.scans_list
-                        ]
-                    )
-
-                    # Get acquisition co-ordinate
-                    self.acquisition_coord = f["AcquisitionCoordinateNice"][0]
-                    if isinstance(self.acquisition_coord, bytes):
-                        self.acquisition_coord = self.acquisition_coord.decode()
-
-                    # Get the KE scaling
-                    try:
-                        # If a KE scan, should list the relevant KE values in the common metadata
-                        # Don't trust AcquisitionEkinStop - this sometimes includes an extra step
-                        self.eV = np.linspace(
-                            float(f["AcquisitionEkinStart"][0]),
-                            float(f["AcquisitionEkinStart"][0])
-                            + (f["AcquisitionEkinStep"][0] * (len(set(self.steps)) - 1)),
-                            len(set(self.steps)),
-                        )
-                    except KeyError:
-                        # Get this from the first scan analyser voltages
-                        self.eV = -f[f"{self.scans_list[0]}/AnalyzerUserSetVoltages"][3]
-
-                    # Get delay positions if required
-                    if self.acquisition_coord == "Delay Stage":
-                        self.delay_pos = np.linspace(
-                            float(f["AcquisitionDelayStart"][0]),
-                            float(f["AcquisitionDelayStart"][0])
-                            + (
-                                f["AcquisitionDelayStep"][0] * (len(set(self.steps)) - 1)
-                            ),
-                            len(set(self.steps)),
-                        )
-
-            def __getitem__(self, idx):
-                # Lazily load the slice when accessed
-                scan_path = f"{self.scans_list[idx]}/analysisImage"
-                with h5py.File(self.hdf5_file, "r") as f:
-                    data = f[scan_path][:]
-                return data
-
-            def __len__(self):
-                return len(self.scans_list)
-
-            def shape(self):
-                return (len(self.scans_list), *self.image_shape)
-
-        # Instantiate the lazy loader
-        lazy_cube = FeSuMaImageCube(fpath)
-
-        # Create a list of Dask arrays from delayed objects
-        lazy_slices = [
-            da.from_delayed(
-                dask.delayed(lazy_cube[i]),
-                shape=lazy_cube.image_shape,
-                dtype=lazy_cube.dtype,
-            )
-            for i in range(len(lazy_cube))
-        ]
-
-        # Stack the Dask arrays along a new dimension to form the 3D cube
-        lazy_data = da.stack(lazy_slices, axis=0)
+        # Instantiate the lazy loader, returning the sweep-averaged image for each step
+        lazy_cube = _FeSuMaImageCube(fpath)
+
+        # Read blocks of steps per task, rather than one task per image
+        lazy_data = da.from_array(
+            lazy_cube,
+            chunks=("auto", -1, -1),
+            asarray=True,
+            name=cls._dask_name(fpath, lazy_cube.shape),
+        )
 
         # Create the xarray.DataArray with Acquisition metadata as dimensions
         data_array = xr.DataArray(
@@ -142,19 +156,15 @@ class BaseFeSuMaDataLoader(BaseARPESDataLoader):
             coords={
                 "detector_x": lazy_cube.detector_x,
                 "detector_y": lazy_cube.detector_y,
-                "steps": lazy_cube.steps,  # Coordinates for the "steps" dimension
-                "sweep": (
-                    "steps",
-                    lazy_cube.sweeps,
-                ),  # Associating "sweep" with "steps"
+                "steps": lazy_cube.unique_steps,  # Coordinates for the "steps" dimension
             },
             name="spectrum",
         )
 
+        if lazy is None:
+            lazy = lazy_data.nbytes > opts.FileIO.lazy_size
         if not lazy:
-            data_array = data_array.compute()
-
-        data_array = data_array.groupby("steps").mean()
+            data_array = data_array.copy(data=lazy_cube[:])
 
         if lazy_cube.acquisition_coord == "Kinetic Energy":
             data_array = data_array.assign_coords({"eV": ("steps", lazy_cube.eV)})
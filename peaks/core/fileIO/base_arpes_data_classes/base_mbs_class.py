@@ -1,4 +1,6 @@
+import os
 import re
+from contextlib import nullcontext
 from datetime import datetime
 
 import numpy as np
@@ -54,17 +56,27 @@ class MBSDataLoader(BaseARPESDataLoader):
                 f"{list(handlers.keys())}"
             )
 
-        # Get the metadata here returning with keys in MBS format - this as needed for parsing the core data.
-        metadata_dict_MBS_keys = cls._load_metadata(fpath, return_in_MBS_format=True)
-        # Cahce it in the metadata cache to avoid having to load it again later
-        cls._metadata_cache[fpath] = metadata_dict_MBS_keys
+        metadata_readers = {
+            "txt": cls._load_MBS_metadata_txt,
+            "krx": cls._load_MBS_metadata_krx,
+        }
+
+        # Open the file once, reading both the metadata and the data from the same handle
+        with open(fpath, "rb" if ext == "krx" else "r") as f:
+            # Get the metadata here returning with keys in MBS format - this as needed for parsing the core data.
+            metadata_dict_MBS_keys = cls._metadata_cache.get(
+                fpath
+            ) or cls._MBS_metadata_to_dict_w_MBS_keys(metadata_readers[ext](f))
+            # Cache it in the metadata cache to avoid having to load it again later
+            cls._metadata_cache[fpath] = metadata_dict_MBS_keys
 
-        # Load data
-        return handlers[ext](fpath, metadata_dict_MBS_keys)
+            # Load data
+            f.seek(0)
+            return handlers[ext](f, metadata_dict_MBS_keys)
 
     @classmethod
     def _load_from_txt(cls, fpath, metadata_dict_MBS_keys):
-        """Load data from a .txt file."""
+        """Load data from a .txt file (passed as a path or an open text file)."""
         # Give a legacy warning
         analysis_warning(
             "Loading MBS data from .txt file. This is a legacy format and only basic loading is supported. "
@@ -105,8 +117,12 @@ class MBSDataLoader(BaseARPESDataLoader):
 
     @classmethod
     def _load_from_krx(cls, fpath, metadata_dict_MBS_keys):
-        """Load data from krx format."""
-        with open(fpath, "rb") as f:
+        """Load data from krx format (passed as a path or an open binary file)."""
+        with (
+            open(fpath, "rb")
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath) as f
+        ):
             # Determine whether the file is 32-bit or 64-bit. The data type is little endian, so read initially as
             # 32 bit, but if either of the first 2 32-bit words are 0, then the file is 64-bit.
             dtype_identifier = np.fromfile(f, dtype="<i4", count=2)
@@ -281,14 +297,23 @@ class MBSDataLoader(BaseARPESDataLoader):
     def _load_MBS_metadata_txt(fpath):
         """Extract the lines containing metadata in an MBS format .txt file.
 
+        Parameters
+        ----------
+        fpath : str or file-like
+            Path to the file, or an open text file positioned at its start.
+
         Returns
         -------
         metadata_lines : list
             Lines extracted from the file containing the metadata.
 
         """
-        # Open the file and extract the lines containing metadata
-        with open(fpath) as f:
+        # Open the file (or reuse the open handle) and extract the lines containing metadata
+        with (
+            open(fpath)
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath) as f
+        ):
             metadata_lines = []
             while True:
                 line = f.readline()
@@ -304,14 +329,23 @@ class MBSDataLoader(BaseARPESDataLoader):
     def _load_MBS_metadata_krx(fpath):
         """Extract the lines containing metadata in an MBS format .krx file.
 
+        Parameters
+        ----------
+        fpath : str or file-like
+            Path to the file, or an open binary file.
+
         Returns
         -------
         metadata_lines : list
             Lines extracted from the file containing the metadata.
 
         """
-        # Open the file in read mode and extract metalines
-        with open(fpath, "rb") as f:
+        # Open the file in read mode (or reuse the open handle) and extract metalines
+        with (
+            open(fpath, "rb")
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath) as f
+        ):
             # Determine whether the file is 32-bit or 64-bit. The data type is little endian, so read initially as
             # 32 bit, but if either of the first 2 32-bit words are 0, then the file is 64-bit.
             dtype_identifier = np.fromfile(f, dtype="<i4", count=2)
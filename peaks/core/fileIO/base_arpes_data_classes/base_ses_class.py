@@ -1,5 +1,7 @@
+import os
 import re
 import zipfile
+from contextlib import nullcontext
 
 import numpy as np
 import pint_xarray
@@ -58,6 +60,8 @@ class SESDataLoader(BaseARPESDataLoader):
         scan_no = kwargs.pop("scan_no", None)
         if ext == "zip" and scan_no is not None:
             return handlers[ext](fpath, scan_no=scan_no)
+        elif ext == "ibw":
+            return handlers[ext](fpath, lazy=lazy)
         else:
             return handlers[ext](fpath)
 
@@ -73,16 +77,18 @@ class SESDataLoader(BaseARPESDataLoader):
             "Legacy format - SES .txt file loader",
         )
 
-        # Get the metadata here returning with keys in SES format - this as needed for
-        # parsing the core data.
-        metadata_dict_ses_keys = cls._load_metadata(fpath, return_in_SES_format=True)
-        # Cahce it in the metadata cache to avoid having to load it again later
-        cls._metadata_cache[fpath] = metadata_dict_ses_keys
+        # Read the metadata header and data in a single pass through the file
+        with open(fpath) as f:
+            # Get the metadata here returning with keys in SES format - this as needed for
+            # parsing the core data.
+            metadata_dict_ses_keys = cls._SES_metadata_lines_to_dict(
+                cls._load_SES_metadata_txt(f)
+            )
+            # Cache it in the metadata cache to avoid having to load it again later
+            cls._metadata_cache[fpath] = metadata_dict_ses_keys
 
-        # Load file data and core data-related metadata
-        file_data = np.loadtxt(
-            fpath, skiprows=int(metadata_dict_ses_keys["metadata_lines_length"])
-        )
+            # Load file data from the remainder of the file
+            file_data = np.loadtxt(f)
         spectrum = file_data[:, 1:]
         eV_values = file_data[:, 0]
         eV_units = cls._parse_SES_units_from_name(
@@ -116,6 +122,16 @@ class SESDataLoader(BaseARPESDataLoader):
         """
         # Open the file and load the data
         with zipfile.ZipFile(fpath) as z:
+            # Parse the general metadata from the same archive handle and cache it to
+            # avoid re-opening the archive when loading the metadata
+            if not cls._metadata_cache.get(fpath):
+                try:
+                    cls._metadata_cache[fpath] = cls._SES_metadata_lines_to_dict(
+                        cls._load_SES_metadata_zip(z)
+                    )
+                except FileNotFoundError:
+                    pass
+
             files = z.namelist()
             file_bin = [file for file in files if ".bin" in file]
             file_ini = [file for file in files if "Spectrum_" in file and ".ini" in file]
@@ -186,10 +202,10 @@ class SESDataLoader(BaseARPESDataLoader):
         }
 
     @classmethod
-    def _load_from_ibw(cls, fpath):
+    def _load_from_ibw(cls, fpath, lazy=False):
         """Load data from an Igor binary wave (ibw) file."""
         # Load the data from the ibw file using the default IBW loader
-        data = BaseIBWDataLoader._load_data(fpath, lazy=False)
+        data = BaseIBWDataLoader._load_data(fpath, lazy=lazy)
 
         # Load the metadata if needed for parsing the data
         pos_or_point_scan_dim = [
@@ -368,41 +384,58 @@ class SESDataLoader(BaseARPESDataLoader):
                 "ibw": cls._load_SES_metadata_ibw,
             }
             ext = fpath.split(".")[-1]
-            metadata_lines = handlers[ext](fpath)
-            metadata_dict_SES_keys = cls._SES_metadata_to_dict_w_SES_keys(metadata_lines)
-            # Check if there is additional run mode information in the metadata
-            try:
-                run_mode_info_start_index = metadata_lines.index(
-                    "[Run Mode Information]"
-                )
-                run_mode_info_stop_index = (
-                    metadata_lines[run_mode_info_start_index:].index("")
-                    + run_mode_info_start_index
-                )
-                metadata_dict_SES_keys["Run Mode Information"] = metadata_lines[
-                    run_mode_info_start_index + 1 : run_mode_info_stop_index
-                ]
-
-            except ValueError:
-                pass
+            metadata_dict_SES_keys = cls._SES_metadata_lines_to_dict(
+                handlers[ext](fpath)
+            )
         if return_in_SES_format:
             return metadata_dict_SES_keys
 
         # Convert the metadata to the peaks convention and return
         return cls._SES_metadata_dict_keys_to_peaks_keys(metadata_dict_SES_keys)
 
+    @classmethod
+    def _SES_metadata_lines_to_dict(cls, metadata_lines):
+        """Convert metadata lines to a dictionary with keys in SES format, including any
+        additional run mode information.
+        """
+        metadata_dict_SES_keys = cls._SES_metadata_to_dict_w_SES_keys(metadata_lines)
+        # Check if there is additional run mode information in the metadata
+        try:
+            run_mode_info_start_index = metadata_lines.index("[Run Mode Information]")
+            run_mode_info_stop_index = (
+                metadata_lines[run_mode_info_start_index:].index("")
+                + run_mode_info_start_index
+            )
+            metadata_dict_SES_keys["Run Mode Information"] = metadata_lines[
+                run_mode_info_start_index + 1 : run_mode_info_stop_index
+            ]
+
+        except ValueError:
+            pass
+        return metadata_dict_SES_keys
+
     @staticmethod
     def _load_SES_metadata_txt(fpath):
         """Extract the lines containing metadata in an SES format .txt file.
 
+        Parameters
+        ----------
+        fpath : str or file-like
+            Path to the file, or an open text file positioned at its start. An open file
+            is left positioned at the start of the data block.
+
         Returns
         -------
         metadata_lines : list
             Lines extracted from the file containing the metadata.
 
         """
-        # Open the file and extract the lines containing metadata
-        with open(fpath) as f:
+        # Open the file (or reuse the open handle) and extract the lines containing metadata
+        with (
+            open(fpath)
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath) as f
+        ):
             metadata_lines = []
             while True:
                 line = f.readline()
@@ -419,14 +452,23 @@ class SESDataLoader(BaseARPESDataLoader):
     def _load_SES_metadata_zip(fpath):
         """Extract the lines containing metadata in an SES format .zip file.
 
+        Parameters
+        ----------
+        fpath : str or zipfile.ZipFile
+            Path to the file, or an already open archive to read from.
+
         Returns
         -------
         metadata_lines : list
             Lines extracted from the file containing the metadata.
 
         """
-        # Open the file and extract the lines containing metadata
-        with zipfile.ZipFile(fpath, "r") as z:
+        # Open the file (or reuse the open archive) and extract the lines containing metadata
+        with (
+            zipfile.ZipFile(fpath, "r")
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath)
+        ) as z:
             files = z.namelist()
             file_ini = [
                 file for file in files if "Spectrum_" not in file and ".ini" in file
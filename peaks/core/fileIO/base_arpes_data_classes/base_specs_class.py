@@ -1,5 +1,6 @@
 import os
 import re
+from contextlib import nullcontext
 from datetime import datetime
 from itertools import takewhile
 
@@ -202,14 +203,13 @@ class SpecsDataLoader(BaseARPESDataLoader):
 
     @classmethod
     def _parse_data_from_sp2_file(cls, fpath):
-        metadata_dict_SPECS_keys = cls._load_metadata(fpath, return_in_SPECS_format=True)
-
-        # Open the file and load lines
-        rows = []
+        # Read the metadata header and data in a single pass through the file
         with open(fpath, "rb") as f:
-            for i, row in enumerate(f):  # noqa: B007
-                if i >= metadata_dict_SPECS_keys["data_start_line"]:
-                    rows.append(int(row.decode(errors="ignore").strip("\n")))
+            metadata_dict_SPECS_keys = cls._parse_metadata_from_sp2_file(f)
+            # Cache the metadata to use later if required
+            cls._metadata_cache[fpath] = metadata_dict_SPECS_keys
+            # File is now positioned at the start of the data
+            rows = [int(row.decode(errors="ignore").strip("\n")) for row in f]
 
         data = np.asarray(rows).reshape(
             int(metadata_dict_SPECS_keys["SIZE_Y"].split("#")[0]),
@@ -312,9 +312,18 @@ class SpecsDataLoader(BaseARPESDataLoader):
 
     @classmethod
     def _parse_metadata_from_sp2_file(cls, fpath):
+        """Parse the metadata header of a .sp2 file.
+
+        `fpath` can be a path or an open binary file positioned at its start, in which
+        case the file is left positioned at the start of the data block.
+        """
         meta_dict_SPECS_keys = {}
         stop_on_next_line = False  # noqa: F841
-        with open(fpath, "rb") as f:
+        with (
+            open(fpath, "rb")
+            if isinstance(fpath, (str, os.PathLike))
+            else nullcontext(fpath) as f
+        ):
             for i, row in enumerate(f):  # noqa: B007
                 row_ = row.decode(errors="ignore")
                 if isinstance(row_, str) and "=" in row_:
@@ -1,14 +1,16 @@
-import inspect
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pint_xarray  # noqa: F401
 import xarray as xr
+from dask.base import tokenize
 
 from peaks.core.fileIO.loc_registry import LOC_REGISTRY, IdentifyLoc
 from peaks.core.metadata.base_metadata_models import (
     BaseScanMetadataModel,
 )
+from peaks.core.options import opts
 from peaks.core.utils.misc import analysis_warning
 
 ureg = pint_xarray.unit_registry
@@ -29,6 +31,12 @@ class BaseDataLoader:
     ``_load_metadata()``. Formats that do not fit the standard pipeline may override
     ``_load()`` directly instead.
 
+    Where ``_load_metadata()`` does not depend on state set by ``_load_data()``, subclasses
+    can set ``_concurrent_metadata = True``. If `opts.FileIO.concurrent_metadata` is enabled,
+    the raw metadata are then read in a background thread, overlapping with the data read.
+    Loaders which need some metadata to parse the data should instead read the file (or
+    its header) once and share it via ``_metadata_cache``.
+
     Metadata are stored as :class:`pydantic.BaseModel` models in :attr:`xarray.DataArray.attrs`.
     The raw metadata dictionary returned by ``_load_metadata()`` should use :mod:`peaks`
     metadata keys such as ``analyser_eV`` or ``photon_hv``, with :class:`pint.Quantity`
@@ -46,6 +54,7 @@ class BaseDataLoader:
     _dorder = None  # Desired array order for the main data
     _metadata_cache = {}  # Cache for metadata
     _metadata_parsers = []  # List of metadata parsers to apply
+    _concurrent_metadata = False  # Whether _load_metadata can run alongside _load_data
 
     # Properties to access class variables
     @property
@@ -215,6 +224,38 @@ class BaseDataLoader:
         # Otherwise, use the loc defined in the subclass
         loc = cls._loc_name
 
+        # Method to extract any specific metadata, which should be updated in subclasses
+        raw_metadata = (
+            cls.get_loader(loc)._load_metadata(fpath) if load_metadata_from_file else {}
+        )
+        return cls._parse_raw_metadata(fpath, raw_metadata, return_as_dict, quiet)
+
+    @classmethod
+    def _parse_raw_metadata(cls, fpath, raw_metadata, return_as_dict=False, quiet=True):
+        """Combine raw metadata from ``_load_metadata()`` with the basic file metadata and parse
+        into the structured metadata models.
+
+        Parameters
+        ----------
+        fpath : str
+            Path to the file the metadata were loaded from.
+
+        raw_metadata : dict
+            Raw metadata dictionary, as returned by ``_load_metadata()``.
+
+        return_as_dict : bool, optional
+            Whether to return the flat raw metadata dictionary rather than the parsed
+            metadata models. Defaults to False.
+
+        quiet : bool, optional
+            Whether to suppress missing metadata warnings. Defaults to True.
+
+        Returns
+        -------
+        metadata_dict : dict
+            Either a flat raw metadata dictionary or a dictionary of parsed metadata
+            models, depending on ``return_as_dict``.
+        """
         # Parse some baseline metadata from the file
         # Extract a timestamp from last modification time - overwrite in subclass if more robust method available
         timestamp = os.path.getmtime(fpath)
@@ -223,16 +264,7 @@ class BaseDataLoader:
             "%Y-%m-%d %H:%M:%S"
         )
         metadata_dict = {"timestamp": readable_timestamp, "fpath": fpath}
-
-        if load_metadata_from_file:
-            # Method to extract any specific metadata, which should be updated in subclasses
-            metadata_dict.update(
-                {
-                    k: v
-                    for k, v in cls.get_loader(loc)._load_metadata(fpath).items()
-                    if v is not None
-                }
-            )
+        metadata_dict.update({k: v for k, v in raw_metadata.items() if v is not None})
         if return_as_dict:
             return metadata_dict
         parsed_metadata = {}
@@ -293,25 +325,7 @@ class BaseDataLoader:
         loc : str
             The name of the location (typically a beamline).
         """
-        file_extension = os.path.splitext(fpath)[1]
-        # Define the handlers for the different file extensions
-        # No extension
-        handlers = {
-            "": IdentifyLoc._no_extension,
-        }
-        # For ones with file extensions, generate the handlers from the methods in IdentifyLocation
-        handlers.update(
-            {
-                f".{method_name.split('_handler_')[1]}": method
-                for method_name, method in inspect.getmembers(
-                    IdentifyLoc, predicate=inspect.isfunction
-                )
-                if method_name.startswith("_handler")
-            }
-        )
-        handler = handlers.get(file_extension, IdentifyLoc._default_handler)
-
-        return handler(fpath)
+        return IdentifyLoc.identify(fpath)
 
     @staticmethod
     def _check_valid_loc(loc):
@@ -325,17 +339,29 @@ class BaseDataLoader:
     @classmethod
     def _load(cls, fpath, lazy, metadata, quiet, **kwargs):
         """Run the standard data-loading pipeline for a concrete loader class."""
-        # Load the actual data from the file
-        data = cls._load_data(fpath, lazy, **kwargs)
+        # If supported, read the raw metadata in a background thread while loading the data
+        metadata_future = None
+        if metadata and cls._concurrent_metadata and opts.FileIO.concurrent_metadata:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                metadata_future = executor.submit(cls._load_metadata, fpath)
+                data = cls._load_data(fpath, lazy, **kwargs)
+        else:
+            # Load the actual data from the file
+            data = cls._load_data(fpath, lazy, **kwargs)
         da = cls._make_dataarray(data)  # Convert to DataArray
         # Add a name to the DataArray
         da.name = os.path.splitext(os.path.basename(fpath))[0]
-        parsed_metadata = cls.load_metadata(
-            fpath,
-            loc=cls._loc_name,
-            quiet=quiet or not metadata,
-            load_metadata_from_file=metadata,
-        )
+        if metadata_future is not None:
+            parsed_metadata = cls._parse_raw_metadata(
+                fpath, metadata_future.result(), quiet=quiet
+            )
+        else:
+            parsed_metadata = cls.load_metadata(
+                fpath,
+                loc=cls._loc_name,
+                quiet=quiet or not metadata,
+                load_metadata_from_file=metadata,
+            )
         da.attrs.update(parsed_metadata)
         cls._metadata_cache.pop(fpath, None)  # Clear any metadata cache for this file
         # Apply any specific conventions and add a history of the load
@@ -343,6 +369,21 @@ class BaseDataLoader:
         cls._add_load_history(da, fpath)
         return da
 
+    @classmethod
+    def _dask_name(cls, fpath, *key):
+        """Return a deterministic name for a dask array lazily reading data from ``fpath``.
+
+        The name is a token of the loader, the file path, size and modification time, and any further ``key``
+        identifying the array (e.g. its location in the file and chunks). It is therefore reproducible across
+        sessions (allowing results computed from the array to be cached, see
+        :func:`peaks.core.utils.cache.peaks_cached`), but changes if the file is modified.
+        """
+        stat = os.stat(fpath)
+        token = tokenize(
+            cls.__name__, os.path.abspath(fpath), stat.st_mtime_ns, stat.st_size, *key
+        )
+        return f"{cls._loc_name}-{token}"
+
     @classmethod
     def _load_data(cls, fpath, lazy, **kwargs):
         """Load raw array data for ``fpath``.
@@ -1,10 +1,52 @@
 import os
 
+import dask.array as da
 import numpy as np
 from igor2 import binarywave
 
 from peaks.core.fileIO.base_data_classes.base_data_class import BaseDataLoader
 from peaks.core.fileIO.loc_registry import register_loader
+from peaks.core.options import opts
+
+# Layout of the (version 5) IBW binary and wave headers. Only the fields required to
+# locate and shape the wave data are named.
+_IBW5_BIN_HEADER = np.dtype(
+    {
+        "names": [
+            "version",
+            "wfmSize",
+            "formulaSize",
+            "noteSize",
+            "dataEUnitsSize",
+            "dimEUnitsSize",
+        ],
+        "formats": ["i2", "i4", "i4", "i4", "i4", ("i4", 4)],
+        "offsets": [0, 4, 8, 12, 16, 20],
+        "itemsize": 64,
+    }
+)
+_IBW5_WAVE_HEADER = np.dtype(
+    {
+        "names": ["npnts", "type", "nDim", "sfA", "sfB"],
+        "formats": ["i4", "i2", ("i4", 4), ("f8", 4), ("f8", 4)],
+        "offsets": [12, 16, 68, 84, 116],
+        "itemsize": 320,
+    }
+)
+
+# Igor wave type flags that map directly onto numpy dtypes
+_IBW_NUMPY_TYPES = {
+    2: "f4",
+    3: "c8",
+    4: "f8",
+    5: "c16",
+    0x08: "i1",
+    0x10: "i2",
+    0x20: "i4",
+    0x48: "u1",
+    0x50: "u2",
+    0x60: "u4",
+}
 
 
 @register_loader
@@ -21,25 +63,75 @@ class BaseIBWDataLoader(BaseDataLoader):
     _loc_description = "General loader for Igor Binary Wave files"
     _loc_url = "https://www.wavemetrics.com/products"
     _metadata_parsers = ["_parse_wavenote_metadata"]
+    _concurrent_metadata = True  # Wavenote is read independently of the wave data
 
     @classmethod
     def _load_data(cls, fpath, lazy):
-        """Load the data from an Igor Binary Wave file."""
+        """Load the data from an Igor Binary Wave file.
+
+        Version 5 numeric waves are memory-mapped directly from the file, returning a
+        lazy dask array if ``lazy`` is `True` (or if ``lazy`` is `None` and the wave is
+        larger than `opts.FileIO.lazy_size`). Other waves are read with `igor2`.
+        """
+        header = cls._read_ibw_header(fpath)
+        if header is None:
+            return cls._load_data_igor2(fpath)
+
+        # Memory map the wave data (stored in Fortran order)
+        spectrum = np.memmap(
+            fpath,
+            dtype=header["dtype"],
+            mode="r",
+            offset=header["data_offset"],
+            shape=header["shape"],
+            order="F",
+        )
+        if lazy is None:
+            lazy = spectrum.nbytes > opts.FileIO.lazy_size
+        if lazy:
+            spectrum = da.from_array(
+                spectrum,
+                chunks="auto",
+                name=cls._dask_name(
+                    fpath, header["data_offset"], header["shape"], header["dtype"]
+                ),
+            )
+        else:
+            spectrum = np.array(spectrum)
+
+        return cls._make_ibw_data_dict(
+            spectrum,
+            header["dimension_units"],
+            header["dimEUnitsSize"],
+            header["sfA"],
+            header["sfB"],
+            header["nDim"],
+        )
+
+    @classmethod
+    def _load_data_igor2(cls, fpath):
+        """Load the full contents of an Igor Binary Wave file using `igor2`."""
         # Open the file and load its contents
         file_contents = binarywave.load(fpath)
 
         # Extract spectrum
         spectrum = file_contents["wave"]["wData"]
 
-        # Extract relevant information on the dimensions of the data
-        dim_size = file_contents["wave"]["bin_header"]["dimEUnitsSize"]
-        dim_units = file_contents["wave"]["dimension_units"].decode()
+        return cls._make_ibw_data_dict(
+            spectrum,
+            file_contents["wave"]["dimension_units"].decode(),
+            file_contents["wave"]["bin_header"]["dimEUnitsSize"],
+            file_contents["wave"]["wave_header"]["sfA"],
+            file_contents["wave"]["wave_header"]["sfB"],
+            file_contents["wave"]["wave_header"]["nDim"],
+        )
 
-        # Extract scales of dimensions
-        dim_start = file_contents["wave"]["wave_header"]["sfB"]  # Initial value
-        dim_step = file_contents["wave"]["wave_header"]["sfA"]  # Step size
-        dim_points = file_contents["wave"]["wave_header"]["nDim"]  # Number of points
-        dim_end = dim_start + (dim_step * (dim_points - 1))
+    @staticmethod
+    def _make_ibw_data_dict(
+        spectrum, dim_units, dim_size, dim_step, dim_start, dim_points
+    ):
+        """Build the standard data dictionary from the wave data and its dimension scaling."""
+        dim_end = dim_start + (dim_step * (np.asarray(dim_points) - 1))
 
         # Loop through the dimensions, extract relevant dimension names and coordinates
         dims = []
@@ -55,6 +147,80 @@ class BaseIBWDataLoader(BaseDataLoader):
 
         return {"spectrum": spectrum, "dims": dims, "coords": coords, "units": {}}
 
+    @staticmethod
+    def _read_ibw_header(fpath):
+        """Parse the binary and wave headers of a version 5 Igor Binary Wave file.
+
+        Parameters
+        ----------
+        fpath : str
+            Path to the file.
+
+        Returns
+        -------
+        header : dict or None
+            Dictionary of the data `dtype`, `shape` and `data_offset`, the dimension
+            sizes and scaling (`nDim`, `sfA`, `sfB`) and the extended dimension units. Returns `None` if
+            the file is not a version 5 numeric wave, in which case it should be read
+            with `igor2`.
+        """
+        with open(fpath, "rb") as f:
+            raw_header = f.read(_IBW5_BIN_HEADER.itemsize + _IBW5_WAVE_HEADER.itemsize)
+            if len(raw_header) < _IBW5_BIN_HEADER.itemsize + _IBW5_WAVE_HEADER.itemsize:
+                return None
+
+            # Determine the byte order from the version number
+            for byte_order in ("<", ">"):
+                bin_header = np.frombuffer(
+                    raw_header,
+                    dtype=_IBW5_BIN_HEADER.newbyteorder(byte_order),
+                    count=1,
+                )[0]
+                if bin_header["version"] in (1, 2, 3, 5):
+                    break
+            if bin_header["version"] != 5:
+                return None
+            wave_header = np.frombuffer(
+                raw_header,
+                dtype=_IBW5_WAVE_HEADER.newbyteorder(byte_order),
+                count=1,
+                offset=_IBW5_BIN_HEADER.itemsize,
+            )[0]
+            if int(wave_header["type"]) not in _IBW_NUMPY_TYPES:
+                return None  # e.g. text waves
+
+            dtype = np.dtype(_IBW_NUMPY_TYPES[int(wave_header["type"])]).newbyteorder(
+                byte_order
+            )
+            shape = tuple(int(n) for n in wave_header["nDim"] if n > 0)
+            data_offset = len(raw_header)
+            data_size = int(bin_header["wfmSize"]) - _IBW5_WAVE_HEADER.itemsize
+            if not shape or data_size != np.prod(shape) * dtype.itemsize:
+                return None
+
+            # Read the extended dimension units, which follow the data, dependency
+            # formula, wave note and extended data units
+            dimEUnitsSize = [int(size) for size in bin_header["dimEUnitsSize"]]
+            f.seek(
+                data_offset
+                + data_size
+                + int(bin_header["formulaSize"])
+                + int(bin_header["noteSize"])
+                + int(bin_header["dataEUnitsSize"])
+            )
+            dimension_units = f.read(sum(dimEUnitsSize)).decode()
+
+        return {
+            "dtype": dtype,
+            "shape": shape,
+            "data_offset": data_offset,
+            "nDim": wave_header["nDim"].astype(int),
+            "sfA": wave_header["sfA"].astype(float),
+            "sfB": wave_header["sfB"].astype(float),
+            "dimEUnitsSize": dimEUnitsSize,
+            "dimension_units": dimension_units,
+        }
+
     @classmethod
     def _load_metadata(cls, fpath):
         """Load metadata from an Igor Binary Wave file."""
@@ -1,9 +1,5 @@
-from typing import Optional
-
-from pydantic import create_model
-
 from peaks.core.fileIO.base_data_classes.base_data_class import BaseDataLoader
-from peaks.core.metadata.base_metadata_models import AxisMetadataModelWithReference
+from peaks.core.metadata.base_metadata_models import _get_manipulator_metadata_model
 
 
 class BaseManipulatorDataLoader(BaseDataLoader):
@@ -68,12 +64,10 @@ class BaseManipulatorDataLoader(BaseDataLoader):
     def _parse_manipulator_metadata(cls, metadata_dict):
         """Build the structured manipulator metadata model from raw metadata."""
 
-        # Build manipulator metadata model
-        fields = {
-            axis: (Optional[AxisMetadataModelWithReference], None)
-            for axis in cls._manipulator_axes
-        }
-        ManipulatorMetadataModel = create_model("ManipulatorMetadataModel", **fields)
+        # Get the manipulator metadata model for the axes of this loader
+        ManipulatorMetadataModel = _get_manipulator_metadata_model(
+            tuple(cls._manipulator_axes)
+        )
 
         # Extract the relevant metadata and parse in a form for passing to the model
         manipulator_metadata_dict = {}
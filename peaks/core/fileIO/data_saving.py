@@ -1,51 +1,190 @@
-"""Functions to save data as a netCDF file."""
+"""Functions to save data as NetCDF or Zarr files."""
 
-import copy
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pint_xarray  # noqa: F401
 import xarray as xr
+import zarr
+from zarr.codecs import BloscCodec
+
+from peaks import __version__
+from peaks.core.utils.datatree_utils import _map_over_datasets_concurrently
+
+# Storage profiles for chunking data to suit common access patterns. Each profile
+# defines the dimensions which are sliced through (chunked, with all other dimensions
+# kept whole in a chunk) or, alternatively, the dimensions which are kept whole (with
+# all other dimensions chunked)
+_STORAGE_PROFILES = {
+    # Constant-energy slices, e.g. Fermi surfaces: chunk along the energy axis
+    "fermi_surface": {"sliced_dims": ["eV"]},
+    # Energy distribution curves: keep the full energy axis together
+    "edc": {"whole_dims": ["eV"]},
+    # Spatial maps: keep the full spectrum at each spatial pixel together
+    "spatial_map": {"sliced_dims": ["x1", "x2", "x3"]},
+}
+_TARGET_CHUNK_BYTES = 2**20  # Target size of a single (compressed) chunk
+_TARGET_SHARD_BYTES = 2**26  # Target size of a Zarr shard (group of chunks)
+_NETCDF_COMPRESSION = {"zlib": True, "complevel": 4, "shuffle": True}
+# Version of the layout of the serialised metadata, increased on incompatible changes:
+# 1 - each attribute stored as a separate JSON string, with the model classes in a
+#     `metadata_models` attribute
+# 2 - all attributes stored in a single JSON document in the `peaks_metadata` attribute
+_METADATA_SCHEMA_VERSION = 2
+
+
+def _zarr_compressors():
+    """Return the Zarr v3 compressors used for data saved with a storage profile."""
+    return (BloscCodec(cname="zstd", clevel=5, shuffle="shuffle"),)
 
 
 def _serialise_attrs(attrs):
     """Serialises attributes of a :class:`xarray.DataArray` or similar for saving in
     NetCDF/Zarr files.
 
+    Metadata models and other JSON-serialisable attributes are encoded together in a
+    single JSON document, stored in the `peaks_metadata` attribute along with the
+    version of its layout (`_METADATA_SCHEMA_VERSION`), the `peaks` version and the
+    model class of each entry. Arrays are stored as separate attributes, and any other
+    attributes as their string representation.
+
     Parameters
     ----------
     attrs : dict
-        The attributes dictionary of the :class:`xarray.DataArray` to be saved.
+        The attributes dictionary of the :class:`xarray.DataArray` to be saved. This is
+        not modified.
 
     Returns
     -------
     dict
-        The serialised attributes dictionary.
+        A new dictionary of the serialised attributes.
     """
-    # Keep track of the metadata models for de-serialisation on loading again
-    metadata_models = {}
+    serialised_attrs = {}
+    entries = {}
 
     # Make data attributes serialisable
-    for attr_name, attr in attrs.copy().items():
-        try:  # Attrs should generally define json method to convert to/from json string
-            attrs[attr_name] = attr.model_dump_json(by_alias=True)
-            metadata_models[attr_name] = (
-                f"{attr.__class__.__module__}.{attr.__class__.__name__}"
-            )
-
+    for attr_name, attr in attrs.items():
+        try:  # Attrs should generally be metadata models which can be dumped to json
+            entries[attr_name] = {
+                "model": f"{attr.__class__.__module__}.{attr.__class__.__name__}",
+                "value": attr.model_dump(mode="json", by_alias=True),
+            }
         except AttributeError:
             # Other type serialisations
-            if not isinstance(attr, np.ndarray):
-                try:  # Try to convert to a json string
-                    attrs[attr_name] = json.dumps(attr)
-                    metadata_models[attr_name] = "json"
+            if isinstance(attr, np.ndarray):
+                serialised_attrs[attr_name] = attr
+            else:
+                try:  # Check the attribute can be converted to json
+                    json.dumps(attr)
+                    entries[attr_name] = {"model": "json", "value": attr}
                 except TypeError:  # Fall back to string representation
-                    attrs[attr_name] = str(attr)
-                    metadata_models[attr_name] = None
-    attrs["metadata_models"] = json.dumps(metadata_models)
+                    serialised_attrs[attr_name] = str(attr)
+    serialised_attrs["peaks_metadata"] = json.dumps(
+        {
+            "schema_version": _METADATA_SCHEMA_VERSION,
+            "peaks_version": __version__,
+            "attr_order": list(attrs),
+            "attrs": entries,
+        }
+    )
+
+    return serialised_attrs
+
+
+def _get_profile_chunks(dims, shape, itemsize, profile):
+    """Determine the chunk and shard shapes for a variable from a storage profile.
+
+    Parameters
+    ----------
+    dims : tuple of str
+        The dimensions of the variable.
+
+    shape : tuple of int
+        The shape of the variable.
+
+    itemsize : int
+        The size of a single element of the variable (in bytes).
+
+    profile : str
+        The storage profile, one of the keys of `_STORAGE_PROFILES`.
+
+    Returns
+    -------
+    tuple or None
+        Tuple of the chunk shape and the shard shape, or `None` if the profile does not
+        apply to the dimensions of this variable.
+    """
+    profile_dims = _STORAGE_PROFILES[profile]
+    if "sliced_dims" in profile_dims:
+        sliced = [dim in profile_dims["sliced_dims"] for dim in dims]
+        if not any(sliced):
+            return None
+    else:
+        sliced = [dim not in profile_dims["whole_dims"] for dim in dims]
+        if all(sliced):
+            return None
+    n_sliced = sum(sliced)
+
+    # Keep whole dimensions intact, and split the sliced dimensions evenly to give
+    # roughly the target chunk size
+    whole_bytes = itemsize * int(
+        np.prod(
+            [
+                size
+                for size, is_sliced in zip(shape, sliced, strict=True)
+                if not is_sliced
+            ]
+        )
+    )
+    n_per_dim = max(1, int((_TARGET_CHUNK_BYTES / whole_bytes) ** (1 / n_sliced)))
+    chunks = tuple(
+        min(size, n_per_dim) if is_sliced else size
+        for size, is_sliced in zip(shape, sliced, strict=True)
+    )
+
+    # Group chunks along the sliced dimensions into shards of roughly the target size
+    chunk_bytes = itemsize * int(np.prod(chunks))
+    n_per_dim = max(1, int((_TARGET_SHARD_BYTES / chunk_bytes) ** (1 / n_sliced)))
+    shards = tuple(
+        chunk * min(n_per_dim, -(-size // chunk)) if is_sliced else chunk
+        for size, chunk, is_sliced in zip(shape, chunks, sliced, strict=True)
+    )
+    return chunks, shards
+
+
+def _get_profile_encoding(var, profile, file_format):
+    """Build the encoding for a variable from a storage profile.
+
+    Parameters
+    ----------
+    var : xarray.DataArray
+        The (dequantified) variable to be saved.
+
+    profile : str
+        The storage profile, one of the keys of `_STORAGE_PROFILES`.
 
-    return attrs
+    file_format : str
+        The file format to build the encoding for, either `"netcdf"` or `"zarr"`.
+
+    Returns
+    -------
+    dict
+        The encoding for the variable.
+    """
+    if var.ndim == 0 or not np.issubdtype(var.dtype, np.number):
+        return {}
+    chunking = _get_profile_chunks(var.dims, var.shape, var.dtype.itemsize, profile)
+    if file_format == "zarr":
+        encoding = {"compressors": _zarr_compressors()}
+        if chunking:
+            encoding.update({"chunks": chunking[0], "shards": chunking[1]})
+    else:
+        encoding = _NETCDF_COMPRESSION.copy()
+        if chunking:
+            encoding["chunksizes"] = chunking[0]
+    return encoding
 
 
 def _enforce_extension(fpath, required_extension):
@@ -77,7 +216,7 @@ def _enforce_extension(fpath, required_extension):
         return fpath
 
 
-def _save_da(data, fpath):
+def _save_da(data, fpath, profile=None):
     """Save a :class:`xarray.DataArray` or :class:`xarray.Dataset` as a NetCDF file.
 
     Parameters
@@ -87,25 +226,35 @@ def _save_da(data, fpath):
 
     fpath : str
         The path to the file to be created.
+
+    profile : str, optional
+        Storage profile used to set the (compressed) chunking of the data. Defaults to
+        `None`, where the data are saved uncompressed with default chunking.
     """
     # Ensure the file path has the correct extension
     fpath = _enforce_extension(fpath, ".nc")
 
-    # Copy the original attributes of the data to reset them after saving
-    original_attrs = copy.deepcopy(data.attrs)
-
-    # Add a history entry for the data saving to the analysis_history
-    data.history.add(f"Data saved as a NetCDF file to {fpath}.")
-
-    # Prepare the data to be saved by serialising the data attributes
-    data.attrs.update(_serialise_attrs(data.attrs))
-
-    # Save the data and reset the attributes to their original state
-    data.pint.dequantify().to_netcdf(fpath)
-    data.attrs = original_attrs
+    # Add a history entry for the data saving to a shallow copy of the data, and
+    # serialise its attributes (leaving the attributes of the original data untouched)
+    data_to_save = data.history.assign(
+        f"Data saved as a NetCDF file to {fpath}.", fn_name="_save_da"
+    )
+    data_to_save.attrs = _serialise_attrs(data_to_save.attrs)
+
+    # Save the data
+    data_to_save = data_to_save.pint.dequantify().copy(deep=False)
+    if profile is not None:
+        if isinstance(data_to_save, xr.DataArray):
+            data_to_save.encoding.update(
+                _get_profile_encoding(data_to_save, profile, "netcdf")
+            )
+        else:
+            for var in data_to_save.data_vars.values():
+                var.encoding.update(_get_profile_encoding(var, profile, "netcdf"))
+    data_to_save.to_netcdf(fpath)
 
 
-def _save_dt(data, fpath):
+def _save_dt(data, fpath, profile=None):
     """Save a :class:`xarray.DataTree` as a zarr file.
 
     Parameters
@@ -115,71 +264,239 @@ def _save_dt(data, fpath):
 
     fpath : str
         The path to the file to be created.
+
+    profile : str, optional
+        Storage profile used to set the chunking, sharding and compression of the data.
+        Defaults to `None`, where the data are saved with default chunking.
     """
     # Ensure the file path has the correct extension
     fpath = _enforce_extension(fpath, ".zarr")
 
-    def _quantify_da_in_dt(data):
-        return data.pint.quantify()
-
-    def _add_history_entry(da):
-        da.history.add(f"Data saved as part of a DataTree Zarr file to {fpath}.")
-        return da
-
-    def _serialise_da_in_dt(data):
-        """Serialises the attributes of a :class:`xarray.DataArray` or similar for saving
-        in NetCDF/Zarr files.
-        """
-        data.attrs.update(_serialise_attrs(data.attrs))
-        return data
+    history_record = f"Data saved as part of a DataTree Zarr file to {fpath}."
 
     def _parse_nodes_in_dt(ds):
         """Parse the attributes of the current datatree node.
 
         Parameters
         ----------
-        ds : xarray.DataArray or xarray.Dataset
-            The data to be parsed
+        ds : xarray.Dataset
+            The data to be parsed. This is not modified.
 
         Returns
         -------
         xarray.Dataset : The parsed data
         """
-        # Add history entries to the Dataset or DataArray as appropriate
-        if "_analysis_history" in ds.attrs:
-            ds = _add_history_entry(ds)
-        else:
-            ds = ds.map(_add_history_entry)
-        # Serialise attributes of each DataArray, mapping over the DataTree & Datasets
-        ds = _serialise_da_in_dt(ds).map(_serialise_da_in_dt)
+        # Shallow copy the node, so that the attributes can be replaced without
+        # modifying (or copying the contents of) the attributes of the original data
+        ds = ds.copy(deep=False)
+
+        # Add history entries to the Dataset or DataArrays as appropriate, and
+        # serialise their attributes
+        node_history = "_analysis_history" in ds.attrs
+        if node_history:
+            ds.attrs = ds.history.assign(history_record, fn_name="_save_dt").attrs
+        ds.attrs = _serialise_attrs(ds.attrs)
+        for var in ds.data_vars.values():
+            if not node_history:
+                var.attrs = var.history.assign(history_record, fn_name="_save_dt").attrs
+            var.attrs = _serialise_attrs(var.attrs)
 
         # Dequantify the Dataset
         ds = ds.pint.dequantify()
+
+        # Align any dask chunks with the Zarr shards to allow safe parallel writes
+        if profile is not None:
+            for name, var in ds.data_vars.items():
+                var_encoding = _get_profile_encoding(var, profile, "zarr")
+                if "shards" in var_encoding and var.chunks is not None:
+                    ds[name] = var.chunk(
+                        dict(zip(var.dims, var_encoding["shards"], strict=True))
+                    )
         return ds
 
-    # Iterate through the DataTree and store the original attributes of each node
-    original_attrs = []
-    for node in data.subtree:
-        if node.attrs:
-            original_attrs.append(copy.deepcopy(node.attrs))
-        else:
-            original_attrs.append({})
+    # Map over the DataTree to serialise the attributes and dequantify the DataArrays,
+    # processing the nodes concurrently
+    data = _map_over_datasets_concurrently(data, _parse_nodes_in_dt)
+
+    def _write_node(rel_path, node):
+        """Write a single node of the DataTree to its group in the Zarr file."""
+        encoding = None
+        if profile is not None:
+            encoding = {
+                name: _get_profile_encoding(var, profile, "zarr")
+                for name, var in node.data_vars.items()
+            }
+        at_root = node is data
+        node.to_dataset(inherit=at_root).to_zarr(
+            fpath,
+            group=None if at_root else rel_path,
+            mode="w-",
+            encoding=encoding,
+            consolidated=False,
+        )
+
+    # Save data as a zarr file, writing the nodes at each level of the tree concurrently
+    # (so that parent groups always exist before their children are written), and
+    # consolidating the metadata once all nodes have been written
+    levels = {}
+    for rel_path, node in data.subtree_with_keys:
+        levels.setdefault(node.level, []).append((rel_path, node))
+    with ThreadPoolExecutor() as executor:
+        for level in sorted(levels):
+            list(executor.map(lambda item: _write_node(*item), levels[level]))
+    zarr.consolidate_metadata(fpath)
+
+
+class ZarrWriter:
+    """Context manager to stream data to a Zarr file, appending along a dimension.
+
+    Each block of data passed to :meth:`append` is written to the file as it is added, so
+    that processed data (e.g. slices which are k-converted or fitted one at a time) never
+    need to be held in memory together. The serialised metadata and analysis history are
+    written once with the first block; those of later blocks are ignored. The Zarr file is
+    a :class:`xarray.DataTree` with the data stored as the variable `data` in the node
+    ``group``, and can be re-opened with :func:`peaks.load`.
+
+    Parameters
+    ----------
+    fpath : str
+        Path to the Zarr file. If the file (and group) already exist, data are appended to
+        the existing data.
 
-    # Map over the DataTree to serialise the attributes and dequantify the DataArrays
-    data = data.map_over_datasets(_parse_nodes_in_dt)
+    append_dim : str
+        The dimension along which to append the data.
 
-    # Save data as a zarr file
-    data.to_zarr(fpath)
+    group : str, optional
+        Name of the :class:`xarray.DataTree` node to write the data to. Defaults to the name
+        of the first data block, or `data` if this is not set.
 
-    # Reset the attributes of the data to their original state
-    for node, attrs in zip(data.subtree, original_attrs, strict=True):
-        node.attrs = attrs
+    profile : str, optional
+        Storage profile used to set the chunking, sharding and compression of the data (see
+        :func:`save`). Chunks are always a single appended block long along
+        ``append_dim``.
 
-    # Re-quanitfy the data
-    data = data.map_over_datasets(_quantify_da_in_dt)
+    Examples
+    --------
+    Example usage is as follows::
+
+        import peaks as pks
 
+        hv_scan = pks.load('hv_scan.nxs')
 
-def save(data, fpath):
+        # Convert to k-space one photon energy at a time, streaming the results to disk
+        with pks.ZarrWriter('hv_scan_k.zarr', append_dim='hv') as writer:
+            for hv in hv_scan.hv:
+                writer.append(hv_scan.sel(hv=hv).k_convert())
+
+        # Re-open the data
+        hv_scan_k = pks.load('hv_scan_k.zarr')
+    """
+
+    def __init__(self, fpath, append_dim, group=None, profile=None):
+        if profile is not None and profile not in _STORAGE_PROFILES:
+            raise ValueError(
+                f"Unknown storage profile {profile}. Expected one of "
+                f"{set(_STORAGE_PROFILES.keys())}."
+            )
+        self.fpath = _enforce_extension(fpath, ".zarr")
+        self.append_dim = append_dim
+        self.group = group
+        self.profile = profile
+        self._initialised = False
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context manager, consolidating the Zarr metadata."""
+        self.close()
+
+    def append(self, data):
+        """Write a block of data to the file, appending along ``append_dim``.
+
+        Parameters
+        ----------
+        data : xarray.DataArray or xarray.Dataset
+            The data to append. Should contain ``append_dim`` as a dimension, or as a
+            scalar co-ordinate (e.g. a single slice selected with `.sel`).
+        """
+        if self.append_dim not in data.dims:
+            if self.append_dim not in data.coords:
+                raise ValueError(
+                    f"Data must have {self.append_dim} as a dimension or co-ordinate to "
+                    f"be appended along it."
+                )
+            data = data.expand_dims(self.append_dim)
+
+        if self.group is None:
+            self.group = data.name if isinstance(data, xr.DataArray) else None
+            self.group = self.group or "data"
+        if not self._initialised:
+            self._initialised = self._group_exists()
+
+        if self._initialised:
+            # Metadata are already stored, so only write the data
+            data = self._to_dataset(data.pint.dequantify()).drop_attrs(deep=True)
+            data.to_zarr(
+                self.fpath,
+                group=self.group,
+                mode="a",
+                append_dim=self.append_dim,
+                consolidated=False,
+            )
+            return
+
+        # First block - write the data along with its serialised metadata
+        data = data.history.assign(
+            f"Data streamed to a Zarr file {self.fpath}, appending along "
+            f"{self.append_dim}."
+        )
+        data.attrs = _serialise_attrs(data.attrs)
+        data = self._to_dataset(data.pint.dequantify())
+        encoding = None
+        if self.profile is not None:
+            encoding = {}
+            for name, var in data.data_vars.items():
+                encoding[name] = _get_profile_encoding(var, self.profile, "zarr")
+                if "chunks" in encoding[name] and self.append_dim in var.dims:
+                    axis = var.dims.index(self.append_dim)
+                    for key in ["chunks", "shards"]:
+                        encoding[name][key] = tuple(
+                            var.shape[axis] if i == axis else size
+                            for i, size in enumerate(encoding[name][key])
+                        )
+        data.to_zarr(
+            self.fpath,
+            group=self.group,
+            mode="a",
+            encoding=encoding,
+            consolidated=False,
+        )
+        self._initialised = True
+
+    def close(self):
+        """Consolidate the Zarr metadata once all data have been written."""
+        if self._initialised:
+            zarr.consolidate_metadata(self.fpath)
+
+    def _group_exists(self):
+        """Check whether the group already exists in the Zarr file."""
+        try:
+            zarr.open_group(self.fpath, path=self.group, mode="r")
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _to_dataset(data):
+        """Convert a :class:`xarray.DataArray` to the `peaks` DataTree node format."""
+        if isinstance(data, xr.DataArray):
+            return data.to_dataset(name="data", promote_attrs=False)
+        return data
+
+
+def save(data, fpath, profile=None, append_dim=None):
     """This function saves data in the :class:`xarray.DataArray` or
     :class:`xarray.DataSet` format as a NetCDF file or a :class:`xarray.DataTree` as a
     zarr file. These formats are restricted in what types of attributes can be saved.
@@ -196,6 +513,25 @@ def save(data, fpath):
         Path to the file to be created. Note: the extension of the file must either be omitted, or must be specified
         as .nc for a :class:`xarray.DataArray` or :class:`xarray.DataSet` and .zarr for a :class:`xarray.DataTree`.
 
+    profile : str, optional
+        Storage profile used to choose the chunking and compression of the saved data to suit
+        how it will be accessed on re-loading. Options are:
+
+        - `"fermi_surface"`: chunk along the energy axis, keeping full constant-energy slices
+          together;
+        - `"edc"`: keep the full energy axis together, chunking along all other dimensions;
+        - `"spatial_map"`: keep the full spectrum at each spatial (`x1`, `x2`, `x3`) pixel
+          together.
+
+        Data are compressed with zstd (Blosc) for Zarr files, where chunks are also grouped into
+        Zarr v3 shards, and with zlib for NetCDF files. Defaults to `None`, where the data are
+        saved uncompressed with default chunking.
+
+    append_dim : str, optional
+        If set, the :class:`xarray.DataArray` or :class:`xarray.DataSet` is written to (or
+        appended to existing data in) a Zarr file along the dimension ``append_dim``, allowing
+        data to be saved incrementally. See :class:`ZarrWriter`. Defaults to `None`.
+
     Examples
     --------
     Example usage is as follows::
@@ -208,8 +544,26 @@ def save(data, fpath):
         # Save the data as a NetCDF file
         pks.save(data, 'my_file.nc')
 
+        # Save compressed data chunked for reading constant-energy slices
+        pks.save(data, 'my_file.nc', profile='fermi_surface')
+
+        # Append slices to a Zarr file as they are processed
+        for hv in data.hv:
+            data.sel(hv=hv).k_convert().save('my_file_k.zarr', append_dim='hv')
+
     """
-    if isinstance(data, (xr.DataArray, xr.Dataset)):
-        _save_da(data, fpath)
+    if profile is not None and profile not in _STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile {profile}. Expected one of "
+            f"{set(_STORAGE_PROFILES.keys())}."
+        )
+
+    if append_dim is not None:
+        if isinstance(data, xr.DataTree):
+            raise ValueError("Appending is not supported for saving a DataTree.")
+        with ZarrWriter(fpath, append_dim, profile=profile) as writer:
+            writer.append(data)
+    elif isinstance(data, (xr.DataArray, xr.Dataset)):
+        _save_da(data, fpath, profile)
     elif isinstance(data, xr.DataTree):
-        return _save_dt(data, fpath)
+        return _save_dt(data, fpath, profile)
@@ -1,18 +1,21 @@
 import importlib
 import json
 import re
-from typing import Optional
+from functools import lru_cache
 
 import pint_xarray  # noqa: F401
 import xarray as xr
-from pydantic import create_model
 
 from peaks.core.fileIO.base_data_classes.base_data_class import BaseDataLoader
+from peaks.core.fileIO.data_saving import _METADATA_SCHEMA_VERSION
 from peaks.core.fileIO.loc_registry import register_loader
-from peaks.core.metadata.base_metadata_models import AxisMetadataModelWithReference
+from peaks.core.metadata.base_metadata_models import _get_manipulator_metadata_model
 from peaks.core.options import opts
 from peaks.core.utils.misc import analysis_warning
 
+# Pattern to extract the loc from the serialised scan metadata
+_LOC_PATTERN = re.compile(r'"loc":"(.*?)"')
+
 
 # Classes for data loaders
 @register_loader
@@ -79,46 +82,92 @@ class NetCDFLoader(BaseDataLoader):
     @classmethod
     def _parse_metadata(cls, data):
         """Parse the metadata from the loaded data, returning to `peaks` format."""
-        if data.attrs.get("metadata_models"):
-            # Try to parse the loc
-            loc = None
-            loc_pattern = r'"loc":"(.*?)"'
-            if data.attrs.get("_scan"):
-                match = re.search(loc_pattern, data.attrs.get("_scan"))
-                if match:
-                    loc = match.group(1)
-
-            metadata_models = json.loads(data.attrs.pop("metadata_models"))
-            for attr_name, attr in data.attrs.items():
-                model = metadata_models.get(attr_name)
-                if model == "json":
-                    data.attrs[attr_name] = json.loads(attr)
-                elif model and "ManipulatorMetadataModel" in model:
-                    # Need to handle this as a special case as the ManipulatorMetadataModel
-                    # is created dynamically in loaders
-
-                    # Get the axes for the original loader
-                    manipulator_axes = cls.get_loader(loc)._manipulator_axes
-
-                    # Rebuild manipulator metadata model
-                    fields = {
-                        axis: (Optional[AxisMetadataModelWithReference], None)
-                        for axis in manipulator_axes
-                    }
-                    ManipulatorMetadataModel = create_model(
-                        "ManipulatorMetadataModel", **fields
-                    )
-                    data.attrs[attr_name] = ManipulatorMetadataModel.model_validate_json(
-                        attr
-                    )
-                elif model:
-                    model_class = cls._get_metadata_model(model)
-                    data.attrs[attr_name] = model_class.model_validate_json(attr)
+        if data.attrs.get("peaks_metadata"):
+            cls._parse_metadata_document(data)
+        elif data.attrs.get("metadata_models"):
+            cls._parse_metadata_v1(data)
+
+    @classmethod
+    def _parse_metadata_document(cls, data):
+        """Parse metadata stored as a single versioned JSON document in the
+        `peaks_metadata` attribute (see
+        :func:`peaks.core.fileIO.data_saving._serialise_attrs`).
+        """
+        document = json.loads(data.attrs["peaks_metadata"])
+        if document.get("schema_version", 0) > _METADATA_SCHEMA_VERSION:
+            analysis_warning(
+                "Metadata were saved by a later version of peaks "
+                f"({document.get('peaks_version')}) and could not be parsed. They are "
+                "left as a JSON string in the `peaks_metadata` attribute. Update peaks "
+                "to parse them.",
+                title="Loading info",
+                warn_type="warning",
+            )
+            return
+        del data.attrs["peaks_metadata"]
+
+        entries = document["attrs"]
+        loc = entries.get("_scan", {}).get("value", {}).get("loc")
+        parsed_attrs = {}
+        for attr_name, entry in entries.items():
+            if entry["model"] == "json":
+                parsed_attrs[attr_name] = entry["value"]
+            else:
+                model_class = cls._get_metadata_model_for_loc(entry["model"], loc)
+                parsed_attrs[attr_name] = model_class.model_validate(entry["value"])
+
+        # Restore the original order of the attributes, followed by any others added on
+        # saving (e.g. units)
+        attrs = {}
+        for attr_name in document.get("attr_order", []) + list(data.attrs):
+            if attr_name in parsed_attrs:
+                attrs[attr_name] = parsed_attrs[attr_name]
+            elif attr_name in data.attrs:
+                attrs[attr_name] = data.attrs[attr_name]
+        data.attrs = attrs
+
+    @classmethod
+    def _parse_metadata_v1(cls, data):
+        """Parse metadata stored with the version 1 layout, where each attribute is
+        a separate JSON string."""
+        # Try to parse the loc
+        loc = None
+        if data.attrs.get("_scan"):
+            match = _LOC_PATTERN.search(data.attrs.get("_scan"))
+            if match:
+                loc = match.group(1)
+
+        metadata_models = json.loads(data.attrs.pop("metadata_models"))
+        for attr_name, attr in data.attrs.items():
+            model = metadata_models.get(attr_name)
+            if model == "json":
+                data.attrs[attr_name] = json.loads(attr)
+            elif model:
+                model_class = cls._get_metadata_model_for_loc(model, loc)
+                data.attrs[attr_name] = model_class.model_validate_json(attr)
 
     @classmethod
-    def _get_metadata_model(cls, class_path):
+    def _get_metadata_model_for_loc(cls, class_path, loc):
+        """Return the metadata model class from its fully qualified class name, for
+        data from location `loc`."""
+        if "ManipulatorMetadataModel" in class_path:
+            # Need to handle this as a special case as the ManipulatorMetadataModel
+            # is created dynamically in loaders
+
+            # Get the manipulator metadata model for the axes of the original loader
+            return _get_manipulator_metadata_model(
+                tuple(cls.get_loader(loc)._manipulator_axes)
+            )
+        return cls._get_metadata_model(class_path)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_metadata_model(class_path):
         """Dynamically load the relevant metadata class from the fully qualified class name.
 
+        Resolved classes are cached, as the same models are re-used for every loaded
+        node of a DataTree.
+
         Parameters
         ----------
         class_path : str
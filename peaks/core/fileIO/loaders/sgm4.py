@@ -1,6 +1,7 @@
 import math
 from typing import Optional, Union
 
+import dask.array as da
 import h5py
 import numpy as np
 import pint_xarray
@@ -16,10 +17,33 @@ from peaks.core.metadata.base_metadata_models import (
     BaseMetadataModel,
     Quantity,
 )
+from peaks.core.options import opts
+from peaks.core.utils.misc import analysis_warning
 
 ureg = pint_xarray.unit_registry
 
 
+class _SGM4HDF5Dataset:
+    """Array-like view of an HDF5 dataset which re-opens the file on each read.
+
+    Used as the source of a :func:`dask.array.from_array` call, so that the lazily
+    evaluated array remains valid (and picklable) after the file used to parse the
+    scan structure has been closed.
+    """
+
+    def __init__(self, fpath, key):
+        self.fpath = fpath
+        self.key = key
+        with h5py.File(fpath, "r", swmr=True) as f:
+            self.shape = f[key].shape
+            self.dtype = f[key].dtype
+        self.ndim = len(self.shape)
+
+    def __getitem__(self, idx):
+        with h5py.File(self.fpath, "r", swmr=True) as f:
+            return f[self.key][idx]
+
+
 class SGM4KeithleyMetadataModel(BaseMetadataModel):
     """Model to store metadata for SGM4 Nano-ARPES focussing optics metadata."""
 
@@ -124,7 +148,89 @@ class SGM4NanoARPESLoader(BaseHDF5DataLoader, BaseARPESDataLoader, BaseOpticsDat
         return {"_keithley": keithley_metadata}, None
 
     @classmethod
-    def _load_data(cls, fpath, metadata=False, Lazy=False, **kwargs):
+    def _read_scan_dataset(cls, fpath, key, slow_shape, frame_shape, lazy):
+        """Read a dataset stored as a flat list of scan points, reshaped onto the scan grid.
+
+        Parameters
+        ----------
+        fpath : str
+            Path to the file to be loaded.
+        key : str
+            HDF5 key of the dataset, with the scan points along the first axis.
+        slow_shape : tuple
+            Shape of the slow (scanned) axes, in the order they should appear in the data.
+        frame_shape : tuple
+            Shape of the data recorded at each scan point.
+        lazy : bool or None
+            Whether to return a lazily evaluated :class:`dask.array.Array`. If `None`, data are
+            loaded lazily if their size exceeds `opts.FileIO.lazy_size`.
+
+        Returns
+        -------
+        data : numpy.ndarray or dask.array.Array
+            The data reshaped to `(*slow_shape, *frame_shape)`. Any missing trailing entries of a
+            partially complete scan are represented by NaN.
+        """
+        source = _SGM4HDF5Dataset(fpath, key)
+        n_points = source.shape[0]
+        n_target = math.prod(slow_shape)
+        if n_points > n_target:
+            raise ValueError(
+                "Dataset appears to have more entries than expected. This should not happen."
+            )
+        if n_points < n_target:
+            analysis_warning(
+                "You are loading an only partially complete dataset. The missing entries are represented by nan.",
+                title="Loading info",
+                warn_type="warning",
+            )
+        # NaN padding of a partial scan requires a floating point dtype
+        dtype = (
+            source.dtype
+            if n_points == n_target
+            else np.promote_types(source.dtype, np.float32)
+        )
+        target_shape = (*slow_shape, *frame_shape)
+        nbytes = n_target * math.prod(source.shape[1:]) * np.dtype(dtype).itemsize
+        if lazy is None:
+            lazy = nbytes > opts.FileIO.lazy_size
+
+        if lazy:
+            data = da.from_array(
+                source,
+                chunks=("auto", *source.shape[1:]),
+                asarray=True,
+                name=cls._dask_name(fpath, key, source.shape, source.dtype),
+            ).astype(dtype)
+            if n_points < n_target:
+                data = da.concatenate(
+                    [
+                        data,
+                        da.full(
+                            (n_target - n_points, *source.shape[1:]),
+                            np.nan,
+                            dtype=dtype,
+                            chunks=(data.chunksize[0], *source.shape[1:]),
+                        ),
+                    ]
+                )
+            return data.reshape(target_shape)
+
+        # Read directly into a single pre-allocated (NaN-filled if partial) buffer
+        data = np.empty((n_target, *source.shape[1:]), dtype=dtype)
+        if n_points < n_target:
+            data[n_points:] = np.nan
+        with h5py.File(fpath, "r", swmr=True) as f:
+            if n_points > 0:
+                f[key].read_direct(data, dest_sel=np.s_[:n_points])
+        return data.reshape(target_shape)
+
+    @classmethod
+    def _load_data(cls, fpath, lazy=None, **kwargs):
+        # Support the legacy `Lazy` keyword
+        legacy_lazy = kwargs.pop("Lazy", None)
+        if lazy is None:
+            lazy = legacy_lazy
         with h5py.File(fpath, "r", swmr=True) as h5file:
             scandetails = h5file["/Entry/Data/ScanDetails/"]
             # Determine whether data is a knife-edge, or ordinary scan.
@@ -166,29 +272,14 @@ class SGM4NanoARPESLoader(BaseHDF5DataLoader, BaseARPESDataLoader, BaseOpticsDat
                         ]
                     )
                     SlowAxis.append(axistemp)
-                # Load dataset:
-                dset = h5file["Entry/Data/TransformedData"][()]
-                TargLen = math.prod(Slowlen)
-                Len = len(dset)
-                # Reshape:
-                if Len == TargLen:
-                    dset = dset.reshape(tuple(np.append(Slowlen[::-1], Fastlen)))
-                elif Len < TargLen:
-                    Warning(
-                        "You are loading an only partially complete dataset. The missing entries are represented by nan."
-                    )
-                    padlen = TargLen - Len
-                    padarr = [int(padlen)]
-                    padarr.extend(list(dset.shape)[1::])
-                    padarr = np.empty(tuple(padarr))
-                    padarr[:] = np.nan
-                    dset = np.append(dset, padarr).reshape(
-                        tuple(np.append(Slowlen[::-1], Fastlen))
-                    )
-                else:
-                    raise ValueError(
-                        "Dataset appears to have more entries than expected. This should not happen."
-                    )
+                # Load dataset, reshaped onto the scan grid:
+                dset = cls._read_scan_dataset(
+                    fpath,
+                    "Entry/Data/TransformedData",
+                    tuple(int(i) for i in Slowlen[::-1]),
+                    tuple(int(i) for i in Fastlen),
+                    lazy,
+                )
                 # Convert to xarray:
                 dimnames = [i.decode() for i in scandetails["SlowAxis_names"][()][::-1]]
                 dimnames.extend([i.decode() for i in scandetails["FastAxis_names"][()]])
@@ -274,24 +365,14 @@ class SGM4NanoARPESLoader(BaseHDF5DataLoader, BaseARPESDataLoader, BaseOpticsDat
                         ]
                     )
                     SlowAxis.append(axistemp)
-                # Load dataset:
-                dset = h5file["/Entry/Process/SumData"][()]
-                TargLen = math.prod(Slowlen)
-                Len = len(dset)
-                # Reshape:
-                if Len == TargLen:
-                    dset = dset.reshape(tuple(Slowlen[::-1]))
-                elif Len < TargLen:
-                    Warning(
-                        "You are loading an only partially complete dataset. The missing entries are represented by nan."
-                    )
-                    padlen = TargLen - Len
-                    padarr = np.array([np.nan] * padlen)
-                    dset = np.append(dset, padarr).reshape(tuple(Slowlen[::-1]))
-                else:
-                    raise ValueError(
-                        "Dataset appears to have more entries than expected. This should not happen."
-                    )
+                # Load dataset, reshaped onto the scan grid:
+                dset = cls._read_scan_dataset(
+                    fpath,
+                    "/Entry/Process/SumData",
+                    tuple(int(i) for i in Slowlen[::-1]),
+                    (),
+                    lazy,
+                )
                 # Convert to xarray:
                 dimnames = [i.decode() for i in scandetails["SlowAxis_names"][()][::-1]]
                 axis = SlowAxis[::-1]
@@ -2,6 +2,7 @@ from xarray import open_datatree
 
 from peaks.core.fileIO.loaders.netcdf import NetCDFLoader
 from peaks.core.fileIO.loc_registry import register_loader
+from peaks.core.utils.datatree_utils import _map_over_datasets_concurrently
 from peaks.core.utils.misc import analysis_warning
 
 
@@ -39,9 +40,6 @@ class ZarrLoader(NetCDFLoader):
         # Load Zarr file as xarray.DataArray or xarray.Dataset
         data = open_datatree(fpath, engine="zarr", chunks={})
 
-        # Parse the metadata
-        data = data.map_over_datasets(ZarrLoader._parse_ds_metadata)
-
         if metadata is False and not quiet:
             analysis_warning(
                 "`metadata=False` option has no effect when loading Zarr files. "
@@ -50,13 +48,17 @@ class ZarrLoader(NetCDFLoader):
                 warn_type="info",
             )
 
-        # Quantify the data
-        data = data.map_over_datasets(ZarrLoader._quantify_da_in_dt)
+        # Parse the metadata, quantify and (if not lazy) actually load the data,
+        # processing the nodes of the DataTree concurrently
+        def _load_node(ds):
+            ds = ZarrLoader._quantify_da_in_dt(ZarrLoader._parse_ds_metadata(ds))
+            if not lazy:
+                ds = ZarrLoader._load_all(ds)
+            return ds
+
+        data = _map_over_datasets_concurrently(data, _load_node)
 
-        # Actually load the data
-        if not lazy:
-            data = data.map_over_datasets(ZarrLoader._load_all)
-        elif not quiet:
+        if lazy and not quiet:
             analysis_warning(
                 "The data is lazily loaded by default for loading from a Zarr store. "
                 "Use the .compute() method on the individual data entries to load each into memory. "
@@ -1,6 +1,9 @@
 """Registry for file loaders and locations."""
 
+import inspect
 import os
+import re
+import zipfile
 from os.path import isfile, join
 
 import h5py
@@ -8,6 +11,25 @@ import natsort
 
 LOC_REGISTRY = {}
 
+# Cache of identified locations: {directory: {file name: (file signature, loc)}}
+_LOC_CACHE = {}
+
+# Maximum number of bytes read from the start of a file when sniffing its contents
+_SNIFF_BYTES = 8192
+
+# Compiled signatures used to identify the location from file contents
+_SES_LOCATION_REGEX = re.compile(
+    r"^[ \t]*Location[ \t]*[=:][ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+_SES_LOCATION_SIGNATURES = (
+    (re.compile(r"bloch|maxiv", re.IGNORECASE), "MAXIV_Bloch_A"),
+    (re.compile(r"ape|elettra", re.IGNORECASE), "Elettra_APE_LE"),
+    (re.compile(r"cassiopee|soleil", re.IGNORECASE), "Soleil_Casiopee_ARPES"),
+)
+_SES_ZIP_LOCATION_SIGNATURES = _SES_LOCATION_SIGNATURES + (
+    (re.compile(r"i05|diamond", re.IGNORECASE), "Diamond I05-nano"),
+)
+
 
 def locs():
     """Return the list of available locations."""
@@ -27,8 +49,98 @@ class IdentifyLoc:
     Except for the _default and _no_extension cases, each method name should start with `_handler_`
     followed by the file extension it handles. For example, `_handler_txt` handles `.txt` files,
     `_handler_zip` handles `.zip` files, etc.
+
+    Handlers should identify the location from as little of the file as possible, e.g. the first
+    few kB of the file (see :meth:`_read_header`) or a single HDF5 entry, matching against the
+    compiled signatures defined in this module. Identified locations are cached per directory by
+    :meth:`identify`, and re-determined only if the file is modified.
     """
 
+    @classmethod
+    def identify(cls, fname):
+        """Determine the location at which the data in ``fname`` were obtained.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the file (or folder) to identify.
+
+        Returns
+        -------
+        loc : str
+            The name of the location (typically a beamline).
+        """
+        fname = os.fspath(fname)
+        directory, name = os.path.split(os.path.abspath(fname))
+        try:
+            stat = os.stat(fname)
+            file_signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_signature = None
+
+        # Check the cache for this directory
+        dir_cache = _LOC_CACHE.setdefault(directory, {})
+        cached = dir_cache.get(name)
+        if file_signature is not None and cached and cached[0] == file_signature:
+            return cached[1]
+
+        handler = cls._handlers().get(
+            os.path.splitext(fname)[1], IdentifyLoc._default_handler
+        )
+        loc = handler(fname)
+        if loc is not None and file_signature is not None:
+            dir_cache[name] = (file_signature, loc)
+        return loc
+
+    @staticmethod
+    def clear_cache():
+        """Clear the cache of identified locations."""
+        _LOC_CACHE.clear()
+
+    @classmethod
+    def _handlers(cls):
+        """Return a dictionary mapping file extensions to their handler methods."""
+        if "_handler_table" not in cls.__dict__:
+            # No extension
+            handlers = {"": cls._no_extension}
+            # For ones with file extensions, generate the handlers from the _handler_ methods
+            handlers.update(
+                {
+                    f".{method_name.split('_handler_')[1]}": method
+                    for method_name, method in inspect.getmembers(
+                        cls, predicate=inspect.isfunction
+                    )
+                    if method_name.startswith("_handler")
+                }
+            )
+            cls._handler_table = handlers
+        return cls._handler_table
+
+    @staticmethod
+    def _read_header(fname, n_bytes=_SNIFF_BYTES):
+        """Read (at most) the first ``n_bytes`` of a file."""
+        with open(fname, "rb") as f:
+            return f.read(n_bytes)
+
+    @staticmethod
+    def _match_SES_location(text, signatures=_SES_LOCATION_SIGNATURES):
+        """Match the SES `Location` entry in ``text`` against the location signatures.
+
+        Returns
+        -------
+        loc : str or None
+            The matched location, or `None` if no `Location` entry was found or matched.
+            If a `Location` entry was found but not matched, returns an empty string.
+        """
+        match = _SES_LOCATION_REGEX.search(text)
+        if not match:
+            return None
+        location = match.group(1)
+        for signature, loc in signatures:
+            if signature.search(location):
+                return loc
+        return ""
+
     @staticmethod
     def _default_handler(fname):
         raise ValueError(
@@ -60,17 +172,15 @@ class IdentifyLoc:
     def _handler_xy(fname):
         # If the file is .xy format, the location must be either MAX IV Bloch-spin, StA-Phoibos or StA-Bruker
 
-        # Open the file and load the first line
-        with open(fname) as f:
-            line0 = f.readline()
+        # Sniff the start of the file
+        lines = IdentifyLoc._read_header(fname).splitlines()
 
         # If measurement was performed using Specs analyser, location must be MAX IV Bloch-spin or StA-Phoibos
-        if "SpecsLab" in line0:
-            with open(fname) as f:
-                for _i in range(30):
-                    # If the 'PhoibosSpin' identifier is present in any of the lines, location must be MAX IV Bloch-spin
-                    if "PhoibosSpin" in f.readline():
-                        return "MAX IV Bloch-spin"
+        if lines and b"SpecsLab" in lines[0]:
+            # If the 'PhoibosSpin' identifier is present in any of the first lines, location must be MAX IV
+            # Bloch-spin
+            if any(b"PhoibosSpin" in line for line in lines[:30]):
+                return "MAX IV Bloch-spin"
             # Otherwise by default, assume StA-Phoibos
             return "StA_Phoibos"
 
@@ -89,40 +199,26 @@ class IdentifyLoc:
     @staticmethod
     def _handler_txt(fname):
         # If the file is .txt format, the location must be StA-MBS, MAX IV Bloch, Elettra APE or SOLEIL CASSIOPEE
-
-        # Open the file and load the first line
-        with open(fname) as f:
-            line0 = f.readline()
+        header = IdentifyLoc._read_header(fname)
 
         # MAX IV Bloch, Elettra APE or SOLEIL CASSIOPEE .txt files follow the same SES data format, so we can identify
         # the location from the location line in the file
-        if line0 == "[Info]\n":  # Identifier of the SES data format
-            from peaks.core.fileIO.base_data_classes.base_data_class import (
-                BaseDataLoader,
-            )
-
-            # Extract metadata dictionary from file
-            metadata = BaseDataLoader.load_metadata(
-                fname, loc="SES", return_as_dict=True, quiet=True
-            )
-            location_identifier = metadata.get("local_location_identifier")
-            if (
-                "bloch" in location_identifier.lower()
-                or "maxiv" in location_identifier.lower()
-            ):
-                return "MAXIV_Bloch_A"
-            elif (
-                "ape" in location_identifier.lower()
-                or "elettra" in location_identifier.lower()
-            ):
-                return "Elettra_APE_LE"
-            elif (
-                "cassiopee" in location_identifier.lower()
-                or "soleil" in location_identifier.lower()
-            ):
-                return "Soleil_Casiopee_ARPES"
-
-        elif "Lines" in line0:
+        if header.startswith(
+            (b"[Info]\n", b"[Info]\r\n")
+        ):  # Identifier of the SES data format
+            text = header.decode(errors="ignore")
+            if len(header) == _SNIFF_BYTES and not _SES_LOCATION_REGEX.search(text):
+                # Long header (e.g. long dimension scales) - read on until the data starts
+                with open(fname, errors="ignore") as f:
+                    lines = []
+                    for line in f:
+                        if "[Data" in line:
+                            break
+                        lines.append(line)
+                text = "".join(lines)
+            return IdentifyLoc._match_SES_location(text) or None
+
+        elif b"Lines" in header.split(b"\n", 1)[0]:
             # This should be MBS format, default to StA loader
             return "StA_MBS"
 
@@ -130,33 +226,23 @@ class IdentifyLoc:
     def _handler_zip(fname):
         # If the file is .zip format, the file must be of SES format. Thus, the location must be MAX IV Bloch,
         # Elettra APE, SOLEIL CASSIOPEE or Diamond I05-nano (defl map)
-        from peaks.core.fileIO.base_data_classes.base_data_class import BaseDataLoader
 
-        # Extract metadata dictionary from file
-        metadata = BaseDataLoader.load_metadata(
-            fname, loc="SES", return_as_dict=True, quiet=True
+        # Read the location from the general (non-spectrum) .ini file in the archive
+        with zipfile.ZipFile(fname, "r") as z:
+            file_ini = [
+                file
+                for file in z.namelist()
+                if "Spectrum_" not in file and ".ini" in file
+            ]
+            if not file_ini:
+                raise FileNotFoundError(
+                    "No .ini file found in the .zip archive. Cannot extract metadata."
+                )
+            with z.open(file_ini[0], "r") as f:
+                text = f.read().decode(errors="ignore")
+        return (
+            IdentifyLoc._match_SES_location(text, _SES_ZIP_LOCATION_SIGNATURES) or None
         )
-        location_identifier = metadata.get("local_location_identifier")
-        if (
-            "bloch" in location_identifier.lower()
-            or "maxiv" in location_identifier.lower()
-        ):
-            return "MAXIV_Bloch_A"
-        elif (
-            "ape" in location_identifier.lower()
-            or "elettra" in location_identifier.lower()
-        ):
-            return "Elettra_APE_LE"
-        elif (
-            "cassiopee" in location_identifier.lower()
-            or "soleil" in location_identifier.lower()
-        ):
-            return "Soleil_Casiopee_ARPES"
-        elif (
-            "i05" in location_identifier.lower()
-            or "diamond" in location_identifier.lower()
-        ):
-            return "Diamond I05-nano"
 
     @staticmethod
     def _handler_ibw(fname):
@@ -167,22 +253,8 @@ class IdentifyLoc:
 
         # If the file is .ibw format, the file is likely SES format.
         if "SES" in wavenote:
-            from peaks.core.fileIO.base_arpes_data_classes.base_ses_class import (
-                SESDataLoader,
-            )
-
-            metadata_dict_SES_keys = SESDataLoader._SES_metadata_to_dict_w_SES_keys(
-                wavenote.split("\r")
-            )
-            location = metadata_dict_SES_keys.get("Location")
-            if "bloch" in location.lower() or "maxiv" in location.lower():
-                return "MAXIV_Bloch_A"
-            elif "ape" in location.lower() or "elettra" in location.lower():
-                return "Elettra_APE_LE"
-            elif "cassiopee" in location.lower() or "soleil" in location.lower():
-                return "Soleil_Casiopee_ARPES"
-            else:  # Return general SES loader
-                return "SES"
+            # Return general SES loader if no location matched
+            return IdentifyLoc._match_SES_location(wavenote.replace("\r", "\n")) or "SES"
         # If we are unable to find a location, define location as a generic ibw file
         return "ibw"
 
@@ -190,16 +262,14 @@ class IdentifyLoc:
     def _handler_nxs(fname):
         # If the file is .nxs format, the location should be Diamond I05-nano or Diamond I05-HR
 
-        from peaks.core.fileIO.base_data_classes.base_hdf5_class import (
-            BaseHDF5DataLoader,
-        )
-
-        # Open the file (read only)
+        # Open the file (read only) and read the single identifying entry
         with h5py.File(fname, "r") as f:
             # .nxs files at Diamond and Alba contain approximately the same identifier format
-            identifier = BaseHDF5DataLoader._extract_hdf5_value(
-                f, "entry1/instrument/name"
-            )
+            identifier = f.get("entry1/instrument/name")
+            identifier = identifier[()] if identifier is not None else b""
+        identifier = (
+            identifier.decode() if isinstance(identifier, bytes) else str(identifier)
+        )
         # From the identifier, determine the location
         if "i05-1" in identifier:
             return "Diamond_I05_Nano-ARPES"
@@ -0,0 +1,582 @@
+"""Vectorised Levenberg-Marquardt fitting of many spectra at once for the built-in models."""
+
+import inspect
+import operator
+
+import lmfit.lineshapes as lm_lineshapes
+import lmfit.models as lm_models
+import numpy as np
+from asteval import Interpreter
+from lmfit import CompositeModel
+from lmfit.parameter import SCIPY_FUNCTIONS
+from scipy.special import expit
+
+from peaks.core.fitting.fermi_edge_fit import fermi_edge_fit, supports_fermi_edge_fit
+from peaks.core.fitting.fit_functions import (
+    FIT_CONVERGED,
+    FIT_NOT_CONVERGED,
+    TINY,
+    _fermi_function,
+    _linear_dos_fermi,
+    kb_eV,
+)
+from peaks.core.fitting.lineshapes import doniach, faddeeva, voigt
+from peaks.core.fitting.models import GaussianConvolvedFitModel
+
+S2 = np.sqrt(2.0)
+S2PI = np.sqrt(2.0 * np.pi)
+_TARGET_BLOCK_BYTES = 2**26  # Target size of the Jacobian for a single block of spectra
+
+
+# --------------------------------------------------------- #
+#      Model functions with analytic Jacobians              #
+# --------------------------------------------------------- #
+# Each function takes the independent variable x (M,) and the function arguments as arrays broadcastable to (N, 1),
+# and returns the model (N, M) and a dictionary of its derivatives with respect to each argument.
+
+
+def _gaussian(x, amplitude, center, sigma):
+    sigma = np.maximum(sigma, TINY)
+    dx = x - center
+    g = np.exp(-(dx**2) / (2 * sigma**2)) / (S2PI * sigma)
+    f = amplitude * g
+    return f, {
+        "amplitude": g,
+        "center": f * dx / sigma**2,
+        "sigma": f * (dx**2 / sigma**3 - 1 / sigma),
+    }
+
+
+def _lorentzian(x, amplitude, center, sigma):
+    sigma = np.maximum(sigma, TINY)
+    dx = x - center
+    denominator = dx**2 + sigma**2
+    g = sigma / (np.pi * denominator)
+    return amplitude * g, {
+        "amplitude": g,
+        "center": amplitude * 2 * sigma * dx / (np.pi * denominator**2),
+        "sigma": amplitude * (dx**2 - sigma**2) / (np.pi * denominator**2),
+    }
+
+
+def _voigt(x, amplitude, center, sigma, gamma):
+    sigma = np.maximum(sigma, TINY)
+    z = (x - center + 1j * gamma) / (sigma * S2)
+    w = faddeeva(z)
+    dw_dz = -2 * z * w + 2j / np.sqrt(np.pi)
+    prefactor = amplitude / (sigma * S2PI)
+    f = prefactor * w.real
+    return f, {
+        "amplitude": w.real / (sigma * S2PI),
+        "center": prefactor * (dw_dz * (-1 / (sigma * S2))).real,
+        "sigma": prefactor * (dw_dz * (-z / sigma)).real - f / sigma,
+        "gamma": prefactor * (dw_dz * (1j / (sigma * S2))).real,
+    }
+
+
+def _doniach(x, amplitude, center, sigma, gamma):
+    sigma = np.maximum(sigma, TINY)
+    gm1 = 1 - gamma
+    arg = (x - center) / sigma
+    arctan_arg = np.arctan(arg)
+    phase = np.pi * gamma / 2 + gm1 * arctan_arg
+    scale = sigma**-gm1 * (1 + arg**2) ** (-gm1 / 2)
+    f = amplitude * scale * np.cos(phase)
+    df_darg = (
+        amplitude * scale * gm1 * (-np.sin(phase) - arg * np.cos(phase)) / (1 + arg**2)
+    )
+    return f, {
+        "amplitude": scale * np.cos(phase),
+        "center": -df_darg / sigma,
+        "sigma": -(gm1 * f + arg * df_darg) / sigma,
+        "gamma": f * (np.log(sigma) + np.log1p(arg**2) / 2)
+        - amplitude * scale * np.sin(phase) * (np.pi / 2 - arctan_arg),
+    }
+
+
+def _linear(x, slope, intercept):
+    x = np.broadcast_to(x, np.broadcast_shapes(np.shape(x), np.shape(slope)))
+    return slope * x + intercept, {"slope": x, "intercept": np.ones_like(x)}
+
+
+def _constant(x, c):
+    ones = np.ones(np.broadcast_shapes(np.shape(x), np.shape(c)))
+    return c * ones, {"c": ones}
+
+
+def _fermi_derivatives(x, EF, T):
+    """Return the Fermi function and its derivatives with respect to EF and T."""
+    kT = np.maximum(T * kb_eV, TINY)
+    F = expit((EF - x) / kT)
+    dF_dEF = F * (1 - F) / kT
+    dF_dT = np.where(T * kb_eV > TINY, dF_dEF * (x - EF) / np.maximum(T, TINY), 0)
+    return F, dF_dEF, dF_dT
+
+
+def _fermi(x, EF, T):
+    F, dF_dEF, dF_dT = _fermi_derivatives(x, EF, T)
+    return F, {"EF": dF_dEF, "T": dF_dT}
+
+
+def _linear_dos_fermi_batch(x, EF, T, dos_slope, dos_intercept, bg_slope, bg_intercept):
+    F, dF_dEF, dF_dT = _fermi_derivatives(x, EF, T)
+    dos = dos_intercept - bg_intercept + (dos_slope - bg_slope) * x
+    f = bg_intercept + bg_slope * x + dos * F
+    return f, {
+        "EF": dos * dF_dEF,
+        "T": dos * dF_dT,
+        "dos_slope": x * F,
+        "dos_intercept": F,
+        "bg_slope": x * (1 - F),
+        "bg_intercept": 1 - F,
+    }
+
+
+_BATCH_FUNCTIONS = {
+    lm_lineshapes.gaussian: _gaussian,
+    lm_lineshapes.lorentzian: _lorentzian,
+    lm_lineshapes.voigt: _voigt,
+    lm_lineshapes.doniach: _doniach,
+    voigt: _voigt,
+    doniach: _doniach,
+    lm_lineshapes.linear: _linear,
+    _fermi_function: _fermi,
+    _linear_dos_fermi: _linear_dos_fermi_batch,
+}
+_COMPOSITE_OPERATORS = (operator.add, operator.sub, operator.mul)
+
+
+def _get_batch_function(model):
+    """Return the batched function for a (non-composite) model, or `None` if not supported."""
+    if isinstance(model, lm_models.ConstantModel):
+        return _constant
+    return _BATCH_FUNCTIONS.get(model.func)
+
+
+def _batch_function_args(model):
+    """Return the (root) names of the arguments of the batched function for a (non-composite) model."""
+    return list(inspect.signature(_get_batch_function(model)).parameters)[1:]
+
+
+def supports_batch_fit(model):
+    """Check whether a model can be fit with the batched Levenberg-Marquardt engine.
+
+    Supported models are Gaussian, Lorentzian, Voigt, linear and constant models, :class:`FermiFunctionModel` and
+    :class:`LinearDosFermiModel`, along with their sums, differences and products, and their
+    :class:`GaussianConvolvedFitModel` Gaussian convolutions.
+
+    Parameters
+    ----------
+    model : lmfit.Model
+        The model to check.
+
+    Returns
+    -------
+    bool
+        Whether the model is supported.
+    """
+    if isinstance(model, GaussianConvolvedFitModel):
+        return supports_batch_fit(model.left)
+    if isinstance(model, CompositeModel):
+        return (
+            model.op in _COMPOSITE_OPERATORS
+            and supports_batch_fit(model.left)
+            and supports_batch_fit(model.right)
+        )
+    return _get_batch_function(model) is not None
+
+
+def _gaussian_filter_rows(f, sigma):
+    """Gaussian filter each row of ``f`` with its own width ``sigma`` (in pixels), matching
+    :func:`scipy.ndimage.gaussian_filter1d` with the default `reflect` mode and truncation.
+    """
+    n_spectra, n_points = f.shape
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float).reshape(-1), (n_spectra,))
+    radius = np.where(sigma > TINY, (4 * sigma + 0.5).astype(int), 0)
+    max_radius = int(radius.max(initial=0))
+    if max_radius == 0:
+        return f.copy()
+
+    # Build the normalised kernels, truncated at the radius of each row
+    k = np.arange(-max_radius, max_radius + 1)
+    safe_sigma = np.where(sigma > TINY, sigma, 1)[:, None]
+    weights = np.exp(-0.5 * k**2 / safe_sigma**2)
+    weights[np.abs(k) > radius[:, None]] = 0
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    padded = np.pad(f, ((0, 0), (max_radius, max_radius)), mode="symmetric")
+    result = np.zeros_like(f)
+    for i in range(k.size):
+        result += weights[:, i, None] * padded[:, i : i + n_points]
+    return result
+
+
+def _eval_model(model, x, values):
+    """Evaluate a model and its derivatives with respect to its parameters for a batch of spectra.
+
+    Parameters
+    ----------
+    model : lmfit.Model
+        The (supported) model to evaluate.
+    x : numpy.ndarray
+        The independent variable (M,).
+    values : dict
+        The value of each parameter (by full name), as arrays of shape (N, 1).
+
+    Returns
+    -------
+    f : numpy.ndarray
+        The model (N, M).
+    derivatives : dict
+        The derivatives (N, M) of the model with respect to each (full) parameter name it depends on.
+    """
+    if isinstance(model, GaussianConvolvedFitModel):
+        f, derivatives = _eval_model(model.left, x, values)
+        pixel_size = abs(x[-1] - x[0]) / len(x)
+        sigma_conv = values["sigma_conv"].reshape(-1)
+        sigma_pxl = sigma_conv / pixel_size
+        derivatives = {
+            name: _gaussian_filter_rows(df, sigma_pxl)
+            for name, df in derivatives.items()
+        }
+        f_conv = _gaussian_filter_rows(f, sigma_pxl)
+        # Derivative with respect to the convolution width by finite difference
+        h = 1e-3 * np.abs(sigma_conv) + 1e-6 * pixel_size
+        derivatives["sigma_conv"] = (
+            _gaussian_filter_rows(f, (sigma_conv + h) / pixel_size) - f_conv
+        ) / h[:, None]
+        return f_conv, derivatives
+
+    if isinstance(model, CompositeModel):
+        f_left, d_left = _eval_model(model.left, x, values)
+        f_right, d_right = _eval_model(model.right, x, values)
+        if model.op is operator.mul:
+            d_left = {name: df * f_right for name, df in d_left.items()}
+            d_right = {name: df * f_left for name, df in d_right.items()}
+        elif model.op is operator.sub:
+            d_right = {name: -df for name, df in d_right.items()}
+        derivatives = d_left
+        for name, df in d_right.items():
+            derivatives[name] = derivatives[name] + df if name in derivatives else df
+        return model.op(f_left, f_right), derivatives
+
+    func = _get_batch_function(model)
+    args = {
+        root: values[f"{model.prefix}{root}"] for root in _batch_function_args(model)
+    }
+    f, d_args = func(x, **args)
+    return f, {f"{model.prefix}{root}": df for root, df in d_args.items()}
+
+
+def _model_param_names(model):
+    """Return the (full) names of the parameters that are arguments of the model functions."""
+    if isinstance(model, GaussianConvolvedFitModel):
+        return _model_param_names(model.left) | {"sigma_conv"}
+    if isinstance(model, CompositeModel):
+        return _model_param_names(model.left) | _model_param_names(model.right)
+    return {f"{model.prefix}{root}" for root in _batch_function_args(model)}
+
+
+class _BatchParameters:
+    """Handles the varying, fixed and constrained (expression) parameters for a batch of fits."""
+
+    def __init__(self, params, model_param_names):
+        self.names = list(params)
+        self.vary = [
+            name for name in self.names if params[name].vary and not params[name].expr
+        ]
+        self.fixed = {
+            name: params[name].value
+            for name in self.names
+            if not params[name].vary and not params[name].expr
+        }
+        self.exprs = {
+            name: params[name].expr for name in self.names if params[name].expr
+        }
+        # Constrained parameters which are arguments of the model functions
+        self.model_exprs = [name for name in self.exprs if name in model_param_names]
+        self.initial = np.array([params[name].value for name in self.vary], dtype=float)
+        self.lower = np.array([params[name].min for name in self.vary], dtype=float)
+        self.upper = np.array([params[name].max for name in self.vary], dtype=float)
+
+        # Interpreter for the constraint expressions, with the same special functions as lmfit and
+        # element-wise versions of the builtins which are commonly used in the lmfit expressions
+        self._interpreter = Interpreter()
+        self._interpreter.symtable.update(SCIPY_FUNCTIONS)
+        self._interpreter.symtable.update(
+            {
+                "max": lambda *args: np.maximum.reduce(np.broadcast_arrays(*args)),
+                "min": lambda *args: np.minimum.reduce(np.broadcast_arrays(*args)),
+                "abs": np.abs,
+            }
+        )
+
+    def evaluate(self, p, names=None):
+        """Return the value of each parameter for varying parameters ``p`` (N, P), as arrays of shape (N, 1).
+
+        Only the constrained parameters in ``names`` are evaluated (defaults to all of them).
+        """
+        values = {name: p[:, i, None] for i, name in enumerate(self.vary)}
+        values.update(
+            {
+                name: np.full((p.shape[0], 1), value, dtype=float)
+                for name, value in self.fixed.items()
+            }
+        )
+        pending = [name for name in self.exprs if names is None or name in names]
+        symtable = self._interpreter.symtable
+        # Evaluate the expressions, repeating to resolve any dependencies between them
+        for _ in range(len(self.exprs) + 1):
+            if not pending:
+                break
+            symtable.update(values)
+            still_pending = []
+            for name in pending:
+                self._interpreter.error = []
+                value = self._interpreter.eval(self.exprs[name], show_errors=False)
+                if self._interpreter.error:
+                    still_pending.append(name)
+                else:
+                    values[name] = np.broadcast_to(
+                        np.asarray(value, dtype=float), (p.shape[0], 1)
+                    )
+            pending = still_pending
+        if pending:
+            raise ValueError(
+                f"Unable to evaluate the constraint expressions for parameter(s) {pending}."
+            )
+        return values
+
+    def expr_gradients(self, p, names):
+        """Return the gradients (N, P) of the constrained parameters ``names`` with respect to the varying
+        parameters, by finite differences.
+        """
+        base = self.evaluate(p, names)
+        gradients = {name: np.zeros_like(p) for name in names}
+        for i in range(p.shape[1]):
+            h = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(p[:, i]), 1)
+            p_step = p.copy()
+            p_step[:, i] += h
+            stepped = self.evaluate(p_step, names)
+            for name in names:
+                gradients[name][:, i] = (stepped[name][:, 0] - base[name][:, 0]) / h
+        return gradients
+
+
+def _residuals_and_jacobian(model, x, y, mask, batch_params, p):
+    """Calculate the masked residuals (N, M) and the Jacobian (N, M, P) of the model for parameters ``p``."""
+    values = batch_params.evaluate(p, batch_params.model_exprs)
+    f, derivatives = _eval_model(model, x, values)
+    jacobian = np.zeros(f.shape + (p.shape[1],))
+    for i, name in enumerate(batch_params.vary):
+        if name in derivatives:
+            jacobian[..., i] = derivatives[name]
+    if batch_params.model_exprs:
+        gradients = batch_params.expr_gradients(p, batch_params.model_exprs)
+        for name in batch_params.model_exprs:
+            if name in derivatives:
+                jacobian += derivatives[name][..., None] * gradients[name][:, None, :]
+    return (y - f) * mask, jacobian * mask[..., None]
+
+
+def _solve_damped(A, g, damping, scale):
+    """Solve the damped normal equations for the parameter steps of each spectrum."""
+    A_damped = A + damping[:, None, None] * np.eye(A.shape[-1]) * scale[:, :, None]
+    try:
+        return np.linalg.solve(A_damped, g[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("npq,nq->np", np.linalg.pinv(A_damped), g)
+
+
+def _batch_fit_block(
+    model, x, y, batch_params, max_iterations, ftol=1.5e-8, xtol=1.5e-8
+):
+    """Fit a block of spectra ``y`` (N, M) using a vectorised Levenberg-Marquardt algorithm.
+
+    Returns
+    -------
+    p : numpy.ndarray
+        Best-fit values of the varying parameters (N, P).
+    covariance : numpy.ndarray
+        Covariance matrices of the varying parameters (N, P, P), scaled by the reduced chi-square.
+    chi2 : numpy.ndarray
+        Chi-square of the best fits (N,).
+    n_free : numpy.ndarray
+        Number of degrees of freedom of the fits (N,).
+    converged : numpy.ndarray
+        Whether each fit converged before reaching the maximum number of iterations (N,). Fits stopped because no
+        step improves the chi-square (e.g. as the normal equations are singular, or the model is not finite) have not
+        converged.
+    """
+    n_spectra = y.shape[0]
+    n_vary = len(batch_params.vary)
+    mask = np.isfinite(y).astype(float)
+    y = np.where(mask, y, 0)
+    n_free = mask.sum(axis=1) - n_vary
+
+    p = np.broadcast_to(batch_params.initial, (n_spectra, n_vary)).copy()
+    p = np.clip(p, batch_params.lower, batch_params.upper)
+    residuals, jacobian = _residuals_and_jacobian(model, x, y, mask, batch_params, p)
+    chi2 = np.sum(residuals**2, axis=1)
+    damping = np.full(n_spectra, 1e-3)
+    scale = np.full((n_spectra, n_vary), TINY)
+    active = n_free > 0
+    converged_fits = np.zeros(n_spectra, dtype=bool)
+
+    for _ in range(max_iterations):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        J = jacobian[idx]
+        A = np.einsum("nmp,nmq->npq", J, J)
+        # Scale the damping by the largest curvature seen so far for each parameter, as in MINPACK
+        scale[idx] = np.maximum(scale[idx], np.einsum("npp->np", A))
+        step = _solve_damped(
+            A, np.einsum("nmp,nm->np", J, residuals[idx]), damping[idx], scale[idx]
+        )
+        p_new = np.clip(p[idx] + step, batch_params.lower, batch_params.upper)
+        residuals_new, jacobian_new = _residuals_and_jacobian(
+            model, x, y[idx], mask[idx], batch_params, p_new
+        )
+        chi2_new = np.sum(residuals_new**2, axis=1)
+
+        # Accept the steps which reduce the chi-square, and update the damping
+        improved = np.isfinite(chi2_new) & (chi2_new < chi2[idx])
+        converged = improved & (
+            (chi2[idx] - chi2_new <= ftol * chi2_new)
+            | np.all(np.abs(p_new - p[idx]) <= xtol * (np.abs(p[idx]) + xtol), axis=1)
+        )
+        accepted = idx[improved]
+        p[accepted] = p_new[improved]
+        residuals[accepted] = residuals_new[improved]
+        jacobian[accepted] = jacobian_new[improved]
+        chi2[accepted] = chi2_new[improved]
+        damping[idx] = np.where(improved, damping[idx] / 10, damping[idx] * 10)
+
+        # Stop fitting converged spectra, and those where no step improves the fit (which have not converged)
+        converged_fits[idx[converged]] = True
+        active[idx[converged | (damping[idx] > 1e16)]] = False
+
+    # Covariance matrix from the Jacobian at the best fit, scaled by the reduced chi-square as in lmfit
+    valid = (n_free > 0) & np.all(np.isfinite(jacobian), axis=(1, 2))
+    covariance = np.full((n_spectra, n_vary, n_vary), np.nan)
+    if valid.any():
+        J = jacobian[valid]
+        covariance[valid] = (
+            np.linalg.pinv(np.einsum("nmp,nmq->npq", J, J))
+            * (chi2[valid] / n_free[valid])[:, None, None]
+        )
+    p[n_free <= 0] = np.nan
+    return p, covariance, chi2, n_free, converged_fits & np.isfinite(chi2)
+
+
+def batch_fit(
+    y,
+    x,
+    model,
+    params,
+    max_iterations=200,
+    keep_best_fit=False,
+    ftol=1.5e-8,
+    xtol=1.5e-8,
+):
+    """Fit a model to a stack of spectra at once using a vectorised Levenberg-Marquardt algorithm with analytic
+    Jacobians.
+
+    Parameter bounds are enforced by projecting steps onto the bounds, and constraint expressions are evaluated for
+    each spectrum. A :class:`LinearDosFermiModel` without constraint expressions is fit with the compiled Fermi-edge
+    fitter (see :func:`peaks.core.fitting.fermi_edge_fit.fermi_edge_fit`). Uncertainties are estimated from the covariance matrix, scaled by the reduced chi-square as in
+    :mod:`lmfit`.
+
+    Parameters
+    ----------
+    y : numpy.ndarray
+        The spectra to fit, with the independent variable along the last axis. Any NaN values are ignored.
+    x : numpy.ndarray
+        The independent variable.
+    model : lmfit.Model
+        The model to fit. Must be supported by the batched fitting engine (see :func:`supports_batch_fit`).
+    params : lmfit.Parameters
+        Initial parameters, used as the starting point for all spectra.
+    max_iterations : int, optional
+        The maximum number of Levenberg-Marquardt iterations. Defaults to 200.
+    keep_best_fit : bool, optional
+        Whether to also return the best-fit curves. Defaults to False.
+    ftol : float, optional
+        Relative tolerance on the chi-square for convergence. Defaults to 1.5e-8.
+    xtol : float, optional
+        Relative tolerance on the parameter values for convergence. Defaults to 1.5e-8.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with the shape of ``y`` with the last axis replaced by the best-fit values of all (P) parameters,
+        their uncertainties (zero for fixed parameters, as in :mod:`lmfit`), the chi-square, the reduced
+        chi-square, the flattened (P, P) covariance matrix (`NaN` for parameters which are not varied),
+        the best-fit curve (if ``keep_best_fit``) and the convergence status of the fit (`FIT_CONVERGED` or
+        `FIT_NOT_CONVERGED`). Parameters are in the order of ``params``.
+    """
+    if not supports_batch_fit(model):
+        raise NotImplementedError(
+            f"Batched fitting is not supported for the model {model.name}. Use the lmfit engine instead."
+        )
+    if supports_fermi_edge_fit(model, params):
+        # Use the dedicated compiled fitter for Fermi edges (e.g. gold calibrations)
+        return fermi_edge_fit(
+            y,
+            x,
+            model,
+            params,
+            max_iterations=max_iterations,
+            keep_best_fit=keep_best_fit,
+            ftol=ftol,
+            xtol=xtol,
+        )
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    stack_shape = y.shape[:-1]
+    y = y.reshape(-1, y.shape[-1])
+
+    batch_params = _BatchParameters(params, _model_param_names(model))
+    n_vary = len(batch_params.vary)
+    n_params = len(batch_params.names)
+    vary_indices = [batch_params.names.index(name) for name in batch_params.vary]
+    n_outputs = 2 * n_params + 3 + n_params**2 + (y.shape[1] if keep_best_fit else 0)
+    results = np.full((y.shape[0], n_outputs), np.nan)
+
+    # Fit the spectra in blocks to limit the memory used by the Jacobian
+    block_size = max(1, _TARGET_BLOCK_BYTES // (8 * y.shape[1] * max(n_vary, 1)))
+    for start in range(0, y.shape[0], block_size):
+        block = slice(start, start + block_size)
+        p, covariance, chi2, n_free, converged = _batch_fit_block(
+            model, x, y[block], batch_params, max_iterations, ftol, xtol
+        )
+        values = batch_params.evaluate(p)
+        stderrs = {
+            name: np.sqrt(np.einsum("npp->np", covariance))[:, i]
+            for i, name in enumerate(batch_params.vary)
+        }
+        if batch_params.exprs:
+            # Propagate the uncertainties to the constrained parameters
+            gradients = batch_params.expr_gradients(p, list(batch_params.exprs))
+            for name, gradient in gradients.items():
+                stderrs[name] = np.sqrt(
+                    np.einsum("np,npq,nq->n", gradient, covariance, gradient)
+                )
+        for i, name in enumerate(batch_params.names):
+            results[block, i] = values[name][:, 0]
+            results[block, n_params + i] = stderrs.get(name, 0.0)
+        results[block, 2 * n_params] = chi2
+        results[block, 2 * n_params + 1] = chi2 / np.where(n_free > 0, n_free, np.nan)
+        full_covariance = np.full((p.shape[0], n_params, n_params), np.nan)
+        full_covariance[:, *np.ix_(vary_indices, vary_indices)] = covariance
+        results[block, 2 * n_params + 2 : 2 * n_params + 2 + n_params**2] = (
+            full_covariance.reshape(p.shape[0], -1)
+        )
+        if keep_best_fit:
+            results[block, 2 * n_params + 2 + n_params**2 : -1] = _eval_model(
+                model, x, values
+            )[0]
+        results[block, -1] = np.where(converged, FIT_CONVERGED, FIT_NOT_CONVERGED)
+
+    return results.reshape(stack_shape + (n_outputs,))
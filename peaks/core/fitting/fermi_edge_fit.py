@@ -0,0 +1,697 @@
+"""Compiled Levenberg-Marquardt fitting of resolution-broadened Fermi edges, e.g. for gold calibration."""
+
+import numpy as np
+from numba import njit, prange
+
+from peaks.core.fitting.fit_functions import (
+    FIT_CONVERGED,
+    FIT_NOT_CONVERGED,
+    TINY,
+    kb_eV,
+)
+from peaks.core.fitting.models import LinearDosFermiModel
+
+PARALLEL_MODE = True
+
+# Order of the parameters of the LinearDosFermiModel in the compiled functions
+_FERMI_EDGE_PARAMS = (
+    "EF",
+    "T",
+    "dos_slope",
+    "dos_intercept",
+    "bg_slope",
+    "bg_intercept",
+    "sigma_conv",
+)
+_N_FERMI_EDGE_PARAMS = len(_FERMI_EDGE_PARAMS)
+_N_BASE_PARAMS = _N_FERMI_EDGE_PARAMS - 1  # Parameters of the unconvolved model
+
+
+@njit(cache=True)
+def _reflect_index(i, n):
+    """Index into an array of length ``n`` with the `reflect` boundary mode of :mod:`scipy.ndimage`."""
+    i = i % (2 * n)
+    if i >= n:
+        i = 2 * n - 1 - i
+    return i
+
+
+@njit(cache=True)
+def _gaussian_kernel(sigma_pxl):
+    """Gaussian kernel matching :func:`scipy.ndimage.gaussian_filter1d` (truncated at 4 sigma), and its derivative
+    with respect to the width ``sigma_pxl`` (in pixels).
+    """
+    radius = int(4 * sigma_pxl + 0.5)
+    k = np.arange(-radius, radius + 1).astype(np.float64)
+    weights = np.exp(-0.5 * k**2 / sigma_pxl**2)
+    weights /= weights.sum()
+    k2 = k**2 / sigma_pxl**3
+    dweights = weights * (k2 - np.sum(weights * k2))
+    return weights, dweights
+
+
+@njit(cache=True)
+def _fermi_edge_model(x, p, pixel_size, f, jac):
+    """Evaluate the Gaussian-convolved linear DOS x Fermi function model in place.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The energy values (M,).
+    p : numpy.ndarray
+        The model parameters (7,), in the order of ``_FERMI_EDGE_PARAMS``.
+    pixel_size : float
+        The energy step used to convert the convolution width to pixels, as in :class:`GaussianConvolvedFitModel`.
+    f : numpy.ndarray
+        Output array for the model (M,).
+    jac : numpy.ndarray
+        Output array for the derivatives of the model with respect to each parameter (M, 7).
+    """
+    n_points = x.size
+    EF, T, dos_slope, dos_intercept, bg_slope, bg_intercept, sigma_conv = (
+        p[0],
+        p[1],
+        p[2],
+        p[3],
+        p[4],
+        p[5],
+        p[6],
+    )
+    kT = max(T * kb_eV, TINY)
+
+    # Unconvolved model and its derivatives
+    base = np.empty(n_points)
+    dbase = np.empty((n_points, _N_BASE_PARAMS))
+    for i in range(n_points):
+        u = (EF - x[i]) / kT
+        if u >= 0:
+            F = 1 / (1 + np.exp(-u))
+        else:
+            e = np.exp(u)
+            F = e / (1 + e)
+        dF_dEF = F * (1 - F) / kT
+        dF_dT = dF_dEF * (x[i] - EF) / max(T, TINY) if T * kb_eV > TINY else 0.0
+        dos = dos_intercept - bg_intercept + (dos_slope - bg_slope) * x[i]
+        base[i] = bg_intercept + bg_slope * x[i] + dos * F
+        dbase[i, 0] = dos * dF_dEF
+        dbase[i, 1] = dos * dF_dT
+        dbase[i, 2] = x[i] * F
+        dbase[i, 3] = F
+        dbase[i, 4] = x[i] * (1 - F)
+        dbase[i, 5] = 1 - F
+
+    # Gaussian convolution of the model and its derivatives, in a single pass
+    sigma_pxl = sigma_conv / pixel_size
+    if not np.isfinite(sigma_pxl):
+        f[:] = np.nan
+        jac[:, :] = np.nan
+        return
+    if sigma_pxl <= TINY or int(4 * sigma_pxl + 0.5) == 0:
+        for i in range(n_points):
+            f[i] = base[i]
+            for q in range(_N_BASE_PARAMS):
+                jac[i, q] = dbase[i, q]
+            jac[i, _N_BASE_PARAMS] = 0.0
+        return
+
+    weights, dweights = _gaussian_kernel(sigma_pxl)
+    radius = (weights.size - 1) // 2
+    for i in range(n_points):
+        f[i] = 0.0
+        jac[i, :] = 0.0
+        for k in range(-radius, radius + 1):
+            j = _reflect_index(i + k, n_points)
+            w = weights[k + radius]
+            f[i] += w * base[j]
+            for q in range(_N_BASE_PARAMS):
+                jac[i, q] += w * dbase[j, q]
+            jac[i, _N_BASE_PARAMS] += dweights[k + radius] * base[j]
+        jac[i, _N_BASE_PARAMS] /= pixel_size
+
+
+@njit(cache=True)
+def _residuals_and_jacobian(x, y, mask, p, vary_idx, pixel_size, f, jac):
+    """Return the masked residuals (M,), the Jacobian (M, P) of the varying parameters and the chi-square."""
+    _fermi_edge_model(x, p, pixel_size, f, jac)
+    residuals = (y - f) * mask
+    jacobian = np.empty((x.size, vary_idx.size))
+    for q in range(vary_idx.size):
+        jacobian[:, q] = jac[:, vary_idx[q]] * mask
+    return residuals, jacobian, np.sum(residuals**2)
+
+
+@njit(cache=True)
+def _solve(A, b):
+    """Solve ``A x = b`` by Gaussian elimination with partial pivoting, returning `None` if ``A`` is singular."""
+    n = b.size
+    A = A.copy()
+    b = b.copy()
+    for col in range(n):
+        pivot = col + np.argmax(np.abs(A[col:, col]))
+        if not np.abs(A[pivot, col]) > 0:
+            return None
+        if pivot != col:
+            for j in range(n):
+                A[col, j], A[pivot, j] = A[pivot, j], A[col, j]
+            b[col], b[pivot] = b[pivot], b[col]
+        for row in range(col + 1, n):
+            factor = A[row, col] / A[col, col]
+            A[row, col:] -= factor * A[col, col:]
+            b[row] -= factor * b[col]
+    solution = np.empty(n)
+    for row in range(n - 1, -1, -1):
+        solution[row] = (b[row] - np.sum(A[row, row + 1 :] * solution[row + 1 :])) / A[
+            row, row
+        ]
+    return solution
+
+
+@njit(cache=True)
+def _fit_fermi_edge(x, y, p0, vary_idx, lower, upper, max_iterations, ftol, xtol):
+    """Fit a single EDC with a Levenberg-Marquardt algorithm, following the batched fitting engine.
+
+    Returns
+    -------
+    p : numpy.ndarray
+        Best-fit values of all parameters (7,).
+    covariance : numpy.ndarray
+        Covariance matrix of the varying parameters (P, P), scaled by the reduced chi-square.
+    chi2 : float
+        Chi-square of the best fit.
+    n_free : int
+        Number of degrees of freedom of the fit.
+    converged : bool
+        Whether the fit converged before reaching the maximum number of iterations. Fits stopped because no step
+        improves the chi-square (e.g. as the normal equations are singular, or the model is not finite) have not
+        converged.
+    """
+    n_points = x.size
+    n_vary = vary_idx.size
+    pixel_size = abs(x[-1] - x[0]) / n_points
+    mask = np.isfinite(y).astype(np.float64)
+    y = np.where(mask > 0, y, 0.0)
+    n_free = int(mask.sum()) - n_vary
+    f = np.empty(n_points)
+    jac = np.empty((n_points, _N_FERMI_EDGE_PARAMS))
+
+    p = p0.copy()
+    for q in range(n_vary):
+        p[vary_idx[q]] = min(max(p[vary_idx[q]], lower[q]), upper[q])
+    residuals, jacobian, chi2 = _residuals_and_jacobian(
+        x, y, mask, p, vary_idx, pixel_size, f, jac
+    )
+    covariance = np.full((n_vary, n_vary), np.nan)
+    if n_free <= 0:
+        for q in range(n_vary):
+            p[vary_idx[q]] = np.nan
+        return p, covariance, chi2, n_free, False
+
+    damping = 1e-3
+    converged = False
+    scale = np.full(n_vary, TINY)
+    for _ in range(max_iterations):
+        A = jacobian.T @ jacobian
+        g = jacobian.T @ residuals
+        # Scale the damping by the largest curvature seen so far for each parameter, as in MINPACK
+        for q in range(n_vary):
+            scale[q] = max(scale[q], A[q, q])
+            A[q, q] += damping * scale[q]
+        step = _solve(A, g)
+        if step is None:
+            damping *= 10
+            if damping > 1e16:
+                # The damped normal equations remain singular
+                break
+            continue
+
+        p_new = p.copy()
+        for q in range(n_vary):
+            p_new[vary_idx[q]] = min(max(p[vary_idx[q]] + step[q], lower[q]), upper[q])
+        residuals_new, jacobian_new, chi2_new = _residuals_and_jacobian(
+            x, y, mask, p_new, vary_idx, pixel_size, f, jac
+        )
+
+        # Accept the step if it reduces the chi-square, and update the damping
+        if np.isfinite(chi2_new) and chi2_new < chi2:
+            converged = chi2 - chi2_new <= ftol * chi2_new
+            if not converged:
+                converged = True
+                for q in range(n_vary):
+                    i = vary_idx[q]
+                    if abs(p_new[i] - p[i]) > xtol * (abs(p[i]) + xtol):
+                        converged = False
+            p = p_new
+            residuals = residuals_new
+            jacobian = jacobian_new
+            chi2 = chi2_new
+            damping /= 10
+            if converged:
+                break
+        else:
+            damping *= 10
+            if damping > 1e16:
+                # No step improves the fit
+                break
+
+    # Covariance matrix from the Jacobian at the best fit, scaled by the reduced chi-square as in lmfit
+    if np.all(np.isfinite(jacobian)):
+        covariance = np.linalg.pinv(jacobian.T @ jacobian) * (chi2 / n_free)
+    return p, covariance, chi2, n_free, converged and np.isfinite(chi2)
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _fit_fermi_edges(x, y, p0, vary_idx, lower, upper, max_iterations, ftol, xtol):
+    """Fit each EDC of ``y`` (N, M) in parallel. See :func:`_fit_fermi_edge`."""
+    n_spectra = y.shape[0]
+    n_vary = vary_idx.size
+    p = np.empty((n_spectra, _N_FERMI_EDGE_PARAMS))
+    covariance = np.empty((n_spectra, n_vary, n_vary))
+    chi2 = np.empty(n_spectra)
+    n_free = np.empty(n_spectra, dtype=np.int64)
+    converged = np.empty(n_spectra, dtype=np.bool_)
+    for n in prange(n_spectra):
+        p[n], covariance[n], chi2[n], n_free[n], converged[n] = _fit_fermi_edge(
+            x, y[n], p0, vary_idx, lower, upper, max_iterations, ftol, xtol
+        )
+    return p, covariance, chi2, n_free, converged
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _eval_fermi_edges(x, p):
+    """Evaluate the model for each set of parameters ``p`` (N, 7)."""
+    n_points = x.size
+    pixel_size = abs(x[-1] - x[0]) / n_points
+    result = np.empty((p.shape[0], n_points))
+    for n in prange(p.shape[0]):
+        jac = np.empty((n_points, _N_FERMI_EDGE_PARAMS))
+        _fermi_edge_model(x, p[n], pixel_size, result[n], jac)
+    return result
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _eval_fermi_edges_jacobian(x, p):
+    """Evaluate the model (N, M) and its derivatives (N, M, 7) for each set of parameters ``p`` (N, 7)."""
+    n_points = x.size
+    pixel_size = abs(x[-1] - x[0]) / n_points
+    result = np.empty((p.shape[0], n_points))
+    jac = np.empty((p.shape[0], n_points, _N_FERMI_EDGE_PARAMS))
+    for n in prange(p.shape[0]):
+        _fermi_edge_model(x, p[n], pixel_size, result[n], jac[n])
+    return result, jac
+
+
+def supports_fermi_edge_fit(model, params):
+    """Check whether a model and its parameters can be fit with the compiled Fermi-edge fitter.
+
+    This is the case for a :class:`LinearDosFermiModel` whose parameters have no constraint expressions.
+
+    Parameters
+    ----------
+    model : lmfit.Model
+        The model to check.
+    params : lmfit.Parameters
+        The parameters of the model.
+
+    Returns
+    -------
+    bool
+        Whether the model is supported.
+    """
+    if not isinstance(model, LinearDosFermiModel):
+        return False
+    return set(params) == set(_fermi_edge_param_names(model)) and not any(
+        param.expr for param in params.values()
+    )
+
+
+def _fermi_edge_param_names(model):
+    """Return the full names of the parameters of a :class:`LinearDosFermiModel`, in the compiled order."""
+    return [
+        name if name == "sigma_conv" else f"{model.base_model_prefix}{name}"
+        for name in _FERMI_EDGE_PARAMS
+    ]
+
+
+def fermi_edge_fit(
+    y,
+    x,
+    model,
+    params,
+    max_iterations=200,
+    keep_best_fit=False,
+    ftol=1.5e-8,
+    xtol=1.5e-8,
+):
+    """Fit a :class:`LinearDosFermiModel` to a stack of EDCs with a compiled Levenberg-Marquardt algorithm.
+
+    The resolution-broadened model and its analytic derivatives (including with respect to the convolution width)
+    are evaluated together in a single compiled pass, and the EDCs are fit in parallel. Parameter bounds are enforced
+    by projecting steps onto the bounds, and uncertainties are estimated from the covariance matrix, scaled by the
+    reduced chi-square as in :mod:`lmfit`.
+
+    Parameters
+    ----------
+    y : numpy.ndarray
+        The EDCs to fit, with energy along the last axis. Any NaN values are ignored.
+    x : numpy.ndarray
+        The energy values.
+    model : LinearDosFermiModel
+        The model to fit (see :func:`supports_fermi_edge_fit`).
+    params : lmfit.Parameters
+        Initial parameters, used as the starting point for all EDCs.
+    max_iterations : int, optional
+        The maximum number of Levenberg-Marquardt iterations. Defaults to 200.
+    keep_best_fit : bool, optional
+        Whether to also return the best-fit curves. Defaults to False.
+    ftol : float, optional
+        Relative tolerance on the chi-square for convergence. Defaults to 1.5e-8.
+    xtol : float, optional
+        Relative tolerance on the parameter values for convergence. Defaults to 1.5e-8.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with the shape of ``y`` with the last axis replaced by the fit results, in the same layout as
+        :func:`peaks.core.fitting.batch_fit.batch_fit`.
+    """
+    if not supports_fermi_edge_fit(model, params):
+        raise NotImplementedError(
+            "The compiled Fermi-edge fitter only supports a LinearDosFermiModel without constraint expressions."
+        )
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    stack_shape = y.shape[:-1]
+    y = np.ascontiguousarray(y.reshape(-1, y.shape[-1]))
+
+    names = list(params)
+    model_names = _fermi_edge_param_names(model)
+    p0 = np.array([params[name].value for name in model_names], dtype=float)
+    vary_idx = np.array(
+        [i for i, name in enumerate(model_names) if params[name].vary], dtype=np.int64
+    )
+    lower = np.array([params[model_names[i]].min for i in vary_idx], dtype=float)
+    upper = np.array([params[model_names[i]].max for i in vary_idx], dtype=float)
+
+    p, covariance, chi2, n_free, converged = _fit_fermi_edges(
+        x, y, p0, vary_idx, lower, upper, max_iterations, ftol, xtol
+    )
+
+    # Pack the results in the order of the parameters
+    n_params = len(names)
+    order = [model_names.index(name) for name in names]
+    vary_indices = [names.index(model_names[i]) for i in vary_idx]
+    n_outputs = 2 * n_params + 3 + n_params**2 + (y.shape[1] if keep_best_fit else 0)
+    results = np.full((y.shape[0], n_outputs), np.nan)
+    results[:, :n_params] = p[:, order]
+    stderrs = np.zeros((y.shape[0], n_params))
+    stderrs[:, vary_indices] = np.sqrt(np.einsum("npp->np", covariance))
+    results[:, n_params : 2 * n_params] = stderrs
+    results[:, 2 * n_params] = chi2
+    results[:, 2 * n_params + 1] = chi2 / np.where(n_free > 0, n_free, np.nan)
+    full_covariance = np.full((y.shape[0], n_params, n_params), np.nan)
+    full_covariance[:, *np.ix_(vary_indices, vary_indices)] = covariance
+    results[:, 2 * n_params + 2 : 2 * n_params + 2 + n_params**2] = (
+        full_covariance.reshape(y.shape[0], -1)
+    )
+    if keep_best_fit:
+        results[:, 2 * n_params + 2 + n_params**2 : -1] = _eval_fermi_edges(x, p)
+    results[:, -1] = np.where(converged, FIT_CONVERGED, FIT_NOT_CONVERGED)
+
+    return results.reshape(stack_shape + (n_outputs,))
+
+
+# Indices of the shared and per-EDC parameters in the compiled order, for the global fit
+_SHARED_PARAMS = [1, 6]  # T, sigma_conv
+_LOCAL_PARAMS = [2, 3, 4, 5]  # dos_slope, dos_intercept, bg_slope, bg_intercept
+
+
+class _GlobalFermiEdgeProblem:
+    """Global fit of a stack of EDCs, with a polynomial Fermi level, shared temperature and resolution, and a
+    linear DOS and background for each EDC.
+
+    The global parameters are the polynomial coefficients (in the scaled co-ordinate ``t``) followed by the shared
+    parameters. Only the varying global and per-EDC parameters are included in the Jacobians.
+    """
+
+    def __init__(self, x, y, t, order, p0, vary, lower, upper):
+        self.x = x
+        self.mask = np.isfinite(y).astype(float)
+        self.y = np.where(self.mask > 0, y, 0)
+        self.t_powers = t[:, None] ** np.arange(order + 1)
+        self.n_coeffs = order + 1
+        self.p0 = p0
+        self.vary_global = np.concatenate(
+            [np.ones(self.n_coeffs, dtype=bool), vary[_SHARED_PARAMS]]
+        )
+        self.vary_local = vary[_LOCAL_PARAMS]
+        self.lower_global = np.concatenate(
+            [np.full(self.n_coeffs, -np.inf), lower[_SHARED_PARAMS]]
+        )[self.vary_global]
+        self.upper_global = np.concatenate(
+            [np.full(self.n_coeffs, np.inf), upper[_SHARED_PARAMS]]
+        )[self.vary_global]
+        self.lower_local = lower[_LOCAL_PARAMS][self.vary_local]
+        self.upper_local = upper[_LOCAL_PARAMS][self.vary_local]
+
+    def initial(self):
+        """Return the initial varying global (G,) and per-EDC (N, L) parameters."""
+        coeffs = np.zeros(self.n_coeffs)
+        coeffs[0] = self.p0[0]
+        g = np.concatenate([coeffs, self.p0[_SHARED_PARAMS]])[self.vary_global]
+        local = np.broadcast_to(
+            self.p0[_LOCAL_PARAMS][self.vary_local],
+            (self.y.shape[0], self.vary_local.sum()),
+        ).copy()
+        return self.clip(g, local)
+
+    def clip(self, g, local):
+        """Project the parameters onto their bounds."""
+        return (
+            np.clip(g, self.lower_global, self.upper_global),
+            np.clip(local, self.lower_local, self.upper_local),
+        )
+
+    def coefficients_and_params(self, g, local):
+        """Return the polynomial coefficients (K,) and the model parameters of each EDC (N, 7)."""
+        global_values = np.concatenate(
+            [np.zeros(self.n_coeffs), self.p0[_SHARED_PARAMS]]
+        )
+        global_values[self.vary_global] = g
+        local_values = np.broadcast_to(
+            self.p0[_LOCAL_PARAMS], (self.y.shape[0], len(_LOCAL_PARAMS))
+        ).copy()
+        local_values[:, self.vary_local] = local
+        p = np.empty((self.y.shape[0], _N_FERMI_EDGE_PARAMS))
+        p[:, 0] = self.t_powers @ global_values[: self.n_coeffs]
+        p[:, _SHARED_PARAMS] = global_values[self.n_coeffs :]
+        p[:, _LOCAL_PARAMS] = local_values
+        return global_values[: self.n_coeffs], p
+
+    def residuals_and_jacobian(self, g, local):
+        """Return the masked residuals (N, M), and the Jacobians of the global (N, M, G) and per-EDC (N, M, L)
+        parameters.
+        """
+        _, p = self.coefficients_and_params(g, local)
+        f, jac = _eval_fermi_edges_jacobian(self.x, p)
+        jac_global = np.concatenate(
+            [jac[..., :1] * self.t_powers[:, None, :], jac[..., _SHARED_PARAMS]], axis=-1
+        )[..., self.vary_global]
+        jac_local = jac[..., _LOCAL_PARAMS][..., self.vary_local]
+        mask = self.mask[..., None]
+        return (self.y - f) * self.mask, jac_global * mask, jac_local * mask
+
+
+def _normal_equations(jac_global, jac_local, residuals):
+    """Return the blocks of the normal equations of the global fit."""
+    A_gg = np.einsum("nmp,nmq->pq", jac_global, jac_global)
+    A_gl = np.einsum("nmp,nmq->npq", jac_global, jac_local)
+    A_ll = np.einsum("nmp,nmq->npq", jac_local, jac_local)
+    b_g = np.einsum("nmp,nm->p", jac_global, residuals)
+    b_l = np.einsum("nmp,nm->np", jac_local, residuals)
+    return A_gg, A_gl, A_ll, b_g, b_l
+
+
+def _solve_block_arrow(A_gg, A_gl, A_ll, b_g, b_l):
+    """Solve the (block-arrow) normal equations of the global fit, eliminating the per-EDC parameters with the
+    Schur complement so that the cost scales linearly with the number of EDCs.
+    """
+    A_ll_inv = np.linalg.pinv(A_ll)
+    A_gl_A_ll_inv = np.einsum("npq,nqr->npr", A_gl, A_ll_inv)
+    schur = A_gg - np.einsum("npq,nrq->pr", A_gl_A_ll_inv, A_gl)
+    rhs = b_g - np.einsum("npq,nq->p", A_gl_A_ll_inv, b_l)
+    step_g = np.linalg.lstsq(schur, rhs, rcond=None)[0]
+    step_l = np.einsum(
+        "npq,nq->np", A_ll_inv, b_l - np.einsum("npq,p->nq", A_gl, step_g)
+    )
+    return step_g, step_l
+
+
+def global_fermi_edge_fit(
+    y,
+    x,
+    theta,
+    model,
+    params,
+    order=4,
+    initial_coefficients=None,
+    max_iterations=200,
+    ftol=1.5e-8,
+    xtol=1.5e-8,
+):
+    """Global fit of a :class:`LinearDosFermiModel` to a 2D gold image.
+
+    The Fermi level is a polynomial in ``theta``, the temperature and resolution are shared between all EDCs, and
+    only the linear DOS and background terms vary for each EDC. The fit uses a Levenberg-Marquardt algorithm in which
+    the block structure of the Jacobian is exploited (eliminating the per-EDC parameters with the Schur complement),
+    so that the cost scales linearly with the number of EDCs. Uncertainties are estimated from the covariance matrix,
+    scaled by the reduced chi-square as in :mod:`lmfit`.
+
+    Parameters
+    ----------
+    y : numpy.ndarray
+        The EDCs to fit (N, M). Any NaN values are ignored.
+    x : numpy.ndarray
+        The energy values (M,).
+    theta : numpy.ndarray
+        The co-ordinate of each EDC (N,), in which the Fermi level is a polynomial.
+    model : LinearDosFermiModel
+        The model to fit (see :func:`supports_fermi_edge_fit`).
+    params : lmfit.Parameters
+        Initial parameters, used as the starting point for all EDCs. The Fermi level is used for the constant term of
+        the polynomial, and the bounds on the Fermi level are ignored.
+    order : int, optional
+        The order of the polynomial Fermi level. Defaults to 4.
+    initial_coefficients : numpy.ndarray, optional
+        Initial polynomial coefficients of the Fermi level in ``theta`` (K,), e.g. from a fit to estimates of the
+        Fermi level of each EDC. Defaults to None, where the Fermi level of ``params`` is used for the constant term.
+    max_iterations : int, optional
+        The maximum number of Levenberg-Marquardt iterations. Defaults to 200.
+    ftol : float, optional
+        Relative tolerance on the chi-square for convergence. Defaults to 1.5e-8.
+    xtol : float, optional
+        Relative tolerance on the parameter values for convergence. Defaults to 1.5e-8.
+
+    Returns
+    -------
+    dict
+        The results of the fit, with keys:
+        - 'coefficients', 'coefficients_stderr': the polynomial coefficients of the Fermi level in ``theta`` (K,)
+        and their uncertainties.
+        - 'params', 'params_stderr': the best-fit values of the parameters of the model for each EDC (N, 7), in the
+        order of the parameters of the model, and their uncertainties.
+        - 'chisqr', 'redchi': the chi-square and reduced chi-square of the global fit.
+        - 'param_names': the names of the parameters of the model.
+    """
+    if not supports_fermi_edge_fit(model, params):
+        raise NotImplementedError(
+            "The global Fermi-edge fit only supports a LinearDosFermiModel without constraint expressions."
+        )
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+
+    # Fit the polynomial in a scaled co-ordinate for numerical stability
+    theta_scale = np.max(np.abs(theta))
+    theta_scale = theta_scale if theta_scale > 0 else 1.0
+
+    model_names = _fermi_edge_param_names(model)
+    p0 = np.array([params[name].value for name in model_names], dtype=float)
+    vary = np.array([params[name].vary for name in model_names])
+    lower = np.array([params[name].min for name in model_names], dtype=float)
+    upper = np.array([params[name].max for name in model_names], dtype=float)
+    problem = _GlobalFermiEdgeProblem(
+        x, y, theta / theta_scale, order, p0, vary, lower, upper
+    )
+    powers = theta_scale ** np.arange(order + 1)
+
+    g, local = problem.initial()
+    if initial_coefficients is not None:
+        g[: order + 1] = np.asarray(initial_coefficients, dtype=float) * powers
+    residuals, jac_global, jac_local = problem.residuals_and_jacobian(g, local)
+    chi2 = np.sum(residuals**2)
+    damping = 1e-3
+    scale_g = np.full(g.size, TINY)
+    scale_l = np.full(local.shape, TINY)
+    for _ in range(max_iterations):
+        A_gg, A_gl, A_ll, b_g, b_l = _normal_equations(jac_global, jac_local, residuals)
+        # Scale the damping by the largest curvature seen so far for each parameter, as in MINPACK
+        scale_g = np.maximum(scale_g, np.diag(A_gg))
+        scale_l = np.maximum(scale_l, np.einsum("npp->np", A_ll))
+        step_g, step_l = _solve_block_arrow(
+            A_gg + damping * np.diag(scale_g),
+            A_gl,
+            A_ll + damping * np.einsum("np,pq->npq", scale_l, np.eye(local.shape[1])),
+            b_g,
+            b_l,
+        )
+        g_new, local_new = problem.clip(g + step_g, local + step_l)
+        residuals_new, jac_global_new, jac_local_new = problem.residuals_and_jacobian(
+            g_new, local_new
+        )
+        chi2_new = np.sum(residuals_new**2)
+
+        # Accept the step if it reduces the chi-square, and update the damping
+        if np.isfinite(chi2_new) and chi2_new < chi2:
+            converged = chi2 - chi2_new <= ftol * chi2_new or (
+                np.all(np.abs(g_new - g) <= xtol * (np.abs(g) + xtol))
+                and np.all(np.abs(local_new - local) <= xtol * (np.abs(local) + xtol))
+            )
+            g, local = g_new, local_new
+            residuals, jac_global, jac_local = (
+                residuals_new,
+                jac_global_new,
+                jac_local_new,
+            )
+            chi2 = chi2_new
+            damping /= 10
+            if converged:
+                break
+        else:
+            damping *= 10
+            if damping > 1e16:
+                # No step improves the fit
+                break
+
+    # Covariance matrix from the Jacobian at the best fit, scaled by the reduced chi-square as in lmfit. The global
+    # block is the inverse of the Schur complement, and only the diagonal of the per-EDC blocks is required.
+    n_free = int(problem.mask.sum()) - g.size - local.size
+    redchi = chi2 / n_free if n_free > 0 else np.nan
+    A_gg, A_gl, A_ll, _, _ = _normal_equations(jac_global, jac_local, residuals)
+    A_ll_inv = np.linalg.pinv(A_ll)
+    A_gl_A_ll_inv = np.einsum("npq,nqr->npr", A_gl, A_ll_inv)
+    cov_g = np.linalg.pinv(A_gg - np.einsum("npq,nrq->pr", A_gl_A_ll_inv, A_gl))
+    var_l = np.einsum("npp->np", A_ll_inv) + np.einsum(
+        "npq,pr,nrq->nq", A_gl_A_ll_inv, cov_g, A_gl_A_ll_inv
+    )
+    cov_g *= redchi
+    var_l *= redchi
+
+    # Parameters and uncertainties of each EDC
+    coeffs, p = problem.coefficients_and_params(g, local)
+    stderr_global = np.zeros(problem.vary_global.size)
+    stderr_global[problem.vary_global] = np.sqrt(np.diag(cov_g))
+    stderr_local = np.zeros((y.shape[0], len(_LOCAL_PARAMS)))
+    stderr_local[:, problem.vary_local] = np.sqrt(var_l)
+    n_coeffs = problem.n_coeffs
+    cov_coeffs = np.zeros((n_coeffs, n_coeffs))
+    vary_coeffs = np.flatnonzero(problem.vary_global[:n_coeffs])
+    cov_coeffs[np.ix_(vary_coeffs, vary_coeffs)] = cov_g[
+        np.ix_(vary_coeffs, vary_coeffs)
+    ]
+    p_stderr = np.empty_like(p)
+    p_stderr[:, 0] = np.sqrt(
+        np.einsum("nk,kl,nl->n", problem.t_powers, cov_coeffs, problem.t_powers)
+    )
+    p_stderr[:, _SHARED_PARAMS] = stderr_global[n_coeffs:]
+    p_stderr[:, _LOCAL_PARAMS] = stderr_local
+
+    # Convert the polynomial coefficients back to the original co-ordinate
+    return {
+        "coefficients": coeffs / powers,
+        "coefficients_stderr": stderr_global[:n_coeffs] / powers,
+        "params": p,
+        "params_stderr": p_stderr,
+        "chisqr": chi2,
+        "redchi": redchi,
+        "param_names": model_names,
+    }
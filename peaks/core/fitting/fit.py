@@ -1,15 +1,38 @@
+import base64
+import functools
+import io
+import pickle
+import types
+from concurrent.futures import ProcessPoolExecutor
+
 import dask as da
 import dill
 import matplotlib.pyplot as plt
 import numpy as np
 import xarray as xr
+from numba import njit, prange
 from scipy.ndimage import gaussian_filter1d
-from scipy.signal import find_peaks
 from tqdm.auto import tqdm
 
+from peaks.core.fitting.batch_fit import batch_fit, supports_batch_fit
+from peaks.core.fitting.fermi_edge_fit import global_fermi_edge_fit
+from peaks.core.fitting.fit_functions import (
+    FIT_CONVERGED,
+    FIT_NOT_CONVERGED,
+    FIT_SKIPPED,
+)
 from peaks.core.fitting.models import LinearDosFermiModel
 from peaks.core.utils.misc import analysis_warning
 
+# Number of spectra to keep the full lmfit.ModelResult for with `keep_model="sample"`
+_N_SAMPLED_MODELS = 25
+
+# Attributes of the `fit_status` variable of the fit results
+_FIT_STATUS_ATTRS = {
+    "flag_values": [FIT_CONVERGED, FIT_NOT_CONVERGED, FIT_SKIPPED],
+    "flag_meanings": "converged not_converged skipped",
+}
+
 
 def fit(
     data_array,
@@ -18,6 +41,16 @@ def fit(
     independent_var=None,
     sequential=True,
     reverse_sequential_fit_order=False,
+    engine="lmfit",
+    n_workers=1,
+    scheduler=None,
+    keep_model=None,
+    keep_best_fit=False,
+    mask=None,
+    min_counts=None,
+    min_snr=None,
+    max_nfev=None,
+    tolerance=None,
 ):
     """
     Fit an :class:`lmfit.Model` to an :class:`xarray.DataArray`, specifying the co-ordinate correspinding to
@@ -44,27 +77,94 @@ def fit(
         If False, fit the model to the entire data array at once.
     reverse_sequential_fit_order: bool
         Use to reverse the order of a sequential fit along the non-independent dimension. Defaults to False.
+    engine: str, optional
+        The fitting engine to use. Options are:
+        - 'lmfit' (default): fit each spectrum in turn with :meth:`lmfit.Model.fit`, returning the full
+        :class:`lmfit.ModelResult` for each fit.
+        - 'batch': fit all spectra at once with a vectorised Levenberg-Marquardt algorithm using analytic
+        Jacobians (see :func:`peaks.core.fitting.batch_fit.batch_fit`). Much faster for large stacks of spectra
+        (e.g. MDC stacks or spatial maps), but only supports the built-in Gaussian, Lorentzian, Voigt, Doniach,
+        linear, constant, Fermi function and :class:`LinearDosFermiModel` models (including the compiled
+        :class:`FastVoigtModel` and :class:`FastDoniachModel`), their combinations and their
+        :class:`GaussianConvolvedFitModel` convolutions. All spectra are fit from the same initial parameters
+        (`sequential` is ignored), and no :class:`lmfit.ModelResult` objects are generated
+        (see `keep_model`).
+    n_workers: int, optional
+        Number of worker processes to use. Defaults to 1 (fit in the current process). If greater than 1:
+        - for a sequential fit, the non-independent dimension is split into `n_workers` chunks which are fit
+        sequentially in parallel. Each chunk is seeded from a coarse sequential pre-fit of a subset of slices
+        spanning the whole dimension, and the results are stitched back together in order.
+        - for a non-sequential fit with the 'lmfit' engine, chunks of spectra are fit in parallel with the
+        `scheduler` (default 'processes').
+    scheduler: str, optional
+        Scheduler for a non-sequential fit with the 'lmfit' engine. As :mod:`lmfit` holds the GIL while fitting,
+        the default threaded :mod:`dask` scheduler gives little speed-up. Options are:
+        - None (default): fit in the current process, or with the default :mod:`dask` scheduler for lazy data
+        (or 'processes' if `n_workers` > 1).
+        - 'processes': fit chunks of spectra in a local pool of `n_workers` processes, reporting progress with the
+        `peaks` :class:`DaskTQDMProgressBar`.
+        - 'distributed': fit chunks of spectra on a local :mod:`dask.distributed` cluster of `n_workers`
+        single-threaded worker processes (requires :mod:`distributed`).
+        In both cases, the model and initial parameters are sent to each worker once, rather than with every chunk.
+    keep_model: str, optional
+        Which :class:`lmfit.ModelResult` objects to keep in the `fit_model` variable of the results. Options are:
+        - 'all': keep the result of every fit (default for the 'lmfit' engine).
+        - 'sample': keep the results for a sample of (up to 25) fits spread evenly through the data, with `None`
+        for the others.
+        - 'none': do not keep any (default, and only option, for the 'batch' engine). The results then only
+        contain numeric arrays, and so can be saved as Zarr with :func:`save_fit`.
+        For 'sample' and 'none', the model is stored in the results metadata, so that the fits can be re-evaluated
+        from the best-fit parameters (see :func:`evaluate_fit` and :func:`peaks.core.display.plotting.plot_fit`).
+    keep_best_fit: bool, optional
+        Whether to store the best-fit curves (as the `best_fit` variable). Defaults to False.
+    mask: xarray.DataArray, optional
+        Boolean mask over (some of) the non-independent dimensions, selecting the spectra to fit. Defaults to None
+        (fit all spectra).
+    min_counts: float, optional
+        Skip spectra whose total counts (summed over the independent variable, as for
+        :func:`~peaks.core.process.data_select.tot`) are below this value, e.g. pixels of a spatial map outside of the
+        sample. Defaults to None.
+    min_snr: float, optional
+        Skip spectra whose signal-to-noise ratio is below this value. The signal is taken as the range of the
+        spectrum, and the noise is estimated from the median absolute difference between neighbouring points.
+        Defaults to None.
+    max_nfev: int, optional
+        Maximum number of function evaluations for each spectrum (the maximum number of iterations for the 'batch'
+        engine). Defaults to None (the :mod:`lmfit` default, or 200 iterations for the 'batch' engine).
+    tolerance: float, optional
+        Relative tolerance on the chi-square and parameter values for the convergence of each fit (`ftol` and
+        `xtol` of the least-squares minimiser). Defaults to None (1.5e-8).
 
     Returns
     -------
     xarray.DataSet
-        A DataSet containing the best-fit parameters, their uncertainties, and the :class:`lmfit.ModelResult` object.
-    """
+        A DataSet containing the best-fit parameters and their uncertainties, the chi-square (`chisqr`), reduced
+        chi-square (`redchi`) and covariance matrix (`covariance`) of each fit, the best-fit curves (`best_fit`) if
+        requested, the convergence status of each fit (`fit_status`: 0 if converged, 1 if not converged, e.g.
+        when the maximum number of evaluations is reached or no step improves the fit, and 2 if skipped by `mask`, `min_counts` or
+        `min_snr`), and the :class:`lmfit.ModelResult` objects (`fit_model`) unless `keep_model='none'`. Skipped
+        spectra have `NaN` parameters.
 
-    def fit_func(y, x, model, initial_params):
-        result = model.fit(y, params=initial_params, x=x)
-        best_values = np.array([result.params[param].value for param in result.params])
-        uncertainties = np.array(
-            [
-                (
-                    result.params[param].stderr
-                    if result.params[param].stderr is not None
-                    else np.nan
-                )
-                for param in result.params
-            ]
+    Examples
+    --------
+    Example usage is as follows::
+
+        import peaks as pks
+        from peaks.core.fitting.models import GaussianModel
+
+        # Load a spatial map
+        SM = pks.load("SM.ibw")
+
+        # Fit a peak to each EDC, skipping pixels off the sample and capping the cost of each fit
+        model = GaussianModel()
+        params = model.make_params(center=-0.5, sigma=0.1, amplitude=100)
+        fit_results = SM.fit(
+            model, params, independent_var="eV", engine="batch", min_counts=1e4, max_nfev=50
         )
-        return np.concatenate([best_values, uncertainties, [result]])
+
+        # Count the converged, not converged and skipped fits
+        fit_results["fit_status"].to_series().value_counts()
+    """
 
     # Dequantify the data array
     data_array = data_array.pint.dequantify()
@@ -85,15 +185,105 @@ def fit(
         else:
             independent_var = data_array.dims[0]
 
-    if data_array.ndim > 2 and sequential:
+    if engine not in ("lmfit", "batch"):
+        raise ValueError(
+            f"Unknown fitting engine {engine}. Expected 'lmfit' or 'batch'."
+        )
+    if scheduler not in (None, "processes", "distributed"):
+        raise ValueError(
+            f"Unknown scheduler {scheduler}. Expected None, 'processes' or 'distributed'."
+        )
+    if scheduler is None and n_workers > 1:
+        scheduler = "processes"
+    if keep_model is None:
+        keep_model = "all" if engine == "lmfit" else "none"
+    if keep_model not in ("all", "sample", "none"):
+        raise ValueError(
+            f"Unknown option keep_model={keep_model}. Expected 'all', 'sample' or 'none'."
+        )
+    if engine == "batch" and keep_model != "none":
+        raise ValueError(
+            "The batch fitting engine does not generate lmfit.ModelResult objects. Use `keep_model='none'`."
+        )
+
+    if data_array.ndim > 2 and sequential and engine == "lmfit":
         sequential = False
         analysis_warning(
             "Sequential fitting only supported for 2D data. Defaulting to non-sequential.",
             title="Analysis info",
             warn_type="info",
         )
+    if engine == "batch" and not supports_batch_fit(model):
+        raise NotImplementedError(
+            f"The batch fitting engine does not support the model {model.name}. Use `engine='lmfit'` instead."
+        )
+
+    # Pre-screen the spectra, only fitting those which pass
+    fit_mask = _screen_spectra(data_array, independent_var, mask, min_counts, min_snr)
+    if fit_mask is not None and not fit_mask.values.all():
+        return _fit_screened(
+            data_array,
+            fit_mask,
+            model=model,
+            params=params,
+            independent_var=independent_var,
+            sequential=sequential,
+            reverse_sequential_fit_order=reverse_sequential_fit_order,
+            engine=engine,
+            n_workers=n_workers,
+            scheduler=scheduler,
+            keep_model=keep_model,
+            keep_best_fit=keep_best_fit,
+            max_nfev=max_nfev,
+            tolerance=tolerance,
+        )
+
+    # Limits on the cost of each fit
+    fit_kws = {}
+    batch_kws = {}
+    if max_nfev is not None:
+        fit_kws["max_nfev"] = max_nfev
+        batch_kws["max_iterations"] = max_nfev
+    if tolerance is not None:
+        fit_kws["fit_kws"] = {"ftol": tolerance, "xtol": tolerance}
+        batch_kws.update(ftol=tolerance, xtol=tolerance)
+
+    param_names = list(params.keys())
+    n_outputs = (
+        2 * len(param_names)
+        + 3
+        + len(param_names) ** 2
+        + (data_array.sizes[independent_var] if keep_best_fit else 0)
+    )
+    store_model = keep_model != "none"
+    if store_model:
+        n_outputs += 1
+    keep_mask = _keep_model_mask(data_array, independent_var, keep_model)
+
+    if engine == "batch":
+        # Fit all spectra at once with the vectorised fitting engine
+        results = xr.apply_ufunc(
+            batch_fit,
+            data_array,
+            data_array.coords[independent_var],
+            kwargs={
+                "model": model,
+                "params": params,
+                "keep_best_fit": keep_best_fit,
+                **batch_kws,
+            },
+            input_core_dims=[[independent_var], [independent_var]],
+            output_core_dims=[["fit_params"]],
+            dask="parallelized",
+            output_dtypes=[np.float64],
+            dask_gufunc_kwargs={
+                "output_sizes": {"fit_params": n_outputs},
+                "allow_rechunk": True,
+            },
+            keep_attrs=False,
+        )
     # Sequential fitting, updating params each iteration
-    if sequential and len(data_array.dims) == 2:
+    elif sequential and len(data_array.dims) == 2:
         if isinstance(data_array.data, da.array.core.Array):
             raise ValueError(
                 "Dask arrays are not supported for sequential fitting. Either set `sequential=False` or load your "
@@ -101,77 +291,599 @@ def fit(
             )
 
         non_indep_dim = list(set(data_array.dims) - set([independent_var]))[0]
-        non_indep_dim_len = data_array.sizes[non_indep_dim]
 
         if reverse_sequential_fit_order:
             # Reverse the order of the non-independent dimension
             data_array = data_array.isel({non_indep_dim: slice(None, None, -1)})
+            keep_mask = keep_mask.isel({non_indep_dim: slice(None, None, -1)})
 
-        fit_results = []
-        # Iterate through all slices along the non-independent dimension
-        for i in tqdm(range(non_indep_dim_len), desc="Fitting"):
-            data_array_slice = data_array.isel({non_indep_dim: i})
-            results_subset = xr.apply_ufunc(
-                fit_func,
-                data_array_slice,
-                data_array.coords[independent_var],
-                kwargs={"model": model, "initial_params": params},
-                input_core_dims=[[independent_var], [independent_var]],
-                output_core_dims=[["fit_params"]],
-                vectorize=True,
-                output_dtypes=[object],
-                keep_attrs=False,
-            )
-            fit_results.append(results_subset)
-
-            # Update the initial parameters for the next iteration
-            params = results_subset.isel(fit_params=-1).item().params
-        # Concatenate the results along the non-independent dimension into a single DataArray
-        results = xr.concat(fit_results, dim=non_indep_dim)
+        results = _sequential_fit(
+            data_array,
+            keep_mask,
+            model,
+            params,
+            independent_var,
+            non_indep_dim,
+            n_workers,
+            store_model=store_model,
+            keep_best_fit=keep_best_fit,
+            fit_kws=fit_kws,
+        )
+    elif scheduler is not None:
+        # Fit chunks of spectra in worker processes
+        results = _fit_in_workers(
+            data_array,
+            keep_mask,
+            model,
+            params,
+            independent_var,
+            scheduler,
+            n_workers,
+            n_outputs,
+            store_model=store_model,
+            keep_best_fit=keep_best_fit,
+            fit_kws=fit_kws,
+        )
     else:
         # Apply the fitting function across all dimensions except the independent variable
         results = xr.apply_ufunc(
-            fit_func,
+            _fit_func,
             data_array,
             data_array.coords[independent_var],
-            kwargs={"model": model, "initial_params": params},
-            input_core_dims=[[independent_var], [independent_var]],
+            keep_mask,
+            kwargs={
+                "model": model,
+                "initial_params": params,
+                "store_model": store_model,
+                "keep_best_fit": keep_best_fit,
+                "fit_kws": fit_kws,
+            },
+            input_core_dims=[[independent_var], [independent_var], []],
             output_core_dims=[["fit_params"]],
             vectorize=True,
             dask="parallelized",
-            output_dtypes=[object],
+            output_dtypes=[object if store_model else np.float64],
             dask_gufunc_kwargs={
-                "output_sizes": {"fit_params": len(params) * 2 + 1},
+                "output_sizes": {"fit_params": n_outputs},
                 "allow_rechunk": True,
             },
             keep_attrs=False,
         )
 
-    # Create parameter names, adding "_stderr" for uncertainties, and "model_result" for the serialized data
-    param_names = list(params.keys())
-    all_param_names = (
-        param_names + [f"{name}_stderr" for name in param_names] + ["fit_model"]
+    return _parse_fit_results(
+        results,
+        param_names,
+        data_array.coords[independent_var],
+        model,
+        keep_model,
+        keep_best_fit,
     )
 
-    # Add the parameter names to the dataarray
-    results = results.assign_coords({"fit_params": ("fit_params", all_param_names)})
 
-    # Parse these as a dataset
+# Model and initial parameters for fitting in worker processes, set once per worker by _init_fit_worker
+_WORKER_FIT_STATE = {}
+
+
+def _init_fit_worker(payload):
+    """Store the model and initial parameters for fitting in a worker process.
+
+    Parameters
+    ----------
+    payload : bytes
+        Serialised tuple of the model, initial parameters and keyword arguments for :meth:`lmfit.Model.fit` (see
+        :func:`_dumps_fit_objects`).
+    """
+    (
+        _WORKER_FIT_STATE["model"],
+        _WORKER_FIT_STATE["params"],
+        _WORKER_FIT_STATE["fit_kws"],
+    ) = pickle.loads(payload)
+
+
+def _fit_block(y, x, keep, store_model, keep_best_fit):
+    """Fit a block of spectra ``y`` (..., M) in a worker process, using the model and initial parameters set by
+    :func:`_init_fit_worker`, returning the packed results (..., n_outputs) (see :func:`_pack_fit_result`)."""
+    model = _WORKER_FIT_STATE["model"]
+    params = _WORKER_FIT_STATE["params"]
+    fit_kws = _WORKER_FIT_STATE["fit_kws"]
+    keep = np.broadcast_to(keep, y.shape[:-1])
+    results = [
+        _fit_func(
+            y_slice, x, keep_slice, model, params, store_model, keep_best_fit, fit_kws
+        )
+        for y_slice, keep_slice in zip(
+            y.reshape(-1, y.shape[-1]), keep.reshape(-1), strict=True
+        )
+    ]
+    return np.stack(results).reshape(y.shape[:-1] + (-1,))
+
+
+def _fit_in_workers(
+    data_array,
+    keep_mask,
+    model,
+    params,
+    independent_var,
+    scheduler,
+    n_workers,
+    n_outputs,
+    store_model,
+    keep_best_fit,
+    fit_kws,
+):
+    """Fit chunks of spectra in parallel worker processes, using the ``scheduler`` ('processes' or 'distributed').
+
+    Returns
+    -------
+    xarray.DataArray
+        The packed fit results, with the independent variable replaced by the ``"fit_params"`` dimension.
+    """
+    other_dims = [dim for dim in data_array.dims if dim != independent_var]
+    if isinstance(data_array.data, da.array.core.Array):
+        data_array = data_array.chunk({independent_var: -1})
+    elif other_dims:
+        # Split the spectra into ~4 chunks per worker, along the longest of the other dimensions
+        split_dim = max(other_dims, key=data_array.sizes.get)
+        chunk_size = -(-data_array.sizes[split_dim] // (4 * n_workers))
+        data_array = data_array.chunk({independent_var: -1, split_dim: chunk_size})
+    else:
+        data_array = data_array.chunk()
+    keep_mask = keep_mask.chunk({dim: data_array.chunksizes[dim] for dim in other_dims})
+
+    results = xr.apply_ufunc(
+        _fit_block,
+        data_array,
+        data_array.coords[independent_var],
+        keep_mask,
+        kwargs={"store_model": store_model, "keep_best_fit": keep_best_fit},
+        input_core_dims=[[independent_var], [independent_var], []],
+        output_core_dims=[["fit_params"]],
+        dask="parallelized",
+        output_dtypes=[object if store_model else np.float64],
+        dask_gufunc_kwargs={"output_sizes": {"fit_params": n_outputs}},
+        keep_attrs=False,
+    )
+
+    # Send the model and parameters to each worker once, rather than with every chunk
+    payload = _dumps_fit_objects((model, params, fit_kws))
+    if scheduler == "processes":
+        return results.compute(
+            scheduler="processes",
+            num_workers=n_workers,
+            initializer=functools.partial(_init_fit_worker, payload),
+        )
+
+    try:
+        from distributed import Client, LocalCluster, progress
+    except ImportError as e:
+        raise ImportError(
+            "The 'distributed' scheduler requires dask.distributed. Install it with "
+            "`pip install 'peaks-arpes[distributed]'`, or use `scheduler='processes'`."
+        ) from e
+    with (
+        LocalCluster(
+            n_workers=n_workers, threads_per_worker=1, processes=True
+        ) as cluster,
+        Client(cluster) as client,
+    ):
+        client.run(_init_fit_worker, payload)
+        results = client.persist(results)
+        progress(results)
+        return results.compute()
+
+
+def _keep_model_mask(data_array, independent_var, keep_model):
+    """Return a boolean mask over the non-independent dimensions of the spectra to keep the
+    :class:`lmfit.ModelResult` for."""
+    template = data_array.isel({independent_var: 0}, drop=True)
+    n_spectra = template.size
+    mask = np.full(n_spectra, keep_model == "all")
+    if keep_model == "sample":
+        # Keep the results for spectra evenly spaced through the stack
+        mask[
+            np.linspace(0, n_spectra - 1, min(n_spectra, _N_SAMPLED_MODELS)).astype(int)
+        ] = True
+    return xr.DataArray(
+        mask.reshape(template.shape), dims=template.dims, coords=template.coords
+    )
+
+
+def _screen_spectra(data_array, independent_var, mask, min_counts, min_snr):
+    """Return a boolean mask over the non-independent dimensions of the spectra which pass the pre-screening of
+    :func:`fit` (or None if no screening is requested)."""
+    if mask is None and min_counts is None and min_snr is None:
+        return None
+
+    fit_mask = xr.ones_like(data_array.isel({independent_var: 0}, drop=True), dtype=bool)
+    with (
+        xr.set_options(arithmetic_join="exact"),
+        np.errstate(divide="ignore", invalid="ignore"),
+    ):
+        if mask is not None:
+            fit_mask = fit_mask & mask.astype(bool)
+        if min_counts is not None:
+            fit_mask = fit_mask & (data_array.sum(independent_var) >= min_counts)
+        if min_snr is not None:
+            # Estimate the noise from the median absolute difference between neighbouring points
+            signal = data_array.max(independent_var) - data_array.min(independent_var)
+            noise = abs(data_array.diff(independent_var)).median(independent_var) / (
+                0.6745 * np.sqrt(2)
+            )
+            fit_mask = fit_mask & (signal / noise >= min_snr)
+        fit_mask = fit_mask.compute()
+    return fit_mask.transpose(
+        *[dim for dim in data_array.dims if dim != independent_var]
+    )
+
+
+def _fit_screened(data_array, fit_mask, independent_var, **fit_kwargs):
+    """Fit only the spectra selected by ``fit_mask`` (see :func:`_screen_spectra`), returning the results for all
+    spectra, with `NaN` parameters and a `fit_status` of `FIT_SKIPPED` for those which are not fit."""
+    other_dims = list(fit_mask.dims)
+    n_spectra = fit_mask.size
+    fit_index = np.flatnonzero(fit_mask.values)
+    # If no spectra pass, fit the first to obtain the structure of the results
+    fit_index_or_first = fit_index if fit_index.size else np.array([0])
+
+    spectra = data_array.transpose(*other_dims, independent_var).data.reshape(
+        n_spectra, -1
+    )
+    spectra_to_fit = xr.DataArray(
+        spectra[fit_index_or_first],
+        dims=("spectrum", independent_var),
+        coords={independent_var: data_array.coords[independent_var]},
+    )
+    results = fit(
+        spectra_to_fit,
+        independent_var=independent_var,
+        sequential=fit_kwargs.pop("sequential") and len(other_dims) == 1,
+        **fit_kwargs,
+    )
+
+    # Fill in the results for the skipped spectra
+    expanded = xr.Dataset(
+        coords={
+            **{
+                name: coord
+                for name, coord in data_array.coords.items()
+                if independent_var not in coord.dims
+            },
+            **{
+                name: coord
+                for name, coord in results.coords.items()
+                if "spectrum" not in coord.dims
+            },
+        },
+        attrs=results.attrs,
+    )
+    for name, var in results.data_vars.items():
+        var = var.transpose("spectrum", ...)
+        if var.dtype == object:
+            fill_value = None
+        elif name == "fit_status":
+            fill_value = FIT_SKIPPED
+        else:
+            fill_value = np.nan
+        values = np.full((n_spectra,) + var.shape[1:], fill_value, dtype=var.dtype)
+        if fit_index.size:
+            values[fit_index] = var.values
+        expanded[name] = xr.DataArray(
+            values.reshape(fit_mask.shape + var.shape[1:]),
+            dims=tuple(other_dims) + var.dims[1:],
+            attrs=var.attrs,
+        )
+    return expanded
+
+
+def _fit_func(y, x, keep, model, initial_params, store_model, keep_best_fit, fit_kws):
+    """Fit a single spectrum, returning the packed results (see :func:`_pack_fit_result`)."""
+    result = model.fit(y, params=initial_params, x=x, **fit_kws)
+    return _pack_fit_result(result, keep, store_model, keep_best_fit)
+
+
+def _pack_fit_result(result, keep, store_model, keep_best_fit):
+    """Pack a :class:`lmfit.ModelResult` into a 1D array.
+
+    The array contains the best-fit values of all (P) parameters, their uncertainties, the chi-square and reduced
+    chi-square, the flattened (P, P) covariance matrix (`NaN` for parameters which are not varied), then optionally
+    the best-fit curve (if ``keep_best_fit``), the convergence status of the fit (`FIT_CONVERGED` or
+    `FIT_NOT_CONVERGED`) and the :class:`lmfit.ModelResult` (if ``store_model``, `None` unless ``keep``).
+    """
+    param_names = list(result.params)
+    best_values = np.array([result.params[param].value for param in param_names])
+    uncertainties = np.array(
+        [
+            (
+                result.params[param].stderr
+                if result.params[param].stderr is not None
+                else np.nan
+            )
+            for param in param_names
+        ]
+    )
+    covariance = np.full((len(param_names), len(param_names)), np.nan)
+    if result.covar is not None:
+        indices = [param_names.index(name) for name in result.var_names]
+        covariance[np.ix_(indices, indices)] = result.covar
+    packed = [
+        best_values,
+        uncertainties,
+        [result.chisqr, result.redchi],
+        covariance.ravel(),
+    ]
+    if keep_best_fit:
+        packed.append(result.best_fit)
+    packed.append([FIT_CONVERGED if result.success else FIT_NOT_CONVERGED])
+    if store_model:
+        packed.append(np.array([result if keep else None], dtype=object))
+    return np.concatenate(packed)
+
+
+def _parse_fit_results(results, param_names, x, model, keep_model, keep_best_fit):
+    """Parse the packed fit results (see :func:`_pack_fit_result`) into a :class:`xarray.Dataset`."""
+    n_params = len(param_names)
+    independent_var = x.name
+
+    def _get(start, stop, dtype):
+        return results.isel(fit_params=slice(start, stop)).astype(dtype)
+
     results_ds = xr.Dataset()
+    for i, name in enumerate(param_names):
+        results_ds[name] = _get(i, i + 1, np.float64).squeeze("fit_params", drop=True)
+    for i, name in enumerate(param_names):
+        results_ds[f"{name}_stderr"] = _get(
+            n_params + i, n_params + i + 1, np.float64
+        ).squeeze("fit_params", drop=True)
+    results_ds["chisqr"] = _get(2 * n_params, 2 * n_params + 1, np.float32).squeeze(
+        "fit_params", drop=True
+    )
+    results_ds["redchi"] = _get(2 * n_params + 1, 2 * n_params + 2, np.float32).squeeze(
+        "fit_params", drop=True
+    )
 
-    # Iterate over all_param_names and assign each corresponding value from results to the new dataset,
-    # ensuring dtype of float if not the fit model
-    for i, param_name in enumerate(all_param_names):
-        data_var = results.isel(fit_params=i).drop_vars("fit_params")
-        if param_name != "fit_model":
-            data_var = data_var.astype(np.float64)
-        results_ds[param_name] = data_var
+    # Covariance matrix, as an array over pairs of parameters
+    covariance = _get(2 * n_params + 2, 2 * n_params + 2 + n_params**2, np.float32)
+    other_dims = tuple(dim for dim in covariance.dims if dim != "fit_params")
+    covariance = covariance.transpose(*other_dims, "fit_params")
+    results_ds["covariance"] = xr.DataArray(
+        covariance.data.reshape(covariance.shape[:-1] + (n_params, n_params)),
+        dims=other_dims + ("cov_i", "cov_j"),
+        coords={
+            **{
+                name: coord
+                for name, coord in covariance.coords.items()
+                if "fit_params" not in coord.dims
+            },
+            "cov_i": np.array(param_names, dtype=object),
+            "cov_j": np.array(param_names, dtype=object),
+        },
+    )
+
+    end = 2 * n_params + 2 + n_params**2
+    if keep_best_fit:
+        results_ds["best_fit"] = (
+            _get(end, end + x.size, np.float32)
+            .rename({"fit_params": independent_var})
+            .assign_coords({independent_var: x.values})
+        )
+        end += x.size
+    results_ds["fit_status"] = _get(end, end + 1, np.int8).squeeze(
+        "fit_params", drop=True
+    )
+    results_ds["fit_status"].attrs = _FIT_STATUS_ATTRS
+    if keep_model != "none":
+        results_ds["fit_model"] = results.isel(fit_params=end + 1, drop=True)
+    if keep_model != "all":
+        # Store the model and the independent variable so that the fits can be re-evaluated
+        results_ds = results_ds.assign_coords({independent_var: x.values})
+        results_ds.attrs["model"] = _serialise_model(model)
 
     results_ds.attrs["independent_var"] = independent_var
     return results_ds
 
 
-def fit_gold(data, EF_correction_type="poly4", **kwargs):
+def _serialise_model(model):
+    """Serialise an :class:`lmfit.Model` to a string which can be stored in the metadata of the fit results."""
+    return base64.b64encode(_dumps_fit_objects(model)).decode("ascii")
+
+
+def _deserialise_model(model_string):
+    """Restore an :class:`lmfit.Model` serialised with :func:`_serialise_model`."""
+    return pickle.loads(base64.b64decode(model_string))
+
+
+def evaluate_fit(fit_results, x=None):
+    """Evaluate the best-fit model from fit results which do not include the full :class:`lmfit.ModelResult`
+    (i.e. from :func:`fit` with `keep_model='none'` or `'sample'`).
+
+    Parameters
+    ----------
+    fit_results : xarray.Dataset
+        The fit results.
+    x : numpy.ndarray, optional
+        The values of the independent variable to evaluate the model at. Defaults to those of the fitted data.
+
+    Returns
+    -------
+    xarray.Dataset
+        The best-fit curve (``best_fit``) and its components (``component_<prefix>``) for each of the fits, as
+        functions of the independent variable.
+    """
+    if "model" not in fit_results.attrs:
+        raise ValueError(
+            "The fit results do not include the serialised fit model. Use `keep_model='none'` or "
+            "`keep_model='sample'` when fitting."
+        )
+    model = _deserialise_model(fit_results.attrs["model"])
+    independent_var = fit_results.attrs["independent_var"]
+    if x is None:
+        x = fit_results[independent_var].values
+    params = model.make_params()
+    param_names = [name for name in params if name in fit_results.data_vars]
+
+    def _eval(*values):
+        for name, value in zip(param_names, values, strict=True):
+            params[name].set(value=value, expr="")
+        return np.stack(
+            [model.eval(params, x=x)]
+            + [
+                np.broadcast_to(component, x.shape)
+                for component in model.eval_components(params=params, x=x).values()
+            ]
+        )
+
+    component_names = [
+        f"component_{name}" for name in model.eval_components(params=params, x=x)
+    ]
+    curves = xr.apply_ufunc(
+        _eval,
+        *[fit_results[name] for name in param_names],
+        output_core_dims=[["curve", independent_var]],
+        vectorize=True,
+        dask="parallelized",
+        output_dtypes=[np.float64],
+        dask_gufunc_kwargs={
+            "output_sizes": {"curve": len(component_names) + 1, independent_var: x.size}
+        },
+    ).assign_coords({independent_var: x, "curve": ["best_fit"] + component_names})
+    return curves.to_dataset(dim="curve")
+
+
+def _fit_sequence(
+    y, x, keep, model, params, store_model, keep_best_fit, fit_kws, progress=False
+):
+    """Sequentially fit spectra ``y`` (N, M), using the results of each fit as the initial parameters for the
+    next, returning the packed results (N, ...) (see :func:`_pack_fit_result`)."""
+    results = []
+    for y_slice, keep_slice in zip(
+        tqdm(y, desc="Fitting", disable=not progress), keep, strict=True
+    ):
+        result = model.fit(y_slice, params=params, x=x, **fit_kws)
+        results.append(_pack_fit_result(result, keep_slice, store_model, keep_best_fit))
+        params = result.params
+    return np.stack(results)
+
+
+class _FitResultPickler(pickle.Pickler):
+    """Pickler for fit models and results, falling back to :mod:`dill` for the locally-defined classes and
+    functions of (wrapped and composite) :mod:`lmfit` models, which cannot be pickled by reference."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (type, types.FunctionType)) and "<locals>" in getattr(
+            obj, "__qualname__", ""
+        ):
+            return dill.loads, (dill.dumps(obj, protocol=-1),)
+        return NotImplemented
+
+
+def _dumps_fit_objects(obj):
+    """Serialise an object containing fit models or results with :class:`_FitResultPickler`."""
+    buffer = io.BytesIO()
+    _FitResultPickler(buffer, protocol=-1).dump(obj)
+    return buffer.getvalue()
+
+
+def _fit_sequential_chunk(payload):
+    """Sequentially fit a chunk of spectra in a worker process.
+
+    Parameters
+    ----------
+    payload : bytes
+        Serialised tuple of the arguments of :func:`_fit_sequence` (see :func:`_dumps_fit_objects`).
+
+    Returns
+    -------
+    bytes
+        Serialised packed fit results, as returned by :func:`_fit_sequence`.
+    """
+    return _dumps_fit_objects(_fit_sequence(*pickle.loads(payload)))
+
+
+def _sequential_fit(
+    data_array,
+    keep_mask,
+    model,
+    params,
+    independent_var,
+    non_indep_dim,
+    n_workers,
+    store_model,
+    keep_best_fit,
+    fit_kws,
+):
+    """Sequential fit of 2D data along ``non_indep_dim``.
+
+    If ``n_workers > 1``, the data are split into chunks which are fit in parallel, each seeded with the
+    parameters from a coarse sequential pre-fit of a subset of slices which includes the first slice of every chunk.
+
+    Returns
+    -------
+    xarray.DataArray
+        The packed fit results, with dimensions ``(non_indep_dim, "fit_params")``.
+    """
+    y = data_array.transpose(non_indep_dim, independent_var).values
+    x = data_array.coords[independent_var].values
+    keep = keep_mask.values
+    n_slices = y.shape[0]
+    n_workers = min(n_workers, n_slices)
+
+    if n_workers <= 1:
+        results = _fit_sequence(
+            y, x, keep, model, params, store_model, keep_best_fit, fit_kws, progress=True
+        )
+    else:
+        chunk_starts = [
+            chunk[0] for chunk in np.array_split(np.arange(n_slices), n_workers)
+        ]
+
+        # Coarse sequential pre-fit, stepping through ~10 slices per chunk to get the seed for each chunk
+        stride = max(1, n_slices // (10 * n_workers))
+        coarse_indices = sorted(
+            set(range(0, chunk_starts[-1], stride)) | set(chunk_starts)
+        )
+        seeds = {}
+        seed_params = params
+        for i in tqdm(coarse_indices, desc="Pre-fitting"):
+            seed_params = model.fit(y[i], params=seed_params, x=x, **fit_kws).params
+            seeds[i] = seed_params
+
+        # Fit the chunks in parallel, seeded from the pre-fit
+        chunk_ends = chunk_starts[1:] + [n_slices]
+        payloads = [
+            _dumps_fit_objects(
+                (
+                    y[start:end],
+                    x,
+                    keep[start:end],
+                    model,
+                    seeds[start],
+                    store_model,
+                    keep_best_fit,
+                    fit_kws,
+                )
+            )
+            for start, end in zip(chunk_starts, chunk_ends, strict=True)
+        ]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunk_results = list(
+                tqdm(
+                    executor.map(_fit_sequential_chunk, payloads),
+                    total=n_workers,
+                    desc="Fitting",
+                )
+            )
+        # Stitch the results back together in order
+        results = np.concatenate([pickle.loads(chunk) for chunk in chunk_results])
+
+    coords = {
+        name: coord
+        for name, coord in data_array.coords.items()
+        if independent_var not in coord.dims
+    }
+    return xr.DataArray(results, dims=(non_indep_dim, "fit_params"), coords=coords)
+
+
+def fit_gold(data, EF_correction_type="poly4", engine="lmfit", **kwargs):
     """
     Helper function for fitting a gold reference scan to a standard LinearDosFermiModel with parameters:
     - Fermi level (EF)
@@ -196,6 +908,20 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
         - 'linear': Fit a linear function to the extracted Fermi level values.
         - 'average': Average the extracted Fermi level values from all slices
 
+    engine : str, optional
+        The fitting engine to use for 2D data. Options are:
+        - 'lmfit' (default): sequential fit of each EDC with :mod:`lmfit`.
+        - 'batch': fit all EDCs in parallel from the same initial parameters with a compiled Levenberg-Marquardt
+        algorithm using the analytic derivatives of the resolution-broadened model (see
+        :func:`peaks.core.fitting.fermi_edge_fit.fermi_edge_fit`). Much faster for large gold images. No
+        :class:`lmfit.ModelResult` objects are stored.
+        - 'global': a single global fit of all EDCs, in which the Fermi level is a polynomial along the
+        non-independent dimension (of the order set by `EF_correction_type`), the temperature and resolution are
+        shared, and only the DOS and background terms vary for each EDC (see
+        :func:`peaks.core.fitting.fermi_edge_fit.global_fermi_edge_fit`). Much faster and more robust to noise than
+        fitting the EDCs independently. The uncertainties of the polynomial coefficients are stored in the
+        `EF_correction_stderr` attribute.
+
     **kwargs : optional
         Additional keyword arguments to initialise paramaeter values
 
@@ -216,6 +942,12 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
         # Fit the gold reference data, initialising the background slope to 0
         gold_fit = pks.fit_gold(gold_data, bg_slope=0)
 
+        # Fit a 2D gold image with the compiled Fermi-edge fitter
+        gold_fit = pks.fit_gold(gold_data, engine="batch")
+
+        # Global fit of a 2D gold image, with a quadratic Fermi level
+        gold_fit = pks.fit_gold(gold_data, EF_correction_type="quadratic", engine="global")
+
     """
     data = data.pint.dequantify()
     if data.ndim > 2:
@@ -240,9 +972,8 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
         other_dim = list(set(data.dims) - set(["eV"]))[0]
         first_slice = data.isel({other_dim: 0})
         params = gold_model.guess(first_slice, **kwargs)
-        fit_result = data.fit(gold_model, params, independent_var="eV")
 
-        # Fit the Fermi level correction
+        # Determine the order of the Fermi level correction
         if EF_correction_type == "poly4":
             _order = 4
         elif EF_correction_type == "poly3":
@@ -253,17 +984,29 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
             _order = 1
         elif EF_correction_type == "average":
             _order = 0
-        EF_correction_fit = fit_result["EF"].quick_fit.poly(_order)
+
+        if engine == "global":
+            # Single fit with a polynomial Fermi level
+            fit_result = _fit_gold_global(data, gold_model, params, other_dim, _order)
+            EF_correction_fit = None
+            coefficients = fit_result.attrs["EF_correction"]
+        else:
+            fit_result = data.fit(
+                gold_model, params, independent_var="eV", engine=engine
+            )
+            # Fit the Fermi level correction
+            EF_correction_fit = fit_result["EF"].quick_fit.poly(_order)
+            coefficients = {
+                f"c{i}": float(EF_correction_fit[f"c{i}"]) for i in range(_order + 1)
+            }
 
         if EF_correction_type == "average":
-            EF_correction = float(EF_correction_fit["c0"])
+            EF_correction = coefficients["c0"]
             results_text = (
                 f"Average Fermi level correction: {np.round(EF_correction, 3)}"
             )
         else:
-            EF_correction = {
-                f"c{i}": float(EF_correction_fit[f"c{i}"]) for i in range(_order + 1)
-            }
+            EF_correction = coefficients
             results_text = (
                 f"Polynomial Fermi level correction (order {_order}): "
                 + ", ".join(
@@ -284,10 +1027,23 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
         ax1.set_ylabel("eV")
 
         ax2 = fig.add_subplot(gs[0, 1])
-        EF_correction_fit.fit_model.data[()].plot_residuals(ax=ax2)
-        ax2.xaxis.set_visible(False)
         ax3 = fig.add_subplot(gs[1, 1], sharex=ax2)
-        EF_correction_fit.fit_model.data[()].plot_fit(ax=ax3)
+        if EF_correction_fit is None:
+            fit_result["EF_stderr"].plot(ax=ax2)
+            ax2.set_title("Fermi level uncertainty")
+            ax2.set_ylabel("")
+            EF, EF_stderr = fit_result["EF"], fit_result["EF_stderr"]
+            EF.plot(ax=ax3)
+            ax3.fill_between(
+                fit_result[other_dim].data,
+                EF - EF_stderr,
+                EF + EF_stderr,
+                alpha=0.3,
+            )
+        else:
+            EF_correction_fit.fit_model.data[()].plot_residuals(ax=ax2)
+            EF_correction_fit.fit_model.data[()].plot_fit(ax=ax3)
+        ax2.xaxis.set_visible(False)
         ax3.xaxis.set_visible(False)
         ax3.set_title("")
         ax3.set_ylabel("Fermi level (eV)")
@@ -303,42 +1059,182 @@ def fit_gold(data, EF_correction_type="poly4", **kwargs):
     return fit_result
 
 
-def _estimate_EF(y, x):
+def _fit_gold_global(data, model, params, other_dim, order):
+    """Global fit of a 2D gold image with a polynomial Fermi level, returning the results in the layout of
+    :func:`fit`.
+    """
+    data = data.transpose(other_dim, "eV")
+
+    # Initialise the Fermi level polynomial from estimates of the Fermi level of each EDC
+    EF_estimates = data.estimate_EF(dims=other_dim)
+    valid = np.isfinite(EF_estimates.data)
+    initial_coefficients = None
+    if valid.sum() > order:
+        initial_coefficients = np.polynomial.polynomial.polyfit(
+            data[other_dim].data[valid], EF_estimates.data[valid], order
+        )
+
+    result = global_fermi_edge_fit(
+        np.asarray(data.values),
+        data["eV"].data,
+        data[other_dim].data,
+        model,
+        params,
+        order=order,
+        initial_coefficients=initial_coefficients,
+    )
+    data_vars = {}
+    for name in params:
+        i = result["param_names"].index(name)
+        data_vars[name] = (other_dim, result["params"][:, i])
+        data_vars[f"{name}_stderr"] = (other_dim, result["params_stderr"][:, i])
+    data_vars["chisqr"] = result["chisqr"]
+    data_vars["redchi"] = result["redchi"]
+    fit_result = xr.Dataset(data_vars, coords={other_dim: data[other_dim]})
+    fit_result.attrs["EF_correction"] = {
+        f"c{i}": float(value) for i, value in enumerate(result["coefficients"])
+    }
+    fit_result.attrs["EF_correction_stderr"] = {
+        f"c{i}": float(value) for i, value in enumerate(result["coefficients_stderr"])
+    }
+    return fit_result
+
+
+@njit(cache=True)
+def _passes_peak_criteria(y, peak, min_prominence, min_width):
+    """Check whether a peak has at least the given prominence and width (in points, at half the prominence),
+    calculated as in :func:`scipy.signal.find_peaks`.
+    """
+    # Prominence, from the lowest points on either side before reaching higher data
+    left_min = y[peak]
+    left_base = peak
+    i = peak
+    while i >= 0 and y[i] <= y[peak]:
+        if y[i] < left_min:
+            left_min = y[i]
+            left_base = i
+        i -= 1
+    right_min = y[peak]
+    right_base = peak
+    i = peak
+    while i < y.size and y[i] <= y[peak]:
+        if y[i] < right_min:
+            right_min = y[i]
+            right_base = i
+        i += 1
+    prominence = y[peak] - max(left_min, right_min)
+    if not prominence >= min_prominence:
+        return False
+
+    # Width at half the prominence, interpolating between points
+    height = y[peak] - 0.5 * prominence
+    i = peak
+    while left_base < i and height < y[i]:
+        i -= 1
+    left_ip = float(i)
+    if y[i] < height:
+        left_ip += (height - y[i]) / (y[i + 1] - y[i])
+    i = peak
+    while i < right_base and height < y[i]:
+        i += 1
+    right_ip = float(i)
+    if y[i] < height:
+        right_ip -= (height - y[i]) / (y[i - 1] - y[i])
+    return right_ip - left_ip >= min_width
+
+
+@njit(parallel=True, cache=True)
+def _EF_peak_indices(y, min_prominence, min_width, last):
+    """Return the index of the first (or ``last``) peak in each row of ``y`` (N, M) passing the peak criteria, or
+    -1 if there is none. Local maxima (including the middle of flat peaks) are found as in
+    :func:`scipy.signal.find_peaks`.
+    """
+    n_spectra, n_points = y.shape
+    indices = np.full(n_spectra, -1, dtype=np.int64)
+    for n in prange(n_spectra):
+        row = y[n]
+        i = 1
+        while i < n_points - 1:
+            if row[i - 1] < row[i]:
+                i_ahead = i + 1
+                while i_ahead < n_points - 1 and row[i_ahead] == row[i]:
+                    i_ahead += 1
+                if row[i_ahead] < row[i]:
+                    peak = (i + i_ahead - 1) // 2
+                    if _passes_peak_criteria(row, peak, min_prominence[n], min_width):
+                        indices[n] = peak
+                        if not last:
+                            break
+                    i = i_ahead
+            i += 1
+    return indices
+
+
+def _estimate_EF(y, x, x_offset=0.0):
     """
     Estimate the Fermi level from the first negative peak in the first derivative of the data.
 
     Parameters
     ----------
     y : numpy.ndarray
-        The data array to estimate the Fermi level from.
+        The data array to estimate the Fermi level from, with the energy along the last axis. Any leading axes are
+        treated as a stack of EDCs, which are all processed at once.
     x : numpy.ndarray
         The corresponding x-axis values.
+    x_offset : float or numpy.ndarray, optional
+        Offset to add to the x-axis values of each EDC (e.g. the kinetic energy offsets of an hv scan). Should be
+        broadcastable to the shape of the leading axes of `y`. Defaults to 0.
 
     Returns
     -------
-    float
-        The estimated Fermi level.
+    numpy.ndarray
+        The estimated Fermi level of each EDC (a 0-d array for 1D data), or NaN where no Fermi level is found.
     """
-
-    def noise_level(y):
-        # Calculate the average of nearest neighbour differences to evaluate the noise level of a signal
-        NNdist = [abs(y[i] - y[i - 1]) for i in range(1, len(y))]
-        noise = np.average(NNdist)
-        return noise
+    y = np.asarray(y, dtype=float)
+    x = np.asarray(x, dtype=float)
+    stack_shape = y.shape[:-1]
 
     # Smooth the data and compute its derivative
     sigma_px = 0.01 / (abs(x[-1] - x[0]) / len(x))
-    deriv = np.gradient(gaussian_filter1d(y, sigma=sigma_px), x)
-    y_filtered = -gaussian_filter1d(deriv, 2)
-    noise = noise_level(y_filtered)
+    deriv = np.gradient(gaussian_filter1d(y, sigma=sigma_px, axis=-1), x, axis=-1)
+    y_filtered = -gaussian_filter1d(deriv, 2, axis=-1)
+    # Noise level from the average of nearest neighbour differences
+    noise = np.mean(np.abs(np.diff(y_filtered, axis=-1)), axis=-1)
+
+    # Find the highest-energy peak with prominence >= 2.5 * noise level and with width at least 3 points
+    peaks_index = _EF_peak_indices(
+        np.ascontiguousarray(y_filtered.reshape(-1, y.shape[-1])),
+        2.5 * noise.reshape(-1),
+        3.0,
+        x[-1] >= x[0],
+    )
+    x_offset = np.broadcast_to(x_offset, stack_shape).reshape(-1)
+    EF = np.where(peaks_index >= 0, x[peaks_index] + x_offset, np.nan)
+    return np.round(EF, 3).reshape(stack_shape)  # Estimated EF
 
-    # Find all the peaks with prominence >= 2.5 * noise level and with width at least 3 points
-    peaks_index, _ = find_peaks(y_filtered, prominence=noise * 2.5, width=3)
-    EF = np.round(x[peaks_index].max(), 3)  # Estimated EF
-    return EF
 
+def _estimate_EF_along(da, dims):
+    """Estimate the Fermi level for each point along ``dims``, from the data integrated over all other
+    (non-energy) dimensions, returning a :class:`xarray.DataArray`.
+    """
+    int_dims = [dim for dim in da.dims if dim not in dims and dim != "eV"]
+    dos = da.mean(int_dims).pint.dequantify().fillna(0).transpose(*dims, "eV")
+
+    # Correct for the kinetic energy offsets of an hv scan, as in `disp_from_hv`
+    x_offset = 0.0
+    if "hv" in dims and "kinetic" in da.metadata.analyser.scan.eV_type.lower():
+        KE_delta = da.KE_delta
+        if not isinstance(KE_delta.data, np.ndarray):
+            KE_delta = KE_delta.pint.to(da.eV.units).pint.dequantify()
+        x_offset = KE_delta.broadcast_like(dos.isel(eV=0)).transpose(*dims).data
+
+    EF = _estimate_EF(dos.data, dos["eV"].data, x_offset=x_offset)
+    return xr.DataArray(
+        EF, dims=dims, coords={dim: dos.coords[dim] for dim in dims}, name="EF"
+    )
 
-def estimate_EF(da):
+
+def estimate_EF(da, dims=None):
     """Make an approximate guess for the Fermi level from the corresponding peak in the derivative of the data.
 
     :::{warning}
@@ -351,26 +1247,49 @@ def estimate_EF(da):
     data: xarray.DataArray
         The data to estimate the Fermi level from.
 
+    dims: str or list, optional
+        Dimension(s) to estimate the Fermi level along, e.g. 'hv' for an hv scan or ['x1', 'x2'] for a spatial map.
+        All EDCs are processed at once, integrating over any other non-energy dimensions, and the estimated Fermi
+        levels are returned as a :class:`xarray.DataArray` over `dims` (NaN where no Fermi level is found). For hv
+        scans in kinetic energy, the kinetic energy offsets of each photon energy are included. Defaults to None,
+        where a single Fermi level is estimated from the DOS (or, for hv scans in kinetic energy, the estimates at
+        each photon energy are smoothed with a polynomial fit).
+
     Returns
     -------
-    float
+    float or numpy.ndarray or xarray.DataArray
         The estimated Fermi level.
+
+    Examples
+    --------
+    Example usage is as follows::
+
+        import peaks as pks
+
+        # Estimate the Fermi level of a dispersion
+        EF = disp.estimate_EF()
+
+        # Estimate the Fermi level at every point of a spatial map
+        EF_map = SM.estimate_EF(dims=["x1", "x2"])
     """
     if "eV" not in da.dims:
         raise ValueError("Data must have an 'eV' dimension to estimate the Fermi level.")
 
+    if dims is not None:
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        if "eV" in dims or not set(dims).issubset(da.dims):
+            raise ValueError(
+                f"dims must be a subset of the non-energy dimensions of the data {da.dims}."
+            )
+        return _estimate_EF_along(da, dims)
+
     # Check for an hv scan
     if "hv" in da.dims and "kinetic" in da.metadata.analyser.scan.eV_type.lower():
-        # Iterate through the photon energies and estimate at each
-        EF_values = []
-        for hv in da.hv.data:
-            data_hv = da.disp_from_hv(hv=hv)
-            EF = _estimate_EF(data_hv.DOS().fillna(0).data, data_hv.eV.data)
-            EF_values.append(EF)
-        EF_data = xr.DataArray(EF_values, dims=["hv"], coords={"hv": da.hv.data})
+        # Estimate at all photon energies at once
+        EF_data = _estimate_EF_along(da, ["hv"])
         # Fit the result to a 2nd order polynomial
         fit_order = 3
-        fit_result = EF_data.quick_fit.poly(fit_order)
+        fit_result = EF_data.dropna("hv").quick_fit.poly(fit_order)
         fit_model = fit_result.fit_model.data[()]
         params = {
             f"c{i}": f"{fit_model.params[f'c{i}'].value:.5f}"
@@ -387,9 +1306,10 @@ def estimate_EF(da):
         return EF_values_out
     else:
         try:
-            return _estimate_EF(da.DOS().fillna(0).pint.dequantify().data, da.eV.data)
+            EF = _estimate_EF(da.DOS().fillna(0).pint.dequantify().data, da.eV.data)
         except Exception:
             return None
+        return None if np.isnan(EF) else EF[()]
 
 
 def save_fit(fit_result, filename):
@@ -401,12 +1321,23 @@ def save_fit(fit_result, filename):
     fit_result : xarray.DataSet
         The results of the fit to save.
     filename : str
-        The name of the file to save the fit results to.
+        The name of the file to save the fit results to. If this ends in `.zarr`, the results are saved as a
+        Zarr store, which requires fit results without :class:`lmfit.ModelResult` objects (i.e. from :func:`fit`
+        with `keep_model='none'`). Otherwise, the results are pickled with :mod:`dill`.
 
     Returns
     -------
     None
     """
+    if str(filename).endswith(".zarr"):
+        if "fit_model" in fit_result:
+            raise ValueError(
+                "Fit results containing lmfit.ModelResult objects cannot be saved as Zarr. Fit with "
+                "`keep_model='none'`, or drop the `fit_model` variable first."
+            )
+        fit_result.to_zarr(filename, mode="w")
+        return
+
     result_as_dict = fit_result.to_dict()
     with open(filename, "wb") as f:
         dill.dump(result_as_dict, f, protocol=-1)
@@ -414,7 +1345,7 @@ def save_fit(fit_result, filename):
 
 def load_fit(filename):
     """
-    Load the results of a fit from a netCDF file.
+    Load the results of a fit saved with :func:`save_fit`.
 
     Parameters
     ----------
@@ -426,6 +1357,10 @@ def load_fit(filename):
     xarray.DataSet
         The results of the fit.
     """
+    if str(filename).endswith(".zarr"):
+        with xr.open_zarr(filename) as fit_result:
+            return fit_result.load()
+
     with open(filename, "rb") as f:
         result_as_dict = dill.load(f)
     return xr.Dataset.from_dict(result_as_dict)
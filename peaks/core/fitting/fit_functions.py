@@ -6,6 +6,11 @@ from scipy.special import expit
 TINY = 1.0e-15
 kb_eV, _, _ = physical_constants["Boltzmann constant in eV/K"]
 
+# Convergence status of each fit, stored in the `fit_status` variable of the fit results
+FIT_CONVERGED = 0
+FIT_NOT_CONVERGED = 1
+FIT_SKIPPED = 2
+
 
 @numba.njit(cache=True)
 def _linear_dos_fermi(
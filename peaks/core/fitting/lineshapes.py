@@ -0,0 +1,216 @@
+"""Compiled lineshapes for fitting, and Gaussian convolution with cached kernels."""
+
+import functools
+
+import numba
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.ndimage import correlate1d
+
+from peaks.core.fitting.fit_functions import TINY
+
+S2 = np.sqrt(2.0)
+S2PI = np.sqrt(2.0 * np.pi)
+SPI = np.sqrt(np.pi)
+
+# Gaussian kernels with a larger radius than this (in pixels) are applied by FFT rather than direct convolution
+_FFT_KERNEL_RADIUS = 50
+
+
+def _weideman_coefficients(n_terms):
+    """Return the scale and polynomial coefficients of Weideman's rational approximation to the Faddeeva function
+    (J. A. C. Weideman, SIAM J. Numer. Anal. 31, 1497 (1994)).
+    """
+    M = 2 * n_terms
+    k = np.arange(-M + 1, M)
+    L = np.sqrt(n_terms / np.sqrt(2))
+    t = L * np.tan(k * np.pi / (2 * M))
+    f = np.concatenate([[0.0], np.exp(-(t**2)) * (L**2 + t**2)])
+    a = np.real(np.fft.fft(np.fft.fftshift(f))) / (2 * M)
+    return L, np.ascontiguousarray(a[1 : n_terms + 1][::-1])
+
+
+# 36 terms give an accuracy close to machine precision for the Voigt profile
+_WEIDEMAN_L, _WEIDEMAN_COEFFS = _weideman_coefficients(36)
+
+
+@numba.njit(cache=True)
+def _faddeeva_upper(z):
+    """Weideman's rational approximation to w(z), valid for Im(z) >= 0."""
+    iz = 1j * z
+    denom = _WEIDEMAN_L - iz
+    Z = (_WEIDEMAN_L + iz) / denom
+    p = 0j
+    for c in _WEIDEMAN_COEFFS:
+        p = p * Z + c
+    return 2 * p / denom**2 + (1 / SPI) / denom
+
+
+@numba.njit(cache=True)
+def _faddeeva(z):
+    """The Faddeeva function w(z), reflecting arguments in the lower half-plane to the upper half-plane."""
+    if z.imag < 0:
+        return 2 * np.exp(-(z**2)) - _faddeeva_upper(-z)
+    return _faddeeva_upper(z)
+
+
+@numba.vectorize(["complex128(complex128)"], cache=True)
+def faddeeva(z):
+    """Compiled Faddeeva function w(z) = exp(-z^2) erfc(-iz), a drop-in replacement for :func:`scipy.special.wofz`.
+
+    Parameters
+    ----------
+    z : complex or numpy.ndarray
+        The argument(s) of the function.
+
+    Returns
+    -------
+    complex or numpy.ndarray
+        The Faddeeva function evaluated at `z`.
+    """
+    return _faddeeva(z)
+
+
+@numba.njit(cache=True)
+def _voigt(x, amplitude, center, sigma, gamma):
+    result = np.empty(x.size)
+    sigma_s2 = max(TINY, sigma * S2)
+    norm = amplitude / max(TINY, sigma * S2PI)
+    for i in range(x.size):
+        result[i] = norm * _faddeeva(complex(x[i] - center, gamma) / sigma_s2).real
+    return result
+
+
+@numba.njit(cache=True)
+def _doniach(x, amplitude, center, sigma, gamma):
+    result = np.empty(x.size)
+    sigma = max(TINY, sigma)
+    gm1 = 1.0 - gamma
+    scale = amplitude / sigma**gm1
+    for i in range(x.size):
+        arg = (x[i] - center) / sigma
+        result[i] = (
+            scale
+            * np.cos(np.pi * gamma / 2 + gm1 * np.arctan(arg))
+            / (1 + arg**2) ** (gm1 / 2)
+        )
+    return result
+
+
+def voigt(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=None):
+    """Compiled Voigt lineshape, equivalent to :func:`lmfit.lineshapes.voigt` but evaluating the Faddeeva function
+    with Weideman's rational approximation rather than :func:`scipy.special.wofz`.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The independent variable.
+    amplitude : float, optional
+        The area of the peak. Defaults to 1.
+    center : float, optional
+        The centre of the peak. Defaults to 0.
+    sigma : float, optional
+        The width of the Gaussian component. Defaults to 1.
+    gamma : float, optional
+        The half-width of the Lorentzian component. Defaults to None, where it is set equal to `sigma`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The Voigt lineshape evaluated at `x`.
+    """
+    if gamma is None:
+        gamma = sigma
+    x = np.asarray(x, dtype=float)
+    return _voigt(
+        x.ravel(), float(amplitude), float(center), float(sigma), float(gamma)
+    ).reshape(x.shape)
+
+
+def doniach(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=0.0):
+    """Compiled Doniach-Šunjić lineshape for asymmetric core-level peaks, equivalent to
+    :func:`lmfit.lineshapes.doniach`.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The independent variable.
+    amplitude : float, optional
+        The amplitude of the peak. Defaults to 1.
+    center : float, optional
+        The centre of the peak. Defaults to 0.
+    sigma : float, optional
+        The width of the peak. Defaults to 1.
+    gamma : float, optional
+        The asymmetry parameter. Defaults to 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        The Doniach-Šunjić lineshape evaluated at `x`.
+    """
+    x = np.asarray(x, dtype=float)
+    return _doniach(
+        x.ravel(), float(amplitude), float(center), float(sigma), float(gamma)
+    ).reshape(x.shape)
+
+
+@functools.lru_cache(maxsize=256)
+def _gaussian_kernel(sigma_pxl):
+    """Normalised Gaussian kernel of width ``sigma_pxl`` (in pixels), truncated at 4 sigma as in
+    :func:`scipy.ndimage.gaussian_filter1d`. Cached, as the width is often fixed while fitting.
+    """
+    radius = int(4 * sigma_pxl + 0.5)
+    k = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 / (sigma_pxl * sigma_pxl) * k**2)
+    kernel /= kernel.sum()
+    kernel.flags.writeable = False
+    return kernel
+
+
+@functools.lru_cache(maxsize=64)
+def _gaussian_kernel_fft(sigma_pxl, n_fft):
+    """Real FFT of the Gaussian kernel of width ``sigma_pxl``, zero-padded to length ``n_fft``."""
+    kernel_fft = rfft(_gaussian_kernel(sigma_pxl), n_fft)
+    kernel_fft.flags.writeable = False
+    return kernel_fft
+
+
+def gaussian_filter(data, sigma_pxl):
+    """Gaussian filter along the last axis of ``data``, equivalent to :func:`scipy.ndimage.gaussian_filter1d` with the
+    default `reflect` boundary mode and truncation.
+
+    The kernels are cached by their width, and wide kernels are applied by FFT (with their transforms also cached).
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The data to filter.
+    sigma_pxl : float
+        The standard deviation of the Gaussian kernel, in pixels.
+
+    Returns
+    -------
+    numpy.ndarray
+        The filtered data.
+    """
+    data = np.asarray(data, dtype=float)
+    sigma_pxl = float(sigma_pxl)
+    if not sigma_pxl > TINY:
+        return data.copy()
+    kernel = _gaussian_kernel(sigma_pxl)
+    radius = (kernel.size - 1) // 2
+    if radius <= _FFT_KERNEL_RADIUS:
+        return correlate1d(data, kernel, axis=-1, mode="reflect")
+
+    # Pad with the reflected data (as for the `reflect` mode) and convolve by FFT
+    n_points = data.shape[-1]
+    pad_width = [(0, 0)] * (data.ndim - 1) + [(radius, radius)]
+    padded = np.pad(data, pad_width, mode="symmetric")
+    n_fft = next_fast_len(padded.shape[-1] + 2 * radius, real=True)
+    result = irfft(
+        rfft(padded, n_fft, axis=-1) * _gaussian_kernel_fft(sigma_pxl, n_fft),
+        n_fft,
+        axis=-1,
+    )
+    return result[..., 2 * radius : 2 * radius + n_points]
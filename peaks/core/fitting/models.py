@@ -6,9 +6,9 @@ import lmfit.models as lm_models
 import numpy as np
 import xarray as xr
 from lmfit import CompositeModel, Model
-from scipy.ndimage import gaussian_filter1d
 
 from peaks.core.fitting.fit_functions import _fermi_function, _linear_dos_fermi
+from peaks.core.fitting.lineshapes import doniach, gaussian_filter, voigt
 
 
 def create_xarray_compatible_lmfit_model(model):
@@ -111,13 +111,34 @@ class GaussianConvolvedFitModel(create_xarray_compatible_lmfit_model(CompositeMo
 
         def _convolve_gauss(model, sigma_conv_pxl):
             """Apply Gaussian convolution."""
-            return gaussian_filter1d(model, sigma_conv_pxl)
+            return gaussian_filter(model, sigma_conv_pxl)
 
         gauss_model = Model(_gauss_conv)
         gauss_model.set_param_hint("sigma_conv", min=0, value=0.001, vary=False)
         super().__init__(model, gauss_model, _convolve_gauss)
 
 
+class FastVoigtModel(create_xarray_compatible_lmfit_model(lm_models.VoigtModel)):
+    """Voigt model using the compiled :func:`peaks.core.fitting.lineshapes.voigt` lineshape in place of
+    :func:`lmfit.lineshapes.voigt`. Parameters, constraints and guesses are as for :class:`lmfit.models.VoigtModel`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = voigt
+
+
+class FastDoniachModel(create_xarray_compatible_lmfit_model(lm_models.DoniachModel)):
+    """Doniach-Šunjić model using the compiled :func:`peaks.core.fitting.lineshapes.doniach` lineshape in place of
+    :func:`lmfit.lineshapes.doniach`. Parameters, constraints and guesses are as for
+    :class:`lmfit.models.DoniachModel`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = doniach
+
+
 class FermiFunctionModel(create_xarray_compatible_lmfit_model(Model)):
     """lmfit compatible model for the Fermi function."""
 
@@ -194,12 +215,16 @@ class LinearDosFermiModel(GaussianConvolvedFitModel):
 
 
 def _shirley_bg(data, num_avg=1, offset_start=0, offset_end=0, max_iterations=10):
-    """Function to calculate the Shirley background of 1D data.
+    """Function to calculate the Shirley background of 1D data, or of a stack of spectra.
+
+    The integrals are evaluated with cumulative sums, so that each iteration is O(N) in the number of points, and
+    are vectorised over any leading dimensions of the data.
 
     Parameters
     ----------
     data : numpy.ndarray, list, xarray.DataArray
-        The 1D data (y values) to find the Shirley background of.
+        The data (y values) to find the Shirley background of, with the energy along the last axis. Any leading
+        axes are treated as a stack of independent spectra.
 
     num_avg : int, optional
         The number of points to consider when calculating the average value of the data start and end points. Useful for
@@ -219,7 +244,8 @@ def _shirley_bg(data, num_avg=1, offset_start=0, offset_end=0, max_iterations=10
     Returns
     -------
     Shirley_bkg : numpy.ndarray
-        The Shirley background of the 1D data.
+        The Shirley background of the data, with the same shape as the data. Spectra whose start and end values are
+        equal have a constant background, and spectra containing non-finite values have a NaN background.
 
     Examples
     --------
@@ -249,13 +275,13 @@ def _shirley_bg(data, num_avg=1, offset_start=0, offset_end=0, max_iterations=10
         data = np.array(data)
     else:
         raise Exception(
-            "Inputted data must be a 1D numpy.ndarray, list or xarray.DataArray."
+            "Inputted data must be a numpy.ndarray, list or xarray.DataArray."
         )
 
-    # Ensure data is 1D
-    if len(data.shape) != 1:
+    # Ensure data has at least one dimension
+    if data.ndim == 0:
         raise Exception(
-            "Inputted data must be a 1D numpy.ndarray, list or xarray.DataArray."
+            "Inputted data must be an at least 1D numpy.ndarray, list or xarray.DataArray."
         )
 
     # Ensure num_avg and max_iterations are integers
@@ -276,48 +302,58 @@ def _shirley_bg(data, num_avg=1, offset_start=0, offset_end=0, max_iterations=10
             "The inputs offset_start and offset_end must both be floats"
         ) from e
 
-    # Get number of points in data and define tolerance
-    num_points = len(data)
+    # Work on a 2D stack of spectra
+    data_shape = data.shape
+    data = np.asarray(data, dtype=float).reshape(-1, data_shape[-1])
     tolerance = 1e-5
 
     # Determine start and end limits of Shirley background
-    y_start = data[0:num_avg].mean() - offset_start
-    y_end = data[(num_points - num_avg) : num_points].mean() - offset_end
+    y_start = data[:, :num_avg].mean(axis=1, keepdims=True) - offset_start
+    y_end = data[:, -num_avg:].mean(axis=1, keepdims=True) - offset_end
 
     # Initialise the bkg shape B, where total Shirley bkg is given by Shirley_bkg = y_end + B
     B = np.zeros(data.shape)
 
     # First B value is equal to y_start - y_end, i.e. Shirley_bkg[0] = y_start as expected
-    B[0] = y_start - y_end
-
-    # Define function to determine Shirley bkg
-    def dk(i):
-        return sum(0.5 * (data[i:-1] + data[i + 1 :] - 2 * y_end - B[i:-1] + B[i + 1 :]))
-
-    # Perform iterative procedure to converge to Shirley bkg, stopping if maximum number of iterations is reached
-    num_iterations = 0
-    while num_iterations < max_iterations:
+    B[:, 0] = (y_start - y_end)[:, 0]
+
+    # Trapezium integrand of J(x') - y_end - B(x'), independent of B apart from the B terms
+    data_trapz = 0.5 * (data[:, :-1] + data[:, 1:]) - y_end
+
+    # Spectra with no step between the start and end limits have a constant background (B = 0), and spectra containing
+    # non-finite values have no defined background (NaN): neither should be iterated
+    flat = (y_start == y_end)[:, 0]
+    non_finite = ~np.isfinite(data).all(axis=1)
+    B[non_finite] = np.nan
+    B[flat & ~non_finite] = 0
+
+    # Perform iterative procedure to converge to Shirley bkg, stopping once the background for every spectrum has
+    # converged or if the maximum number of iterations is reached
+    active = ~(flat | non_finite)
+    for _ in range(max_iterations):
+        # Integrals from each point to the end of the data, from a reversed cumulative sum
+        integrand = data_trapz[active] + 0.5 * (B[active, 1:] - B[active, :-1])
+        integrals = np.zeros((integrand.shape[0], data.shape[1]))
+        integrals[:, :-1] = np.cumsum(integrand[:, ::-1], axis=1)[:, ::-1]
         # Calculate new k = (y_start - y_end) / (int_(xl)^(xr) J(x') - y_end - B(x') dx')
-        k_sum = sum(0.5 * (data[:-1] + data[1:] - 2 * y_end - B[:-1] + B[1:]))
-        k = (y_start - y_end) / k_sum
+        k = (y_start[active] - y_end[active]) / integrals[:, :1]
         # Calculate new B
-        y_sum = np.array(list(map(dk, range(0, num_points))))
-        new_B = k * y_sum
-        # If new_B is close to B (within tolerance), stop the loop
-        if sum(abs(new_B - B)) < tolerance:
-            B = new_B
+        new_B = k * integrals
+        # Stop iterating for spectra where new_B is close to B (within tolerance)
+        converged = np.sum(np.abs(new_B - B[active]), axis=1) < tolerance
+        B[active] = new_B
+        active[active] = ~converged
+        if not active.any():
             break
-        else:
-            B = new_B
-        num_iterations += 1
 
     # Raise an error if the maximum allowed number of iterations is exceeded
-    if num_iterations >= max_iterations:
+    if active.any():
         raise Exception(
-            "Maximum number of iterations exceeded before convergence of Shirley background was achieved."
+            f"Maximum number of iterations exceeded before convergence of Shirley background was achieved for "
+            f"{np.count_nonzero(active)} of {data.shape[0]} spectra."
         )
 
     # Determine Shirley bkg
     Shirley_bkg = y_end + B
 
-    return Shirley_bkg
+    return Shirley_bkg.reshape(data_shape)
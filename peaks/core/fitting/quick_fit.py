@@ -103,7 +103,7 @@ class QuickFit:
         return fit(self._obj, PolynomialModel(degree=degree), params, independent_var)
 
     def _peak_model(self, peak, independent_var, **kwargs):
-        """Quick fit to a Gaussian model."""
+        """Quick fit to a peak model on a linear background."""
         from .models import LinearModel
 
         if peak == "gaussian":
@@ -114,6 +114,14 @@ class QuickFit:
             from .models import LorentzianModel
 
             peak_model = LorentzianModel()
+        elif peak == "voigt":
+            from .models import FastVoigtModel
+
+            peak_model = FastVoigtModel()
+        elif peak == "doniach":
+            from .models import FastDoniachModel
+
+            peak_model = FastDoniachModel()
 
         model = peak_model + LinearModel()
         data_for_guess = self._get_data_for_guess(model, independent_var, **kwargs)
@@ -135,3 +143,16 @@ class QuickFit:
         return self._peak_model("lorentzian", independent_var, **kwargs)
 
     lorentzian.__doc__ = lorentzian.__doc__ + QUICK_FIT_COMMON_DOC
+
+    def voigt(self, independent_var=None, **kwargs):
+        """Quick fit to a Voigt model, using the compiled :class:`FastVoigtModel`."""
+        return self._peak_model("voigt", independent_var, **kwargs)
+
+    voigt.__doc__ = voigt.__doc__ + QUICK_FIT_COMMON_DOC
+
+    def doniach(self, independent_var=None, **kwargs):
+        """Quick fit to a Doniach-Šunjić model (e.g. for asymmetric core-level peaks), using the compiled
+        :class:`FastDoniachModel`."""
+        return self._peak_model("doniach", independent_var, **kwargs)
+
+    doniach.__doc__ = doniach.__doc__ + QUICK_FIT_COMMON_DOC
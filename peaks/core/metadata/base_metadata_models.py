@@ -1,15 +1,28 @@
+from functools import lru_cache
 from typing import Optional, Union
 
 import numpy as np
 import pint
 import pint_xarray
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, create_model
 from pydantic_core import core_schema
 
 # Define the appropriate unit registry
 ureg = pint_xarray.unit_registry
 
 
+@lru_cache(maxsize=256)
+def _parse_units(units):
+    """Parse a units string (cached, as this is called for every serialised Quantity)."""
+    return ureg(units)
+
+
+@lru_cache(maxsize=256)
+def _format_units(units, unit_format):
+    """Format pint units as a string (cached, keyed on the registry's format)."""
+    return str(units)
+
+
 class Quantity(pint.Quantity):
     """Class to handle storing and validating pint Quantities in pydantic model."""
 
@@ -39,7 +52,10 @@ class Quantity(pint.Quantity):
             if value is not None and units is not None:
                 if isinstance(value, list):  # Handle list serialization of ndarray
                     value = np.array(value)
-                return value * ureg(units)
+                units = _parse_units(units)
+                if units.magnitude == 1:
+                    return ureg.Quantity(value, units.units)
+                return value * units
             else:
                 raise ValueError(
                     'Invalid quantity dictionary. Must have "value" and "units".'
@@ -50,7 +66,7 @@ class Quantity(pint.Quantity):
             and isinstance(v[1], str)
             and isinstance(v[0], (int, float, list, np.ndarray))
         ):
-            return v[0] * ureg(v[1])
+            return v[0] * _parse_units(v[1])
         elif isinstance(v, (int, float)):
             return v * ureg("")
         elif isinstance(v, np.ndarray):
@@ -64,10 +80,11 @@ class Quantity(pint.Quantity):
 
 # Handle serialising
 def _quantity_encoder(quantity: pint.Quantity):
+    units = _format_units(quantity.units, ureg.formatter.default_format)
     if isinstance(quantity.magnitude, np.ndarray):
         # Convert ndarray to list for JSON serialization
-        return {"value": quantity.magnitude.tolist(), "units": str(quantity.units)}
-    return {"value": quantity.magnitude, "units": str(quantity.units)}
+        return {"value": quantity.magnitude.tolist(), "units": units}
+    return {"value": quantity.magnitude, "units": units}
 
 
 # Base class for passing a pint Quantity
@@ -140,6 +157,30 @@ class AxisMetadataModelWithReference(NamedAxisMetadataModel):
     reference_value: Optional[Quantity] = None
 
 
+@lru_cache(maxsize=None)
+def _get_manipulator_metadata_model(manipulator_axes):
+    """Return the manipulator metadata model for a given set of manipulator axes.
+
+    The model is created dynamically, as the available axes vary between loaders, and
+    cached so that it is only built once for each set of axes.
+
+    Parameters
+    ----------
+    manipulator_axes : tuple of str
+        The names of the manipulator axes.
+
+    Returns
+    -------
+    pydantic.BaseModel
+        The manipulator metadata model class.
+    """
+    fields = {
+        axis: (Optional[AxisMetadataModelWithReference], None)
+        for axis in manipulator_axes
+    }
+    return create_model("ManipulatorMetadataModel", **fields)
+
+
 # Define the temperature metadata models
 class TemperatureMetadataModel(BaseMetadataModel):
     """Model to store temperature metadata."""
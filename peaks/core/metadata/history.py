@@ -1,6 +1,5 @@
 """Helper functions for acting on metadata."""
 
-import copy
 import inspect
 from datetime import datetime
 from pprint import pprint
@@ -97,13 +96,17 @@ def _update_hist(data, record_text, fn_name=None, update_in_place=True):
             return data
     """
     # Get current analysis history metadata list, creating if it doesn't exist
-    if "_analysis_history" not in data.attrs:
-        data.attrs["_analysis_history"] = AnalysisHistoryRecordCollection()
     analysis_history = data.attrs.get("_analysis_history")
-
-    # If updating in place, modify the existing history list, otherwise make a deep copy to avoid in-place modification
-    if not update_in_place:
-        analysis_history = copy.deepcopy(analysis_history)
+    if analysis_history is None:
+        analysis_history = AnalysisHistoryRecordCollection()
+        if update_in_place:
+            data.attrs["_analysis_history"] = analysis_history
+    elif not update_in_place:
+        # If not updating in place, copy the list of records to avoid in-place modification. Existing records are
+        # never modified, so can be shared between copies rather than deep copied.
+        analysis_history = analysis_history.model_copy(
+            update={"records": list(analysis_history.records)}
+        )
 
     # If not provided, try to automatically parse the function name of the caller
     if fn_name is None:
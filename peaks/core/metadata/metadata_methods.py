@@ -119,22 +119,27 @@ def display_metadata(da_or_model, palette=None, mode="HTML"):
         raise ValueError("mode must be 'HTML' or 'ANSI'.")
 
 
-def compare_metadata(da_or_model1, da_or_model2):
-    """Compare metadata between two DataArrays (or Pydantic metadata models)."""
-
-    def get_metadata(da_or_model):
-        try:
-            metadata = {
-                key.lstrip("_"): value.model_dump()
-                for key, value in da_or_model.attrs.items()
-                if key.startswith("_") and key not in ["_analysis_history"]
-            }
-        except AttributeError:
-            metadata = da_or_model.model_dump()
-        return metadata
+def _get_metadata_dict(da_or_model):
+    """Return the metadata of a DataArray (or Pydantic metadata model) as a dictionary. Dictionaries (e.g. the
+    output of a previous call) are returned unchanged."""
+    if isinstance(da_or_model, dict):
+        return da_or_model
+    try:
+        metadata = {
+            key.lstrip("_"): value.model_dump()
+            for key, value in da_or_model.attrs.items()
+            if key.startswith("_") and key not in ["_analysis_history"]
+        }
+    except AttributeError:
+        metadata = da_or_model.model_dump()
+    return metadata
 
-    metadata1 = get_metadata(da_or_model1)
-    metadata2 = get_metadata(da_or_model2)
+
+def compare_metadata(da_or_model1, da_or_model2):
+    """Compare metadata between two DataArrays (or Pydantic metadata models, or metadata dictionaries returned by
+    :func:`_get_metadata_dict`, to avoid re-serialising the metadata of a reference compared against many scans)."""
+    metadata1 = _get_metadata_dict(da_or_model1)
+    metadata2 = _get_metadata_dict(da_or_model2)
 
     # Helper function to unwrap 'value' keys in dictionaries
     def unwrap_value(val):
@@ -1,5 +1,7 @@
 """Classes to store peaks options."""
 
+import os
+
 from peaks.core.utils.misc import format_colored_dict
 
 
@@ -24,6 +26,10 @@ class FileIOOptions:
         # Define location
         pks.opts.FileIO.loc = 'Diamond I05-nano'
 
+        # Read metadata in a background thread, overlapping with the data read
+        # (useful for network filesystems)
+        pks.opts.FileIO.concurrent_metadata = True
+
         # Show file options
         pks.opts.FileIO
 
@@ -39,6 +45,7 @@ class FileIOOptions:
         self._ext = None
         self._loc = None
         self._lazy_size = 1000000000  # Default lazy load size
+        self._concurrent_metadata = False  # Read metadata in a thread alongside data
 
     @property
     def path(self):
@@ -129,24 +136,42 @@ class FileIOOptions:
     def lazy_size(self):
         self._lazy_size = 1000000000  # Reset to default
 
+    @property
+    def concurrent_metadata(self):
+        """Return whether file metadata are read in a thread concurrently with the data."""
+        return self._concurrent_metadata
+
+    @concurrent_metadata.setter
+    def concurrent_metadata(self, value):
+        if isinstance(value, bool):
+            self._concurrent_metadata = value
+        else:
+            raise TypeError("Concurrent metadata must be a boolean.")
+
+    @concurrent_metadata.deleter
+    def concurrent_metadata(self):
+        self._concurrent_metadata = False
+
     def reset(self):
-        """Reset the file path, extension, location, and lazy size."""
+        """Reset the file path, extension, location, lazy size and concurrent metadata options."""
         self._path = None
         self._ext = None
         self._loc = None
         self._lazy_size = 1000000000
+        self._concurrent_metadata = False
 
     def __repr__(self):
         """Return a string representation of the current file variables."""
         return format_colored_dict(self.dict())
 
     def set(self, **kwargs):
-        """Set the file path, extension, location, and lazy size.
+        """Set the file path, extension, location, lazy size and concurrent metadata options.
 
         Parameters
         ----------
         kwargs : dict
-            A dictionary of keyword arguments to set the file path, extension, location, and lazy size.
+            A dictionary of keyword arguments to set the file path, extension, location, lazy size and
+            concurrent metadata options.
         """
         if "path" in kwargs:
             self.path = kwargs.pop("path")
@@ -156,6 +181,8 @@ class FileIOOptions:
             self.loc = kwargs.pop("loc")
         if "lazy_size" in kwargs:
             self.lazy_size = kwargs.pop("lazy_size")
+        if "concurrent_metadata" in kwargs:
+            self.concurrent_metadata = kwargs.pop("concurrent_metadata")
 
         if kwargs:
             raise ValueError(
@@ -169,6 +196,136 @@ class FileIOOptions:
         return {k.lstrip("_"): raw_dict[k] for k in raw_dict}
 
 
+_DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "peaks")
+_DEFAULT_CACHE_MAX_SIZE = 10 * 2**30  # 10 GiB
+
+
+class CacheOptions:
+    """Class used to set options for the on-disk cache of the results of expensive processing functions.
+
+    When enabled, the results of functions decorated with :func:`peaks.core.utils.cache.peaks_cached` (e.g.
+    `k_convert`, `curvature` or `sym_nfold`) are stored as compressed Zarr files in the cache directory, keyed on a
+    hash of the input data, the function arguments and the `peaks` version. Calling the function again with the same
+    inputs (including after restarting the kernel) returns the stored result rather than recomputing it. The least
+    recently used results are removed once the total size of the cache exceeds ``max_size``.
+
+    Examples
+    --------
+    Example usage is as follows::
+
+        import peaks as pks
+
+        # Enable the cache
+        pks.opts.Cache.enabled = True
+
+        # Set the cache directory
+        pks.opts.Cache.path = '/scratch/peaks_cache'
+
+        # Set the maximum size of the cache to 50 GB
+        pks.opts.Cache.max_size = 50 * 2**30
+
+        # Show cache options
+        pks.opts.Cache
+
+        # Reset all Cache options
+        pks.opts.Cache.reset()
+    """
+
+    def __init__(self):
+        self._enabled = False
+        self._path = _DEFAULT_CACHE_PATH
+        self._max_size = _DEFAULT_CACHE_MAX_SIZE
+
+    @property
+    def enabled(self):
+        """Return whether the cache is enabled."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        if isinstance(value, bool):
+            self._enabled = value
+        else:
+            raise TypeError("Cache enabled must be a boolean.")
+
+    @enabled.deleter
+    def enabled(self):
+        self._enabled = False
+
+    @property
+    def path(self):
+        """Return the cache directory."""
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        if isinstance(value, (str, os.PathLike)):
+            self._path = os.fspath(value)
+        else:
+            raise TypeError(
+                "Cache path must be a string pointing to the cache directory."
+            )
+
+    @path.deleter
+    def path(self):
+        self._path = _DEFAULT_CACHE_PATH
+
+    @property
+    def max_size(self):
+        """Return the maximum total size of the cache (in bytes)."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(
+                "Cache max size must be an integer representing the maximum cache size (in bytes)."
+            )
+        elif value < 0:
+            raise ValueError("Cache max size must be greater than or equal to 0.")
+        self._max_size = value
+
+    @max_size.deleter
+    def max_size(self):
+        self._max_size = _DEFAULT_CACHE_MAX_SIZE
+
+    def reset(self):
+        """Reset the cache options to their defaults."""
+        self._enabled = False
+        self._path = _DEFAULT_CACHE_PATH
+        self._max_size = _DEFAULT_CACHE_MAX_SIZE
+
+    def __repr__(self):
+        """Return a string representation of the cache options."""
+        return format_colored_dict(self.dict())
+
+    def set(self, **kwargs):
+        """Set the cache enabled, path and max size options.
+
+        Parameters
+        ----------
+        kwargs : dict
+            A dictionary of keyword arguments to set the cache enabled, path and max size options.
+        """
+        if "enabled" in kwargs:
+            self.enabled = kwargs.pop("enabled")
+        if "path" in kwargs:
+            self.path = kwargs.pop("path")
+        if "max_size" in kwargs:
+            self.max_size = kwargs.pop("max_size")
+
+        if kwargs:
+            raise ValueError(
+                f"Invalid keyword argument(s): {set(kwargs.keys())}. "
+                f"Expected options from {set(self.dict().keys())}"
+            )
+
+    def dict(self):
+        """Return a dictionary representation of the cache options."""
+        raw_dict = vars(self)
+        return {k.lstrip("_"): raw_dict[k] for k in raw_dict}
+
+
 _DEFAULT_MAX_VIEWERS = 1
 
 
@@ -266,6 +423,9 @@ class Options:
     gui : GuiOptions
         Options controlling interactive display panels.
 
+    Cache : CacheOptions
+        Options controlling the on-disk cache of processing results.
+
     Methods
     -------
     reset()
@@ -292,6 +452,9 @@ class Options:
         # Reset display options
         pks.opts.gui.reset()  # Disables multiple panels by defualt
 
+        # Cache the results of expensive processing functions on disk
+        pks.opts.Cache.enabled = True
+
 
         # Display all the current options
         pks.opts
@@ -330,12 +493,14 @@ class Options:
             cls._instance = super(Options, cls).__new__(cls)
             cls._instance.FileIO = FileIOOptions()  # Initialize FileIO options
             cls._instance.gui = GuiOptions()  # Initialize GUI options
+            cls._instance.Cache = CacheOptions()  # Initialize cache options
         return cls._instance
 
     def reset(self):
         """Reset all option groups."""
         self.FileIO.reset()
         self.gui.reset()
+        self.Cache.reset()
 
     def dict(self):
         """Return a dictionary representation of the current options."""
@@ -1,11 +1,37 @@
 """Functions used for derivative operations on data."""
 
-import numpy as np
-from scipy.ndimage import gaussian_gradient_magnitude
+import copy
 
+import numpy as np
+import xarray as xr
+
+from peaks.core.utils.cache import peaks_cached
+from peaks.core.utils.derivatives import (
+    curvature_2d,
+    mixed_derivative,
+    second_derivative,
+)
+from peaks.core.utils.filters import gaussian_gradient_magnitude_nd
 from peaks.core.utils.misc import analysis_warning
 
 
+def _apply_derivative_kernel(data, func, core_dims, *args):
+    """Apply a compiled derivative function from :mod:`peaks.core.utils.derivatives` over the ``core_dims`` of
+    ``data``, batching over any other dimensions (chunk by chunk for dask arrays). The units of the data are retained.
+    """
+    coords = [data[dim].values for dim in core_dims]
+    result = xr.apply_ufunc(
+        lambda array: func(array, *coords, *args),
+        data.pint.dequantify(),
+        input_core_dims=[core_dims],
+        output_core_dims=[core_dims],
+        dask="parallelized",
+        output_dtypes=[np.float64],
+        dask_gufunc_kwargs={"allow_rechunk": True},
+    )
+    return result.transpose(*data.dims).pint.quantify(data.pint.units)
+
+
 def deriv(data, dims):
     """General function to perform differentiations along the specified dimensions of data.
 
@@ -58,7 +84,7 @@ def deriv(data, dims):
     # List to store analysis history
     hist_list = []
 
-    # Iterate through specified dimensions and perform differentiations
+    # Check the supplied dimensions are valid
     for dim in dims:
         if (
             dim not in deriv_data.dims
@@ -68,10 +94,29 @@ def deriv(data, dims):
                     dim=dim
                 )
             )
-        deriv_data = deriv_data.differentiate(dim)  # Perform differentiation
-        hist_list.append(
-            "Applied differentiation along {dim}".format(dim=dim)
-        )  # Update analysis history list
+
+    # Iterate through specified dimensions and perform differentiations. Consecutive pairs of differentiations along
+    # numeric coordinates are evaluated together in a single compiled pass
+    i = 0
+    while i < len(dims):
+        pair = dims[i : i + 2]
+        if len(pair) == 2 and all(
+            np.issubdtype(deriv_data[dim].dtype, np.number) for dim in pair
+        ):
+            if pair[0] == pair[1]:
+                deriv_data = _apply_derivative_kernel(
+                    deriv_data, second_derivative, [pair[0]]
+                )
+            else:
+                deriv_data = _apply_derivative_kernel(deriv_data, mixed_derivative, pair)
+        else:
+            pair = pair[:1]
+            deriv_data = deriv_data.differentiate(pair[0])  # Perform differentiation
+        for dim in pair:
+            hist_list.append(
+                "Applied differentiation along {dim}".format(dim=dim)
+            )  # Update analysis history list
+        i += len(pair)
 
     # Rewrite attributes
     deriv_data.attrs = attributes
@@ -261,8 +306,12 @@ def dkdE(data):
     return deriv_data
 
 
+@peaks_cached
 def curvature(data, **parameter_kwargs):
-    """Perform 2D curvature analysis of data (see Rev. Sci. Instrum.  82, 043712 (2011) for analysis procedure).
+    """Perform 2D curvature analysis of data (see Rev. Sci. Instrum.  82, 043712 (2011) for analysis procedure). The
+    derivatives and the curvature are evaluated in a single compiled pass, and data with more than two dimensions
+    (e.g. hv, spatial or time-resolved stacks of dispersions) are analysed slice by slice (chunk by chunk for lazily
+    loaded data).
 
     Parameters
     ----------
@@ -271,8 +320,9 @@ def curvature(data, **parameter_kwargs):
 
     **parameter_kwargs : float
         Curvature analysis free parameters in the format axis=value, e.g. theta_par=0.1. Free parameters must be defined
-        for both axes of the data. Set a given axis free parameter to 0 to obtain 1D curvature analysis for the other
-        axis.
+        for both axes of 2D data. For higher-dimensional data, free parameters should be defined for the two axes to
+        perform the curvature analysis along, with the analysis repeated over all other axes. Set a given axis free
+        parameter to 0 to obtain 1D curvature analysis for the other axis.
 
     Returns
     -------
@@ -294,48 +344,45 @@ def curvature(data, **parameter_kwargs):
         # theta_par and eV axes of 10 and 1
         disp_curv = disp.smooth(eV=0.03, theta_par=0.3).curvature(theta_par=10, eV=1)
 
+        # Perform curvature analysis on each dispersion of a spatial map
+        SM = load('SM.zip')
+        SM_curv = SM.curvature(theta_par=10, eV=1)
+
     """
-    # Check data is 2D
-    if len(data.dims) != 2:
+    # Check data is at least 2D
+    if len(data.dims) < 2:
         raise Exception("Function only acts on 2D data.")
 
-    # Check free parameters have been provided for both axes of the data
-    for dim in data.dims:
-        if (
-            dim not in parameter_kwargs
-        ):  # Raise error if a dimension of the data is not defined in parameter_kwargs
+    # Determine the axes to perform curvature analysis along
+    if len(data.dims) == 2:
+        # Check free parameters have been provided for both axes of the data
+        for dim in data.dims:
+            if (
+                dim not in parameter_kwargs
+            ):  # Raise error if a dimension of the data is not defined in parameter_kwargs
+                raise Exception(
+                    "Function requires free parameters to be defined for both axes of the data."
+                )
+        dims = list(data.dims)
+    else:
+        dims = [dim for dim in data.dims if dim in parameter_kwargs]
+        if len(dims) != 2:
             raise Exception(
-                "Function requires free parameters to be defined for both axes of the data."
+                "Function requires free parameters to be defined for exactly two axes of the data."
             )
 
-    # Copy the input xarray to prevent overwriting issues
-    curv_data = data.copy(deep=True)
-
-    # Save the attributes as these get killed by the curvature analysis summation
-    attributes = curv_data.attrs
+    # Save the attributes as these get killed by the curvature analysis
+    attributes = copy.deepcopy(data.attrs)
 
     # Determine relevant axes and get associated free parameters
-    dimx = curv_data.dims[0]
-    dimy = curv_data.dims[1]
+    dimx, dimy = dims
     Cx = parameter_kwargs[dimx]
     Cy = parameter_kwargs[dimy]
 
-    # Determine various derivatives used in curvature analysis (0 and 1 in following notation represent dimx and dimy)
-    dx = curv_data.deriv(dimx).pint.dequantify()  # d/dx
-    d2x = curv_data.deriv([dimx, dimx]).pint.dequantify()  # d^2/dx^2
-    dy = curv_data.deriv(dimy).pint.dequantify()  # d/dy
-    d2y = curv_data.deriv([dimy, dimy]).pint.dequantify()  # d^2/dy^2
-    dxdy = curv_data.deriv([dimx, dimy]).pint.dequantify()  # d^2/dxdy
-
-    # Perform 2D curvature analysis
-    curv_data = (
-        ((1 + (Cx * (dx**2))) * Cy * d2y)
-        - (2 * Cx * Cy * dx * dy * dxdy)
-        + ((1 + (Cy * (dy**2))) * Cx * d2x)
-    ) / ((1 + (Cx * (dx**2)) + (Cy * (dy**2))) ** 1.5)
-
-    # Restore units and rewrite attributes
-    curv_data = curv_data.pint.quantify(data.pint.units)
+    # Perform 2D curvature analysis, batching over any additional dimensions
+    curv_data = _apply_derivative_kernel(data, curvature_2d, dims, Cx, Cy)
+
+    # Rewrite attributes
     curv_data.attrs = attributes
 
     # Update analysis history
@@ -347,15 +394,23 @@ def curvature(data, **parameter_kwargs):
     return curv_data
 
 
-def min_gradient(data, **smoothing_kwargs):
+@peaks_cached
+def min_gradient(data, method="exact", **smoothing_kwargs):
     """Perform minimum gradient analysis of data, using Gaussian filtering (see Rev. Sci. Instrum 88 (2017) 073903 for
-    analysis procedure).
+    analysis procedure). Lazily loaded (dask) data are processed chunk by chunk, and large in-memory data are
+    processed in parallel chunks.
 
     Parameters
     ----------
     data : xarray.DataArray
         The data to perform minimum gradient analysis on.
 
+    method : str, optional
+        The Gaussian derivative filter to apply. Options are:
+        - 'exact' (default): convolution with the truncated Gaussian derivative kernels.
+        - 'iir': fast recursive approximation to the Gaussian smoothing, whose cost is independent of the FWHM,
+        followed by central differences (see :func:`peaks.core.utils.filters.gaussian_gradient_magnitude_nd`).
+
     **smoothing_kwargs : float
         Axes to smooth over in the format axis=FWHM, where FWHM is the relevant FWHM of the Gaussian for convolution
         in this direction, e.g. eV=0.1. Defaults to a single pixel. Note: The use of these broadening terms is
@@ -431,10 +486,10 @@ def min_gradient(data, **smoothing_kwargs):
             )  # Remove this axis from smoothing_kwargs for consistency check later
 
     # Extract the raw DataArray data
-    array = grad_data.data
+    array = grad_data.pint.magnitude
 
     # Apply gradient magnitude to raw DataArray data
-    array_sm = gaussian_gradient_magnitude(array, sigma)
+    array_sm = gaussian_gradient_magnitude_nd(array, sigma, method=method)
 
     # Extract the renormalised gradient modulus map
     grad_data /= array_sm
@@ -15,6 +15,7 @@ from peaks.core.process.fermi_level_correction import (
     _get_E_shift_at_theta_par,
     _get_wf,
 )
+from peaks.core.utils.cache import peaks_cached
 from peaks.core.utils.interpolation import (
     _fast_bilinear_interpolate,
     _fast_bilinear_interpolate_rectilinear,
@@ -709,6 +710,7 @@ def get_kz_cut(
 # --------------------------------------------------------- #
 
 
+@peaks_cached
 def k_convert(
     da,
     eV=None,
@@ -1,21 +1,24 @@
 """Functions that apply general operations on data."""
 
+import copy
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pint
 import pint_xarray
 import xarray as xr
-from IPython.display import clear_output
 from numpy.fft import fft2, fftshift, ifft2
-from scipy.ndimage import gaussian_filter
 from skimage.registration import phase_cross_correlation
 
 from peaks.core.fitting.models import _shirley_bg
-from peaks.core.metadata.metadata_methods import compare_metadata
+from peaks.core.metadata.metadata_methods import _get_metadata_dict, compare_metadata
 from peaks.core.process.fermi_level_correction import _flatten_EF
+from peaks.core.utils.cache import peaks_cached
 from peaks.core.utils.datatree_utils import get_list_of_DataArrays_from_DataTree
+from peaks.core.utils.filters import gaussian_filter_nd
 from peaks.core.utils.interpolation import (
-    _fast_bilinear_interpolate_rectilinear,
+    _apply_bilinear_plans,
+    _bilinear_rectilinear_plan,
     _fast_linear_interpolate,
     _fast_linear_interpolate_rectilinear,
     _is_linearly_spaced,
@@ -133,6 +136,7 @@ def bgs(
     offset_start=0,
     offset_end=0,
     max_iterations=10,
+    per_spectrum=False,
     **kwargs,
 ):
     """Function to subtract a background from data.
@@ -174,6 +178,11 @@ def bgs(
         Shirley background optimisation parameter. The maximum number of iterations to allow for convergence of Shirley
         background. Defaults to 10.
 
+    per_spectrum : bool, optional
+        Shirley background option. If True, a separate Shirley background is calculated for (and subtracted from)
+        every spectrum along the `eV` dimension of the data. If False, a single Shirley background is calculated from
+        the integrated DOS of the data and subtracted from all of the data. Defaults to False.
+
     **kwargs : slice, optional
         Slice to define background for subtraction by. E.g. eV=slice(105, 105.1) subtracts an integrated MDC defined
         by the eV slice given. Multiple slices can be defined to define a ROI to subtract the mean of.
@@ -212,6 +221,9 @@ def bgs(
         # and end points
         bgs_S2p_XPS = S2p_XPS.bgs('Shirley', num_avg=3)
 
+        # Subtract a separate Shirley background from each EDC of a dispersion
+        bgs_disp = disp.bgs('Shirley', per_spectrum=True)
+
     """
     # Check a subtraction argument has been inputted
     if not subtraction and not kwargs:
@@ -249,22 +261,39 @@ def bgs(
 
             # Calculate the Shirley background using the function _Shirley
             units = bgs_data.data.units
-            Shirley_bkg = _shirley_bg(
-                bgs_data.DOS().pint.dequantify(),  # Mean over all non-energy dimensions
-                num_avg=num_avg,
-                offset_start=offset_start,
-                offset_end=offset_end,
-                max_iterations=max_iterations,
-            )
-            Shirley_bkg = xr.DataArray(
-                Shirley_bkg, dims="eV", coords={"eV": bgs_data.coords["eV"]}
-            ).pint.quantify(units)
+            shirley_kwargs = {
+                "num_avg": num_avg,
+                "offset_start": offset_start,
+                "offset_end": offset_end,
+                "max_iterations": max_iterations,
+            }
+            if per_spectrum:
+                # Shirley background of every spectrum, calculated together along the eV dimension
+                Shirley_bkg = xr.apply_ufunc(
+                    _shirley_bg,
+                    bgs_data.pint.dequantify(),
+                    input_core_dims=[["eV"]],
+                    output_core_dims=[["eV"]],
+                    kwargs=shirley_kwargs,
+                    dask="parallelized",
+                    output_dtypes=[float],
+                ).pint.quantify(units)
+            else:
+                Shirley_bkg = _shirley_bg(
+                    bgs_data.DOS().pint.dequantify(),  # Mean over all non-energy dimensions
+                    **shirley_kwargs,
+                )
+                Shirley_bkg = xr.DataArray(
+                    Shirley_bkg, dims="eV", coords={"eV": bgs_data.coords["eV"]}
+                ).pint.quantify(units)
             # Subtract the Shirley background from the data
             bgs_data -= Shirley_bkg
 
             # Update analysis history
             bgs_data.history.add(
-                "A Shirley background has been subtracted from the data"
+                "A Shirley background has been subtracted from each spectrum of the data"
+                if per_spectrum
+                else "A Shirley background has been subtracted from the data"
             )
 
         # If subtraction is 'all'
@@ -456,14 +485,21 @@ def bin_spectra(data, binning=2, boundary="trim"):
     return binned_data
 
 
-def smooth(data, **smoothing_kwargs):
-    """Function to smooth data by applying a Gaussian smoothing operator.
+def smooth(data, method="exact", **smoothing_kwargs):
+    """Function to smooth data by applying a Gaussian smoothing operator. Lazily loaded (dask) data are smoothed
+    chunk by chunk, and large in-memory data are smoothed in parallel chunks.
 
     Parameters
     ----------
     data : xarray.DataArray
         The data to smooth.
 
+    method : str, optional
+        The Gaussian filter to apply. Options are:
+        - 'exact' (default): convolution with the truncated Gaussian kernel.
+        - 'iir': fast recursive approximation, whose cost is independent of the FWHM (see
+        :func:`peaks.core.utils.filters.gaussian_filter_nd`). Useful for heavy smoothing of large datasets.
+
     **smoothing_kwargs : pint.Quantity, float
         Axes to smooth over in the format axis=FWHM, where FWHM is the relevant FWHM of the Gaussian for convolution
         in this direction, e.g. eV=0.1*pks.ureg('eV'). If a float with no unit is passed, the FWHM is assumed to be in
@@ -490,6 +526,9 @@ def smooth(data, **smoothing_kwargs):
         # Smooth the EDC by a Gaussian filter with FWHM for the eV axis of 0.2 eV
         EDC1_smooth = EDC1.smooth(eV=0.1)
 
+        # Heavily smooth the dispersion with the fast recursive approximation to the Gaussian filter
+        disp_smooth = disp.smooth(theta_par=5, eV=1, method="iir")
+
     """
     # Check that some axes to smooth over were passed
     if len(smoothing_kwargs) == 0:
@@ -551,7 +590,7 @@ def smooth(data, **smoothing_kwargs):
     array = smoothed_data.data.magnitude
 
     # Apply gaussian convolution to raw DataArray data
-    array_sm = gaussian_filter(array, sigma)
+    array_sm = gaussian_filter_nd(array, sigma, method=method)
 
     # Update DataArray with smoothed data
     smoothed_data.data = array_sm
@@ -575,6 +614,145 @@ def smooth(data, **smoothing_kwargs):
     return smoothed_data
 
 
+def _rotate_point(dim0, dim1, cen, angle):
+    """Rotate a point around a centre while preserving xarray's (dim0, dim1) notation.
+
+    Parameters
+    ----------
+    dim0 : float or np.ndarray
+        The first coordinate (typically y-axis).
+
+    dim1 : float or np.ndarray
+        The second coordinate (typically x-axis).
+
+    cen : tuple
+        The centre of rotation as (dim0_centre, dim1_centre).
+
+    angle : float
+        The angle of rotation in degrees.
+
+    Returns
+    -------
+    new_dim0, new_dim1 : tuple
+        The rotated coordinates (dim0, dim1).
+    """
+    angle_r = np.radians(angle)
+    c = np.cos(angle_r)
+    s = np.sin(angle_r)
+
+    new_dim1 = (
+        cen[1]  # Center along dim1 (x-axis)
+        - (s * (dim0 - cen[0]))  # Y transformation
+        + (c * (dim1 - cen[1]))  # X transformation
+    )
+    new_dim0 = (
+        cen[0]  # Center along dim0 (y-axis)
+        + (c * (dim0 - cen[0]))  # Y transformation
+        + (s * (dim1 - cen[1]))  # X transformation
+    )
+
+    return new_dim0, new_dim1  # Keep (dim0, dim1) order
+
+
+def _rotated_coords(data, rot_dims, centres, rotation):
+    """Coordinates along ``rot_dims`` of the grid (with the original step sizes) containing all of ``data`` once
+    rotated by ``rotation`` degrees about ``centres``."""
+    # Calculate the new limits of the rotated data
+    dim0_range = np.array([data[rot_dims[0]].min(), data[rot_dims[0]].max()])
+    dim1_range = np.array([data[rot_dims[1]].min(), data[rot_dims[1]].max()])
+    corners = _rotate_point(dim0_range[None, :], dim1_range[:, None], centres, rotation)
+
+    # Define new coordinates for rotated data
+    new_coord0 = np.arange(
+        np.min(corners[0]),
+        np.max(corners[0]),
+        data[rot_dims[0]].data[1] - data[rot_dims[0]].data[0],
+    )
+    new_coord1 = np.arange(
+        np.min(corners[1]),
+        np.max(corners[1]),
+        data[rot_dims[1]].data[1] - data[rot_dims[1]].data[0],
+    )
+    return new_coord0, new_coord1
+
+
+def _interpolate_rotations(
+    data, rot_dims, centres, rotations, new_coord0, new_coord1, fillna=False
+):
+    """Interpolate ``data`` rotated by each of ``rotations`` (in degrees) about ``centres`` onto the grid
+    (``new_coord0``, ``new_coord1``) along ``rot_dims``, and sum the rotated data.
+
+    The gather indices and weights of the bilinear interpolation are computed once for each rotation and applied to
+    all slices along any other dimension (e.g. eV) in a single parallel pass (chunk by chunk for dask arrays). If
+    `fillna` is True, the mean of the rotations which contain data at each point is returned instead of the sum, with
+    NaNs only where none of the rotations contain data.
+    """
+    rot_dims = list(rot_dims)
+    units = data.pint.units
+    orig_coords_dim0 = data[rot_dims[0]].data.astype(np.float64)
+    orig_coords_dim1 = data[rot_dims[1]].data.astype(np.float64)
+
+    # Inverse transform to get the old co-ordinate values for the rotated data, and make the interpolation plans
+    plans = [
+        _bilinear_rectilinear_plan(
+            *_rotate_point(
+                new_coord0[:, None].astype(np.float64),
+                new_coord1[None, :].astype(np.float64),
+                centres,
+                -rotation,
+            ),
+            orig_coords_dim0,
+            orig_coords_dim1,
+        )
+        for rotation in rotations
+    ]
+    index, frac_dim0, frac_dim1 = (
+        np.stack([plan[i] for plan in plans]) for i in range(3)
+    )
+    offset_dim0, offset_dim1 = plans[0][3:]
+    new_shape = (len(new_coord0), len(new_coord1))
+
+    def _interpolate(values):
+        slices = np.ascontiguousarray(values, dtype=np.float64)
+        result, n_valid = _apply_bilinear_plans(
+            slices.reshape(-1, slices.shape[-2] * slices.shape[-1]),
+            index,
+            frac_dim0,
+            frac_dim1,
+            offset_dim0,
+            offset_dim1,
+            fillna,
+        )
+        if fillna:
+            with np.errstate(invalid="ignore"):
+                result /= n_valid  # NaN where there is no data
+        return result.reshape(*values.shape[:-2], *new_shape)
+
+    interpolated_data = (
+        xr.apply_ufunc(
+            _interpolate,
+            data.pint.dequantify(),
+            input_core_dims=[rot_dims],
+            output_core_dims=[rot_dims],
+            exclude_dims=set(rot_dims),
+            dask="parallelized",
+            output_dtypes=[np.float64],
+            dask_gufunc_kwargs={
+                "output_sizes": dict(zip(rot_dims, new_shape, strict=True))
+            },
+            keep_attrs=True,
+        )
+        .assign_coords(
+            {
+                rot_dims[0]: new_coord0,
+                rot_dims[1]: new_coord1,
+            }
+        )
+        .transpose(*data.dims)
+    )
+    return interpolated_data.pint.quantify(units)
+
+
 @dequantify_quantify_wrapper
 def rotate(data, rotation, **centre_kwargs):
     """Function to rotate 2D or 3D data around a given centre of rotation.
@@ -645,98 +823,14 @@ def rotate(data, rotation, **centre_kwargs):
 `dim0=value0, dim1=value1` where dim0 and dim1 are the names of the relevant dimension."
         )
 
-    # Prepare to interpolate data onto expanded coordinate grid determined by rotation
-    def _rot_point(dim0, dim1, cen, angle):
-        """Rotate a point around a centre while preserving xarray's (dim0, dim1) notation.
-
-        Parameters
-        ----------
-        dim0 : float or np.ndarray
-            The first coordinate (typically y-axis).
-
-        dim1 : float or np.ndarray
-            The second coordinate (typically x-axis).
-
-        cen : tuple
-            The centre of rotation as (dim0_centre, dim1_centre).
-
-        angle : float
-            The angle of rotation in degrees.
-
-        Returns
-        -------
-        new_dim0, new_dim1 : tuple
-            The rotated coordinates (dim0, dim1).
-        """
-        angle_r = np.radians(angle)
-        c = np.cos(angle_r)
-        s = np.sin(angle_r)
-
-        new_dim1 = (
-            cen[1]  # Center along dim1 (x-axis)
-            - (s * (dim0 - cen[0]))  # Y transformation
-            + (c * (dim1 - cen[1]))  # X transformation
-        )
-        new_dim0 = (
-            cen[0]  # Center along dim0 (y-axis)
-            + (c * (dim0 - cen[0]))  # Y transformation
-            + (s * (dim1 - cen[1]))  # X transformation
-        )
-
-        return new_dim0, new_dim1  # Keep (dim0, dim1) order
-
-    # Calculate the new limits of the rotated data
-    dim0_range = np.array([data[rot_dims[0]].min(), data[rot_dims[0]].max()])
-    dim1_range = np.array([data[rot_dims[1]].min(), data[rot_dims[1]].max()])
-    corners = _rot_point(dim0_range[None, :], dim1_range[:, None], centres, rotation)
-
-    # Define new coordinates for rotated data
-    new_coord0 = np.arange(
-        np.min(corners[0]),
-        np.max(corners[0]),
-        data[rot_dims[0]].data[1] - data[rot_dims[0]].data[0],
-    )
-    new_coord1 = np.arange(
-        np.min(corners[1]),
-        np.max(corners[1]),
-        data[rot_dims[1]].data[1] - data[rot_dims[1]].data[0],
-    )
+    # Define new coordinates for rotated data, expanded to contain all of the rotated data
+    new_coord0, new_coord1 = _rotated_coords(data, rot_dims, centres, rotation)
 
-    # Inverse transform to get the old co-ordinate values for the rotated data
-    new_dim0_vals, new_dim1_vals = _rot_point(
-        new_coord0[:, None], new_coord1[None, :], centres, -rotation
+    # Interpolate inputted data onto the expanded coordinate grid, all slices (e.g. along eV) at once
+    interpolated_data = _interpolate_rotations(
+        data, rot_dims, centres, [rotation], new_coord0, new_coord1
     )
 
-    # Interpolate inputted data onto the expanded coordinate grids
-    interpolated_data = (
-        xr.apply_ufunc(
-            _fast_bilinear_interpolate_rectilinear,
-            new_dim0_vals,
-            new_dim1_vals,
-            data.coords[rot_dims[0]],
-            data.coords[rot_dims[1]],
-            data,
-            input_core_dims=[
-                [rot_dims[0], rot_dims[1]],
-                [rot_dims[0], rot_dims[1]],
-                [rot_dims[0]],
-                [rot_dims[1]],
-                rot_dims,
-            ],
-            output_core_dims=[rot_dims],
-            vectorize=True,
-            exclude_dims=set(rot_dims),
-            dask="parallelized",
-            keep_attrs=True,
-        )
-        .assign_coords(
-            {
-                rot_dims[0]: new_coord0,
-                rot_dims[1]: new_coord1,
-            }
-        )
-        .transpose(*data.dims)
-    )
     # Ensure the name, units and attributes are retained
     interpolated_data.attrs = data.attrs.copy()
 
@@ -866,6 +960,7 @@ the coordinate range of the inputted DataArray"
     return sym_data
 
 
+@peaks_cached
 @dequantify_quantify_wrapper
 def sym_nfold(data, nfold, expand=True, fillna=True, **centre_kwargs):
     """Function to perform an n-fold symmetrisation of data around a centre coordinate.
@@ -945,106 +1040,49 @@ def sym_nfold(data, nfold, expand=True, fillna=True, **centre_kwargs):
 `dim0=value0, dim1=value1` where dim0 and dim1 are the names of the relevant dimension."
         )
 
-    # Get dimensions of inputted data
+    # Get dimensions of inputted data and the centre of rotation
     dim0 = rot_dims[0]
     dim1 = rot_dims[1]
+    centres = [centre_kwargs.get(dim, 0) for dim in rot_dims]
 
     # Determine the rotations that will be applied and summed to produce symmetrised data
     rotation_values = np.linspace(0, 360, nfold + 1)[0:-1]
 
-    # Define lists to store rotated data, and coordinate limits
-    rotated_data = []
-
-    # Copy the input data to prevent overwrite issues
-    data_to_be_symmetrised = data.copy(deep=True)
-
-    # Perform the required rotations, determine coordinate limits of each rotated data
-    for rotation in rotation_values:
-        rotated_data.append(data_to_be_symmetrised.rotate(rotation, **centre_kwargs))
-
     # Determine the coordinate limits desired for the data
     if expand:
-        dim0_min = np.min([np.min(data[dim0].data) for data in rotated_data])
-        dim0_max = np.max([np.max(data[dim0].data) for data in rotated_data])
-        dim1_min = np.min([np.min(data[dim1].data) for data in rotated_data])
-        dim1_max = np.max([np.max(data[dim1].data) for data in rotated_data])
+        rotated_coords = [
+            (data[dim0].data, data[dim1].data)
+            if rotation % 360 == 0
+            else _rotated_coords(data, rot_dims, centres, rotation)
+            for rotation in rotation_values
+        ]
+        dim0_min = np.min([np.min(coords[0]) for coords in rotated_coords])
+        dim0_max = np.max([np.max(coords[0]) for coords in rotated_coords])
+        dim1_min = np.min([np.min(coords[1]) for coords in rotated_coords])
+        dim1_max = np.max([np.max(coords[1]) for coords in rotated_coords])
         dim0_values = np.arange(
-            dim0_min,
-            dim0_max,
-            data_to_be_symmetrised[dim0].data[1] - data_to_be_symmetrised[dim0].data[0],
+            dim0_min, dim0_max, data[dim0].data[1] - data[dim0].data[0]
         )
         dim1_values = np.arange(
-            dim1_min,
-            dim1_max,
-            data_to_be_symmetrised[dim1].data[1] - data_to_be_symmetrised[dim1].data[0],
+            dim1_min, dim1_max, data[dim1].data[1] - data[dim1].data[0]
         )
     else:
-        dim0_values = data_to_be_symmetrised[dim0].data
-        dim1_values = data_to_be_symmetrised[dim1].data
-
-    # Define list to store interpolate rotated data
-    interp_rotated_data = []
-
-    # Interpolate rotated data onto extremal coordinate grid
-    for i, entry in enumerate(rotated_data):
-        entry = entry.pint.dequantify()
-        if i == 0 and not expand:  # No interp needed for the first array in this case
-            current_rotated_data = entry.pint.dequantify()
-        else:
-            current_rotated_data = (
-                xr.apply_ufunc(
-                    _fast_bilinear_interpolate_rectilinear,
-                    dim0_values[:, None] * np.ones_like(dim1_values),
-                    dim1_values[None, :] * np.ones_like(dim0_values)[:, None],
-                    entry[dim0].data,
-                    entry[dim1].data,
-                    entry,
-                    input_core_dims=[
-                        [dim0, dim1],
-                        [dim0, dim1],
-                        [dim0],
-                        [dim1],
-                        [dim0, dim1],
-                    ],
-                    output_core_dims=[[dim0, dim1]],
-                    vectorize=True,
-                    exclude_dims=set([dim0, dim1]),
-                    dask="parallelized",
-                    keep_attrs=True,
-                )
-                .assign_coords(
-                    {
-                        rot_dims[0]: dim0_values,
-                        rot_dims[1]: dim1_values,
-                    }
-                )
-                .transpose(*data.dims)
-            )
-
-        # If fillna=True, fill NaNs with 0 and make/update a  NaN_counter so that we can
-        # rescale the data accordingly later
-        if fillna:
-            current_rotated_data = current_rotated_data.fillna(0)
-            current_NaN_counter = (
-                current_rotated_data.pint.dequantify().where(
-                    current_rotated_data == 0, -1
-                )
-                + 1
-            )  # 1 where a nan has been filled, as 0 elsewhere
-            if i == 0:
-                NaN_counter = current_NaN_counter
-            else:
-                NaN_counter += current_NaN_counter
-
-        interp_rotated_data.append(current_rotated_data)
-
-    # Sum the rotated data to get the symmetrised data
-    sym_data = _sum_or_subtract_data(interp_rotated_data)
-
-    # Remove sum_data analysis_history entry, and clear warning
-    # (given during sum_data since analysis_history attrs will differ)
-    del sym_data._analysis_history.records[-1]
-    clear_output()
+        dim0_values = data[dim0].data
+        dim1_values = data[dim1].data
+
+    # Interpolate the data for all rotations onto the coordinate grid and sum them in a single pass. If fillna=True,
+    # regions without data for some of the rotations are scaled (averaging over the rotations which contain data) so
+    # that they are of consistent intensity
+    sym_data = _interpolate_rotations(
+        data,
+        rot_dims,
+        centres,
+        rotation_values,
+        dim0_values,
+        dim1_values,
+        fillna=fillna,
+    )
+    sym_data.attrs = copy.deepcopy(data.attrs)
 
     # Sort out naming and units
     sym_data.name = f"{data.name}-sym-{nfold}-fold"
@@ -1052,10 +1090,6 @@ def sym_nfold(data, nfold, expand=True, fillna=True, **centre_kwargs):
         if "units" in data.coords[dim].attrs:
             sym_data.coords[dim].attrs["units"] = data.coords[dim].attrs["units"]
 
-    # Rescale data according to the NaN_counter so regions are of consistent intensity
-    if fillna:
-        sym_data.data = (sym_data / (NaN_counter.max() - NaN_counter).data).data
-
     # Update analysis history
     sym_data.history.add(
         f"Symmetrised data using a {nfold}-fold rotation about centre \
@@ -1065,6 +1099,7 @@ def sym_nfold(data, nfold, expand=True, fillna=True, **centre_kwargs):
     return sym_data
 
 
+@peaks_cached
 @dequantify_quantify_wrapper
 def degrid(data, width=0.1, height=0.1, cutoff=4):
     """Function which removes a mesh grid from 2D data by filtering its fast Fourier transform (FFT).
@@ -1259,6 +1294,35 @@ def degrid(data, width=0.1, height=0.1, cutoff=4):
     return degrid_data
 
 
+def _linear_interpolation_plan(source, target):
+    """Indices and weights for linear interpolation from the coordinate ``source`` onto the coordinate ``target``,
+    with points outside of the range of ``source`` flagged (to be set to NaN, as for :meth:`xarray.DataArray.interp`).
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    order = np.argsort(source)
+    sorted_source = source[order]
+    upper = np.clip(
+        np.searchsorted(sorted_source, target, side="right"), 1, source.size - 1
+    )
+    lower = upper - 1
+    weight = (target - sorted_source[lower]) / (
+        sorted_source[upper] - sorted_source[lower]
+    )
+    outside = (target < sorted_source[0]) | (target > sorted_source[-1])
+    return order[lower], order[upper], weight, outside
+
+
+def _apply_interpolation_plan(values, axis, plan):
+    """Linearly interpolate ``values`` along ``axis`` using a plan from :func:`_linear_interpolation_plan`."""
+    lower, upper, weight, outside = plan
+    weight = np.expand_dims(weight, tuple(i for i in range(values.ndim) if i != axis))
+    result = np.take(values, lower, axis=axis) * (1 - weight)
+    result += np.take(values, upper, axis=axis) * weight
+    result[(slice(None),) * axis + (outside,)] = np.nan
+    return result
+
+
 def _sum_or_subtract_data(data, _sum=True, quiet=False):
     """Function to sum or subtract two or more DataArrays together, maintaining the metadata.
     If the metadata of the DataArrays differ, that of the first inputted DataArray will be used.
@@ -1296,21 +1360,19 @@ def _sum_or_subtract_data(data, _sum=True, quiet=False):
             "Data subtraction only accepts two DataArrays or a DataTree with two leaves."
         )
 
-    # Copy the first DataArray
-    data_0_data = data[0].copy(deep=True)
-
-    # Copy the attributes of the first DataArray
-    data_0_attrs = data_0_data.attrs.copy()
-
-    # Remove scan_name from the attributes, and assign scan name to data_0_name
+    # Reference (first) DataArray, onto whose coordinate grid all other DataArrays are interpolated
+    data_0_data = data[0]
     data_0_name = data_0_data.metadata.scan.name
+    units = data_0_data.pint.units
 
-    # Remove history from the attributes
-    data_history = []
-    data_history.append(data_0_attrs.pop("_analysis_history", "NONE"))
+    # Serialise the metadata of the reference DataArray once, for comparison with that of the other DataArrays
+    data_0_metadata = _get_metadata_dict(data_0_data)
 
-    # Variable used to use to store the summed DataArray data (will be updated with other DataArrays)
-    summed_data = data_0_data.copy(deep=True)
+    # Store analysis histories of the inputted DataArrays
+    data_history = [data_0_data.attrs.get("_analysis_history", "NONE")]
+
+    # Single float64 buffer used to accumulate the summed data, loading each DataArray in turn
+    summed_values = np.array(data_0_data.pint.magnitude, dtype=np.float64)
 
     # Variable used to use to store the summed DataArray name (will be updated with other DataArrays)
     summed_name = data_0_name
@@ -1320,37 +1382,73 @@ def _sum_or_subtract_data(data, _sum=True, quiet=False):
     attrs_warn_flag = False
     coords_warn_flag = False
 
+    # Interpolation plans, reused for DataArrays sharing a coordinate grid (e.g. repeated sweeps with the same offset)
+    interpolation_plans = {}
+
+    def dict_to_html_table(d):
+        html = """
+            <style>
+                table { border-collapse: collapse; }
+                td, th { padding: 2px 5px; margin: 0; border: 1px solid black; }
+            </style>
+            <table>
+            """
+        for key, value in d.items():
+            if isinstance(value, dict):
+                if (
+                    len(value) == 2
+                    and "value1" in value.keys()
+                    and "value2" in value.keys()
+                ):
+                    nested_items = list(value.items())
+                    nested_str = f"{nested_items[0][1]}&nbsp;&nbsp; || &nbsp;&nbsp;{nested_items[1][1]}"
+                    html += (
+                        f"<tr><td><strong>{key}</strong></td><td>{nested_str}</td></tr>"
+                    )
+                else:
+                    value = dict_to_html_table(value)
+                    html += f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
+            elif isinstance(value, pint.Quantity):
+                value = str(value)
+                html += f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
+            else:
+                html += f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
+        html += "</table>"
+        return html
+
     # Iterate through the rest of the inputted DataArrays and sum together
     for i in range(1, num_data):
         # Get current DataArray information
-        current_data = data[i].copy(deep=True)
+        current_data = data[i]
         current_name = current_data.metadata.scan.name
-
-        # Remove history from the current DataArray attributes
-        data_history.append(current_data.attrs.pop("_analysis_history", "NONE"))
+        data_history.append(current_data.attrs.get("_analysis_history", "NONE"))
 
         # Ensure that the dimensions of the current DataArray match those of the first DataArray, raise an error if not
         if current_data.dims != data_0_data.dims:
             raise Exception("Inputted DataArrays must have the same dimensions.")
 
+        # Load the data of the current DataArray, in the units of the first DataArray
+        current_values = current_data.data
+        if isinstance(current_values, pint.Quantity):
+            if units is not None:
+                current_values = current_values.to(units)
+            current_values = current_values.magnitude
+        current_values = np.asarray(current_values, dtype=np.float64)
+
         # Ensure that the coordinates of the current DataArray match those of the first DataArray. If not, interpolate
         # the current DataArray onto the coordinate grid of the first DataArray
-        for dim in current_data.dims:  # Loop through dimensions
+        for axis, dim in enumerate(current_data.dims):  # Loop through dimensions
+            source = current_data[dim].data
+            target = data_0_data[dim].data
             # Check if the coordinates of the current dimension do not match that of the first DataArray
-            if (len(current_data[dim]) != len(data_0_data[dim])) or not (
-                current_data[dim].data == data_0_data[dim].data
-            ).all():
+            if len(source) != len(target) or not (source == target).all():
                 # Interpolate the current DataArray onto the current dimension coordinate grid of the first DataArray
-                original_units = (
-                    current_data.data.units
-                    if hasattr(current_data.data, "units")
-                    else None
-                )  # Store units before interpolation
-                current_data = current_data.interp({dim: data_0_data[dim]})
-                if original_units is not None:
-                    current_data.data = (
-                        current_data.data * original_units
-                    )  # Restore units after interpolation
+                key = (dim, np.asarray(source).tobytes())
+                if key not in interpolation_plans:
+                    interpolation_plans[key] = _linear_interpolation_plan(source, target)
+                current_values = _apply_interpolation_plan(
+                    current_values, axis, interpolation_plans[key]
+                )
                 coords_warn_flag = True  # Update warning flag
                 # Display warning informing the user of the interpolation
                 warning_str = (
@@ -1363,40 +1461,9 @@ def _sum_or_subtract_data(data, _sum=True, quiet=False):
                 )
 
         # Determine any attributes (including nested attributes) of the current DataArray that do not match the first DataArray
-        mismatched_attrs = compare_metadata(data_0_data, current_data)
+        mismatched_attrs = compare_metadata(data_0_metadata, current_data)
         mismatched_attrs.pop("scan", None)  # Remove individual scan attributes
 
-        def dict_to_html_table(d):
-            html = """
-                <style>
-                    table { border-collapse: collapse; }
-                    td, th { padding: 2px 5px; margin: 0; border: 1px solid black; }
-                </style>
-                <table>
-                """
-            for key, value in d.items():
-                if isinstance(value, dict):
-                    if (
-                        len(value) == 2
-                        and "value1" in value.keys()
-                        and "value2" in value.keys()
-                    ):
-                        nested_items = list(value.items())
-                        nested_str = f"{nested_items[0][1]}&nbsp;&nbsp; || &nbsp;&nbsp;{nested_items[1][1]}"
-                        html += f"<tr><td><strong>{key}</strong></td><td>{nested_str}</td></tr>"
-                    else:
-                        value = dict_to_html_table(value)
-                        html += (
-                            f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
-                        )
-                elif isinstance(value, pint.Quantity):
-                    value = str(value)
-                    html += f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
-                else:
-                    html += f"<tr><td><strong>{key}</strong></td><td>{value}</td></tr>"
-            html += "</table>"
-            return html
-
         formated_mismatched_str = dict_to_html_table(mismatched_attrs)
 
         # If any attributes (except scan name) of the current DataArray do not match the first DataArray, display
@@ -1413,12 +1480,19 @@ def _sum_or_subtract_data(data, _sum=True, quiet=False):
 
         # Add the current DataArray to the running summed total
         if _sum:
-            summed_data += current_data.data
+            summed_values += current_values
             summed_name += " + {current_name}".format(current_name=current_name)
         else:
-            summed_data -= current_data.data
+            summed_values -= current_values
             summed_name += " - {current_name}".format(current_name=current_name)
 
+    # Build the summed DataArray on the coordinate grid and with a copy of the metadata of the first DataArray
+    summed_data = data_0_data.copy(
+        deep=False,
+        data=summed_values if units is None else ureg.Quantity(summed_values, units),
+    )
+    summed_data.attrs = copy.deepcopy(data_0_data.attrs)
+
     # Update summed data scan name
     summed_data.metadata.scan.set("name", summed_name, add_history=False)
     summed_data.name = summed_name
@@ -1444,7 +1518,7 @@ def _sum_or_subtract_data(data, _sum=True, quiet=False):
     total_hist = {"record": hist_str}
     for i in range(len(data_history)):
         total_hist[f"original scan {i} analysis history"] = data_history[i]
-    summed_data = summed_data.history.assign(total_hist)
+    summed_data.history.add(total_hist)
 
     return summed_data
 
@@ -1454,6 +1528,8 @@ def sum_data(data, quiet=False):
     If the metadata of the DataArrays differ, that of the first inputted DataArray will be used.
     If the coordinate grids of the DataArrays differ, all DataArrays will be interpolated onto the
     coordinate grid of the first inputted DataArray.
+    The DataArrays are loaded and accumulated one at a time into a single buffer, so lazily loaded scans are summed
+    with the memory footprint of a single scan.
 
     Parameters
     ----------
@@ -1612,7 +1688,8 @@ def merge_data(data, dim="theta_par", sel=None, offsets=None, hv_match_rounding=
     data_history = []
     for item in data:
         if isinstance(item, xr.core.dataarray.DataArray):
-            data_to_merge.append(item.copy(deep=True).sel({dim: sel}))
+            # Selection returns a new DataArray, so the input data are not modified (and need not be copied)
+            data_to_merge.append(item.sel({dim: sel}))
             if "_analysis_history" in item.attrs:
                 data_history.append(item.attrs["_analysis_history"])
             else:
@@ -1749,10 +1826,6 @@ def _merge_two_DataArrays(DataArray1, DataArray2, dim):
             "{dim} is not a valid dimension of the inputted data.".format(dim=dim)
         )
 
-    # Copy the input data to prevent overwriting issues
-    DataArray1 = DataArray1.copy(deep=True)
-    DataArray2 = DataArray2.copy(deep=True)
-
     # Determine overlap region of the two DataArrays
     overlap_limits = (
         DataArray2.coords[dim].data.min(),
@@ -1768,7 +1841,7 @@ def _merge_two_DataArrays(DataArray1, DataArray2, dim):
     coord_num_points = int((coord_limits[1] - coord_limits[0]) / coord_step)
     coord_values = np.linspace(coord_limits[0], coord_limits[1], coord_num_points)
 
-    # Interpolate DataArrays onto new coordinate grid
+    # Interpolate DataArrays onto new coordinate grid (returning new DataArrays, so the inputs are not modified)
     DataArray1 = DataArray1.interp({dim: coord_values}).fillna(0)
     DataArray2 = DataArray2.interp({dim: coord_values}).fillna(0)
 
@@ -1782,12 +1855,12 @@ def _merge_two_DataArrays(DataArray1, DataArray2, dim):
     # Determine the total counts within the overlap region of the two DataArrays
     DataArray1_overlap_intensity = float(
         DataArray1.isel(
-            theta_par=slice(overlap_limits_indexes[0], overlap_limits_indexes[1])
+            {dim: slice(overlap_limits_indexes[0], overlap_limits_indexes[1])}
         ).sum()
     )
     DataArray2_overlap_intensity = float(
         DataArray2.isel(
-            theta_par=slice(overlap_limits_indexes[0], overlap_limits_indexes[1])
+            {dim: slice(overlap_limits_indexes[0], overlap_limits_indexes[1])}
         ).sum()
     )
 
@@ -0,0 +1,274 @@
+"""On-disk cache of the results of expensive processing functions."""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+
+import dask.array as da
+import numpy as np
+import pint
+import pint_xarray  # noqa: F401
+import xarray as xr
+
+from peaks import __version__
+from peaks.core.options import opts
+from peaks.core.utils.misc import analysis_warning
+
+
+def peaks_cached(func):
+    """Decorator to cache the results of a processing function on disk.
+
+    When the cache is enabled (``pks.opts.Cache.enabled = True``), the result of calling the decorated function on
+    an :class:`xarray.DataArray` is stored as a compressed Zarr file in the cache directory (``pks.opts.Cache.path``),
+    keyed on a hash of the input data (including its co-ordinates and metadata), the function arguments and the
+    `peaks` version. Later calls with the same inputs (including after restarting the kernel) return the stored
+    result instead of re-running the function. The least recently used results are removed once the total size of
+    the cache exceeds ``pks.opts.Cache.max_size``.
+
+    Lazily-loaded (dask) input data are keyed on the name of their dask graph (which identifies the source data and
+    all operations applied to them) and metadata, rather than on the data values. The :mod:`peaks` loaders name
+    lazily-loaded arrays from the path, size and modification time of the file, so that these keys are reproducible
+    across sessions. Calls are not cached if any argument cannot be hashed (e.g. a function or a fit model), or if
+    the function does not return an :class:`xarray.DataArray`.
+
+    Parameters
+    ----------
+    func : callable
+        The function to cache. The first argument should be the :class:`xarray.DataArray` to act on, and the
+        function should not have side effects (e.g. plotting) that are required on every call.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+
+    Examples
+    --------
+    Example usage is as follows::
+
+        import peaks as pks
+        from peaks.core.utils.cache import peaks_cached
+
+        pks.opts.Cache.enabled = True
+
+        @peaks_cached
+        def my_slow_function(data, width=1):
+            ...
+
+        # Computed on the first call, and read from the cache on subsequent calls
+        result = my_slow_function(data, width=2)
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(data, *args, **kwargs):
+        if not opts.Cache.enabled or not isinstance(data, xr.DataArray):
+            return func(data, *args, **kwargs)
+
+        key = _cache_key(func, signature, data, args, kwargs)
+        if key is not None:
+            result = _cache_load(key)
+            if result is not None:
+                return result
+
+        result = func(data, *args, **kwargs)
+        if key is not None and isinstance(result, xr.DataArray):
+            _cache_store(key, result)
+        return result
+
+    return wrapper
+
+
+def clear_cache():
+    """Remove all stored results from the on-disk cache."""
+    for entry in _cache_entries():
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _cache_key(func, signature, data, args, kwargs):
+    """Return the cache key for a function call, or `None` if the arguments cannot be hashed."""
+    try:
+        bound_args = signature.bind(data, *args, **kwargs)
+    except TypeError:
+        return None  # Let the function raise the error itself
+    bound_args.apply_defaults()
+
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{__version__}|{func.__module__}.{func.__qualname__}".encode())
+    try:
+        _hash_update(h, bound_args.arguments)
+    except TypeError:
+        return None
+    return h.hexdigest()
+
+
+def _hash_update(h, obj):
+    """Update the hash ``h`` with the contents of ``obj``.
+
+    Raises
+    ------
+    TypeError : If ``obj`` (or one of its contents) cannot be hashed.
+    """
+    if isinstance(obj, xr.DataArray):
+        _hash_dataarray(h, obj)
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise TypeError("Cannot hash an object array.")
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj))
+    elif isinstance(obj, pint.Quantity):
+        h.update(str(obj.units).encode())
+        _hash_update(h, obj.magnitude)
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj, key=str):
+            h.update(repr(key).encode())
+            _hash_update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            _hash_update(h, item)
+    elif obj is None or isinstance(
+        obj, (str, bool, int, float, complex, slice, np.generic)
+    ):
+        h.update(repr(obj).encode())
+    else:
+        raise TypeError(f"Cannot hash object of type {type(obj)}.")
+
+
+def _hash_attrs(h, attrs):
+    """Update the hash ``h`` with the contents of a metadata attributes dictionary."""
+    for name in sorted(attrs, key=str):
+        attr = attrs[name]
+        h.update(repr(name).encode())
+        if name == "_analysis_history":
+            # Hash the analysis history without the times of the records, so that re-running an analysis gives the
+            # same key
+            for record in attr.records:
+                h.update(
+                    json.dumps([record.record, record.fn_name], default=str).encode()
+                )
+        elif hasattr(attr, "model_dump_json"):
+            h.update(attr.model_dump_json().encode())
+        else:
+            _hash_update(h, attr)
+
+
+def _hash_dataarray(h, data):
+    """Update the hash ``h`` with the data, co-ordinates and metadata of an :class:`xarray.DataArray`."""
+    h.update(repr((data.name, data.dims)).encode())
+    for name in sorted(data.coords, key=str):
+        coord = data.coords[name]
+        h.update(repr((name, coord.dims)).encode())
+        _hash_update(h, coord.values)
+        _hash_attrs(h, coord.attrs)
+    _hash_attrs(h, data.attrs)
+
+    values = data.data
+    if isinstance(values, pint.Quantity):
+        h.update(str(values.units).encode())
+        values = values.magnitude
+    if isinstance(values, da.Array):
+        # Avoid computing lazy data: hash the name of its dask graph instead, which is a deterministic token of the
+        # source data and every operation applied to them (so e.g. `data + 5` does not share the key of `data`)
+        h.update(repr((values.name, values.shape, values.dtype.str)).encode())
+    else:
+        _hash_update(h, np.asarray(values))
+
+
+def _cache_entry_path(key):
+    """Return the path of the cache entry for ``key``."""
+    return os.path.join(opts.Cache.path, f"{key}.zarr")
+
+
+def _cache_entries():
+    """Return the entries currently stored in the cache directory."""
+    if not os.path.isdir(opts.Cache.path):
+        return []
+    return [
+        entry
+        for entry in os.scandir(opts.Cache.path)
+        if entry.is_dir()
+        and entry.name.endswith(".zarr")
+        and not entry.name.startswith(".")
+    ]
+
+
+def _cache_load(key):
+    """Load a result from the cache, returning `None` if it is not stored."""
+    from peaks.core.fileIO.loaders.netcdf import NetCDFLoader
+
+    fpath = _cache_entry_path(key)
+    if not os.path.isdir(fpath):
+        return None
+    try:
+        with xr.open_dataarray(fpath, engine="zarr", consolidated=False) as stored:
+            result = stored.load().drop_encoding()
+    except (OSError, ValueError, KeyError):
+        # Incomplete or corrupted entry - remove it and recompute
+        shutil.rmtree(fpath, ignore_errors=True)
+        return None
+
+    # Parse the metadata and quantify the data, as for re-loading saved data
+    NetCDFLoader._parse_metadata(result)
+    try:
+        result = result.pint.quantify()
+    except AttributeError:
+        pass
+
+    # Mark the entry as recently used
+    os.utime(fpath)
+    return result
+
+
+def _cache_store(key, result):
+    """Store a result in the cache, removing the least recently used entries if the cache is too large."""
+    from peaks.core.fileIO.data_saving import _serialise_attrs, _zarr_compressors
+
+    # Serialise the metadata on a shallow copy, leaving the result untouched
+    to_store = result.copy(deep=False).drop_encoding()
+    to_store.attrs = _serialise_attrs(to_store.attrs)
+    to_store = to_store.pint.dequantify()
+    to_store.encoding["compressors"] = _zarr_compressors()
+
+    # Write to a temporary location first, so that an entry is only ever complete
+    fpath = _cache_entry_path(key)
+    tmp_fpath = os.path.join(opts.Cache.path, f".{key}.{uuid.uuid4().hex}.zarr")
+    try:
+        os.makedirs(opts.Cache.path, exist_ok=True)
+        to_store.to_zarr(tmp_fpath, mode="w", consolidated=False)
+        os.replace(tmp_fpath, fpath)
+    except (OSError, TypeError, ValueError) as e:
+        shutil.rmtree(tmp_fpath, ignore_errors=True)
+        if not os.path.isdir(fpath):  # Not just stored by a concurrent call
+            analysis_warning(
+                f"Unable to store result in the cache: {e}",
+                title="Cache info",
+                warn_type="warning",
+            )
+        return
+
+    _evict_cache()
+
+
+def _evict_cache():
+    """Remove the least recently used entries until the cache is within its maximum size."""
+    entries = []
+    for entry in _cache_entries():
+        size = sum(
+            os.path.getsize(os.path.join(root, file))
+            for root, _, files in os.walk(entry.path)
+            for file in files
+        )
+        entries.append((entry.stat().st_mtime, size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, fpath in sorted(entries):
+        if total_size <= opts.Cache.max_size:
+            break
+        shutil.rmtree(fpath, ignore_errors=True)
+        total_size -= size
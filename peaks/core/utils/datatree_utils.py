@@ -1,5 +1,6 @@
 import functools
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import xarray as xr
 from termcolor import colored
@@ -329,3 +330,32 @@ def _map_over_dt_containing_single_das(data_tree, func, *args, **kwargs):
             return node
 
     return data_tree.map_over_datasets(map_over_ds)
+
+
+def _map_over_datasets_concurrently(data_tree, func, max_workers=None):
+    """Applies a function to the :class:`xarray.Dataset` of each node in a DataTree, processing the nodes
+    concurrently in a thread pool. Equivalent to :meth:`xarray.DataTree.map_over_datasets` for a single tree
+    and a single return value, but suited to I/O-bound functions (e.g. reading or writing data).
+
+    Parameters
+    ----------
+    data_tree : xarray.DataTree
+        The DataTree to apply the function to.
+    func : callable
+        The function to apply to the :class:`xarray.Dataset` of each node. Should return an
+        :class:`xarray.Dataset` (or `None`), and must be safe to call from multiple threads.
+    max_workers : int, optional
+        The maximum number of threads to use. Defaults to `None`, using the
+        :class:`concurrent.futures.ThreadPoolExecutor` default.
+
+    Returns
+    -------
+    xarray.DataTree
+        The DataTree with the function applied to each node.
+    """
+    paths, nodes = zip(*data_tree.subtree_with_keys, strict=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        datasets = executor.map(lambda node: func(node.dataset), nodes)
+        return xr.DataTree.from_dict(
+            dict(zip(paths, datasets, strict=True)), name=data_tree.name
+        )
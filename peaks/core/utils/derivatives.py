@@ -0,0 +1,182 @@
+"""Compiled finite-difference derivatives and 2D curvature, evaluated in a single parallel pass over N-D arrays."""
+
+import numpy as np
+from numba import njit, prange
+
+PARALLEL_MODE = True
+
+
+def _gradient_weights(coord):
+    """Weights of the three-point stencil equivalent to :func:`numpy.gradient` (with the default first-order edges)
+    for the coordinate ``coord``, returned as an array (3, N) of the weights of the previous, current and next points.
+    """
+    coord = np.asarray(coord, dtype=np.float64)
+    if coord.size < 2:
+        raise ValueError(
+            "Shape of array too small to calculate a numerical gradient, at least 2 elements are required."
+        )
+    weights = np.zeros((3, coord.size))
+    hs = np.diff(coord)[:-1]  # Spacing to the previous point
+    hd = np.diff(coord)[1:]  # Spacing to the next point
+    weights[0, 1:-1] = -hd / (hs * (hs + hd))
+    weights[1, 1:-1] = (hd - hs) / (hs * hd)
+    weights[2, 1:-1] = hs / (hd * (hs + hd))
+    weights[1, 0] = -1 / (coord[1] - coord[0])
+    weights[2, 0] = -weights[1, 0]
+    weights[0, -1] = -1 / (coord[-1] - coord[-2])
+    weights[1, -1] = -weights[0, -1]
+    return weights
+
+
+@njit(cache=True)
+def _row_derivative(f, i, w):
+    """Derivative along the first axis of the 2D array ``f`` at row ``i``, using stencil weights ``w``."""
+    n = f.shape[0]
+    previous = f[max(i - 1, 0)]
+    following = f[min(i + 1, n - 1)]
+    return w[0, i] * previous + w[1, i] * f[i] + w[2, i] * following
+
+
+@njit(cache=True)
+def _line_derivative(f, w, out):
+    """Derivative of the 1D array ``f`` using stencil weights ``w``, written into ``out``."""
+    n = f.size
+    for j in range(n):
+        out[j] = (
+            w[0, j] * f[max(j - 1, 0)] + w[1, j] * f[j] + w[2, j] * f[min(j + 1, n - 1)]
+        )
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _second_derivative_lines(lines, w):
+    """Repeated first derivative along each row of ``lines`` (N, M)."""
+    n_lines, n_points = lines.shape
+    result = np.empty_like(lines)
+    for i in prange(n_lines):
+        first = np.empty(n_points)
+        _line_derivative(lines[i], w, first)
+        _line_derivative(first, w, result[i])
+    return result
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _mixed_derivative_slices(slices, wx, wy):
+    """Derivative along the second then third axes of ``slices`` (N, X, Y)."""
+    n_slices, nx, ny = slices.shape
+    result = np.empty_like(slices)
+    for n in prange(n_slices * nx):
+        b = n // nx
+        i = n % nx
+        _line_derivative(_row_derivative(slices[b], i, wx), wy, result[b, i])
+    return result
+
+
+@njit(parallel=PARALLEL_MODE, cache=True)
+def _curvature_slices(slices, wx, wy, Cx, Cy):
+    """2D curvature of each slice of ``slices`` (N, X, Y), building the derivatives required for each row in place."""
+    n_slices, nx, ny = slices.shape
+    result = np.empty_like(slices)
+    for n in prange(n_slices * nx):
+        b = n // nx
+        i = n % nx
+        f = slices[b]
+
+        # First derivatives along x of the neighbouring rows, required for the second derivative along x
+        dx = _row_derivative(f, i, wx)
+        dx_previous = _row_derivative(f, max(i - 1, 0), wx)
+        dx_next = _row_derivative(f, min(i + 1, nx - 1), wx)
+        d2x = wx[0, i] * dx_previous + wx[1, i] * dx + wx[2, i] * dx_next
+
+        # Derivatives along y of the current row
+        dy = np.empty(ny)
+        d2y = np.empty(ny)
+        dxdy = np.empty(ny)
+        _line_derivative(f[i], wy, dy)
+        _line_derivative(dy, wy, d2y)
+        _line_derivative(dx, wy, dxdy)
+
+        for j in range(ny):
+            dx2 = Cx * dx[j] ** 2
+            dy2 = Cy * dy[j] ** 2
+            result[b, i, j] = (
+                (1 + dx2) * Cy * d2y[j]
+                - 2 * Cx * Cy * dx[j] * dy[j] * dxdy[j]
+                + (1 + dy2) * Cx * d2x[j]
+            ) / (1 + dx2 + dy2) ** 1.5
+    return result
+
+
+def second_derivative(array, coord):
+    """Second derivative along the last axis of ``array``, equivalent to applying :func:`numpy.gradient` twice, but
+    evaluated in a single parallel pass.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The data to differentiate.
+    coord : numpy.ndarray
+        The coordinate of the last axis of `array`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The second derivative.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    lines = np.ascontiguousarray(array).reshape(-1, array.shape[-1])
+    return _second_derivative_lines(lines, _gradient_weights(coord)).reshape(array.shape)
+
+
+def mixed_derivative(array, x, y):
+    """Mixed derivative along the last two axes of ``array``, equivalent to applying :func:`numpy.gradient` along
+    each axis in turn, but evaluated in a single parallel pass.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The data to differentiate.
+    x : numpy.ndarray
+        The coordinate of the second-to-last axis of `array`.
+    y : numpy.ndarray
+        The coordinate of the last axis of `array`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The mixed derivative.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    slices = np.ascontiguousarray(array).reshape(-1, *array.shape[-2:])
+    return _mixed_derivative_slices(
+        slices, _gradient_weights(x), _gradient_weights(y)
+    ).reshape(array.shape)
+
+
+def curvature_2d(array, x, y, Cx, Cy):
+    """2D curvature (see Rev. Sci. Instrum. 82, 043712 (2011)) over the last two axes of ``array``, batched over any
+    leading axes. The first and second derivatives are those of :func:`numpy.gradient`, but are evaluated row by row
+    within a single parallel pass, without allocating full-size intermediate arrays.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The data to perform curvature analysis on.
+    x : numpy.ndarray
+        The coordinate of the second-to-last axis of `array`.
+    y : numpy.ndarray
+        The coordinate of the last axis of `array`.
+    Cx : float
+        The free parameter for the second-to-last axis.
+    Cy : float
+        The free parameter for the last axis.
+
+    Returns
+    -------
+    numpy.ndarray
+        The curvature.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    slices = np.ascontiguousarray(array).reshape(-1, *array.shape[-2:])
+    return _curvature_slices(
+        slices, _gradient_weights(x), _gradient_weights(y), float(Cx), float(Cy)
+    ).reshape(array.shape)
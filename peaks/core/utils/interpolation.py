@@ -592,3 +592,162 @@ def _fast_trilinear_interpolate_rectilinear(
         ) / ((x2 - x1) * (y2 - y1) * (z2 - z1))
 
     return result.reshape(desired_shape)
+
+
+@njit(parallel=PARALLEL_MODE)
+def _bilinear_rectilinear_plan(
+    desired_pos_dim0,
+    desired_pos_dim1,
+    orig_coords_dim0,
+    orig_coords_dim1,
+):
+    """
+    Precompute the gather indices and weights for bilinear interpolation on a rectilinear 2D grid, as in
+    :func:`_fast_bilinear_interpolate_rectilinear`, so that they can be reused for many slices of data on the same grid.
+    Positions outside of the grid are flagged rather than extrapolated.
+
+    Parameters
+    ----------
+    desired_pos_dim0 : np.ndarray
+        The desired positions along the first dimension.
+    desired_pos_dim1 : np.ndarray
+        The desired positions along the second dimension.
+        Should have the same shape as `desired_pos_dim0`.
+    orig_coords_dim0 : np.ndarray
+        The original coordinates along the first dimension.
+        These must be linearly spaced.
+    orig_coords_dim1 : np.ndarray
+        The original coordinates along the second dimension.
+        These must be linearly spaced.
+
+    Returns
+    -------
+    index : np.ndarray
+        The index (into the flattened original grid) of the lower corner of the grid cell containing each desired
+        position, or -1 for positions outside of the grid.
+    frac_dim0 : np.ndarray
+        The fractional position within the grid cell along the first dimension.
+    frac_dim1 : np.ndarray
+        The fractional position within the grid cell along the second dimension.
+    offset_dim0 : int
+        The offset in the flattened original grid to the upper corner of the cell along the first dimension.
+    offset_dim1 : int
+        The offset in the flattened original grid to the upper corner of the cell along the second dimension.
+    """
+    n0 = len(orig_coords_dim0)
+    n1 = len(orig_coords_dim1)
+
+    # Work in terms of increasing coordinates, mapping indices back to the original order
+    flip_dim0 = orig_coords_dim0[0] > orig_coords_dim0[-1]
+    flip_dim1 = orig_coords_dim1[0] > orig_coords_dim1[-1]
+    start_dim0 = min(orig_coords_dim0[0], orig_coords_dim0[-1])
+    start_dim1 = min(orig_coords_dim1[0], orig_coords_dim1[-1])
+    step_dim0 = abs(orig_coords_dim0[-1] - orig_coords_dim0[0]) / (n0 - 1)
+    step_dim1 = abs(orig_coords_dim1[-1] - orig_coords_dim1[0]) / (n1 - 1)
+
+    desired_pos_dim0 = desired_pos_dim0.flatten()
+    desired_pos_dim1 = desired_pos_dim1.flatten()
+    n_points = desired_pos_dim0.size
+    index = np.empty(n_points, dtype=np.int64)
+    frac_dim0 = np.zeros(n_points)
+    frac_dim1 = np.zeros(n_points)
+
+    for idx in prange(n_points):
+        t0 = (desired_pos_dim0[idx] - start_dim0) / step_dim0
+        t1 = (desired_pos_dim1[idx] - start_dim1) / step_dim1
+
+        # Positions on the edges of the grid (to within rounding errors) are interpolated from the edge grid cells
+        if -1e-9 < t0 < 0:
+            t0 = 0.0
+        if -1e-9 < t1 < 0:
+            t1 = 0.0
+        if n0 - 1 < t0 < n0 - 1 + 1e-9:
+            t0 = n0 - 1.0
+        if n1 - 1 < t1 < n1 - 1 + 1e-9:
+            t1 = n1 - 1.0
+
+        # Positions outside of the grid (or NaN) are flagged
+        if not (0 <= t0 <= n0 - 1 and 0 <= t1 <= n1 - 1):
+            index[idx] = -1
+            continue
+        x1_idx = min(int(t0), n0 - 2)
+        y1_idx = min(int(t1), n1 - 2)
+
+        frac_dim0[idx] = t0 - x1_idx
+        frac_dim1[idx] = t1 - y1_idx
+        if flip_dim0:
+            x1_idx = n0 - 1 - x1_idx
+        if flip_dim1:
+            y1_idx = n1 - 1 - y1_idx
+        index[idx] = x1_idx * n1 + y1_idx
+
+    offset_dim0 = -n1 if flip_dim0 else n1
+    offset_dim1 = -1 if flip_dim1 else 1
+    return index, frac_dim0, frac_dim1, offset_dim0, offset_dim1
+
+
+@njit(parallel=PARALLEL_MODE)
+def _apply_bilinear_plans(
+    orig_values, index, frac_dim0, frac_dim1, offset_dim0, offset_dim1, skip_nan
+):
+    """
+    Bilinearly interpolate many 2D slices of data using one or more precomputed plans (from
+    :func:`_bilinear_rectilinear_plan`), summing the interpolated values over the plans in a single parallel pass.
+
+    Parameters
+    ----------
+    orig_values : np.ndarray
+        The values at the original grid points, as an array (N, M) of N flattened 2D slices.
+    index : np.ndarray
+        The gather indices of each plan, as an array (R, P) for R plans of P desired positions.
+    frac_dim0 : np.ndarray
+        The fractional positions along the first dimension of each plan, as an array (R, P).
+    frac_dim1 : np.ndarray
+        The fractional positions along the second dimension of each plan, as an array (R, P).
+    offset_dim0 : int
+        The offset to the upper corner of the grid cell along the first dimension.
+    offset_dim1 : int
+        The offset to the upper corner of the grid cell along the second dimension.
+    skip_nan : bool
+        Whether to skip contributions which are NaN (or outside of the grid) from the sum. Otherwise, these make the
+        sum NaN.
+
+    Returns
+    -------
+    result : np.ndarray
+        The sum of the interpolated values over the plans, as an array (N, P).
+    n_valid : np.ndarray
+        The number of plans contributing a valid (non-NaN) value to each point, as an array (N, P).
+    """
+    n_slices = orig_values.shape[0]
+    n_plans, n_points = index.shape
+    result = np.empty((n_slices, n_points))
+    n_valid = np.zeros((n_slices, n_points), dtype=np.int64)
+
+    for n in prange(n_slices * n_points):
+        slice_idx = n // n_points
+        idx = n % n_points
+        values = orig_values[slice_idx]
+        total = 0.0
+        for plan in range(n_plans):
+            i = index[plan, idx]
+            if i < 0:
+                value = np.nan
+            else:
+                x = frac_dim0[plan, idx]
+                y = frac_dim1[plan, idx]
+                value = (
+                    values[i] * (1 - x) * (1 - y)
+                    + values[i + offset_dim0] * x * (1 - y)
+                    + values[i + offset_dim1] * (1 - x) * y
+                    + values[i + offset_dim0 + offset_dim1] * x * y
+                )
+            if np.isnan(value):
+                if not skip_nan:
+                    total = np.nan
+            else:
+                total += value
+                n_valid[slice_idx, idx] += 1
+        result[slice_idx, idx] = total
+
+    return result, n_valid
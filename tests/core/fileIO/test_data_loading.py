@@ -52,3 +52,467 @@ class TestLoadErrorHandling:
     def test_missing_file_raises(self):
         with pytest.raises(Exception, match="No valid file paths could be found"):
             load("/whatever/path.ext")
+
+
+def _write_ibw(fpath, data, dim_units, dim_start, dim_step):
+    """Write a minimal little-endian version 5 Igor Binary Wave file."""
+    import struct
+
+    n_pad = 4 - data.ndim
+    data_bytes = data.astype("<f4").tobytes(order="F")
+    dim_units_size = [len(unit) for unit in dim_units] + [0] * n_pad
+    bin_header = struct.pack(
+        "<hhllll4l4llll",
+        5,
+        0,
+        320 + len(data_bytes),
+        0,
+        0,
+        0,
+        *dim_units_size,
+        *[0] * 7,
+    ).ljust(64, b"\0")
+    wave_header = bytearray(320)
+    struct.pack_into("<lh", wave_header, 12, data.size, 2)
+    struct.pack_into("<4l", wave_header, 68, *data.shape, *[0] * n_pad)
+    struct.pack_into("<4d", wave_header, 84, *dim_step, *[1] * n_pad)
+    struct.pack_into("<4d", wave_header, 116, *dim_start, *[0] * n_pad)
+    with open(fpath, "wb") as f:
+        f.write(bin_header + wave_header + data_bytes + "".join(dim_units).encode())
+
+
+class TestLoadIBW:
+    @pytest.fixture
+    def ibw_path(self, tmp_path):
+        data = np.arange(5 * 7 * 3, dtype="f4").reshape(5, 7, 3)
+        fpath = tmp_path / "wave.ibw"
+        _write_ibw(fpath, data, ["eV", "theta_par", "y"], [10, -5, 0], [0.1, 0.5, 2])
+        return str(fpath), data
+
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_memmap_matches_igor2(self, ibw_path, lazy):
+        from peaks.core.fileIO.base_data_classes.base_ibw_class import (
+            BaseIBWDataLoader,
+        )
+
+        fpath, data = ibw_path
+        result = BaseIBWDataLoader._load_data(fpath, lazy=lazy)
+        reference = BaseIBWDataLoader._load_data_igor2(fpath)
+        assert isinstance(result["spectrum"], dask.array.Array) == lazy
+        assert result["dims"] == reference["dims"] == ["eV", "theta_par", "y"]
+        np.testing.assert_array_equal(np.asarray(result["spectrum"]), data)
+        for dim in result["dims"]:
+            np.testing.assert_array_equal(
+                result["coords"][dim], reference["coords"][dim]
+            )
+
+    def test_lazy_reload_hits_cache(self, ibw_path, tmp_path):
+        from peaks.core.options import opts
+        from peaks.core.utils.cache import peaks_cached
+
+        calls = []
+
+        @peaks_cached
+        def _double(data):
+            calls.append(1)
+            return data * 2
+
+        fpath, data = ibw_path
+        with opts:
+            opts.Cache.set(enabled=True, path=str(tmp_path / "cache"))
+            first = load(fpath, loc="ibw", lazy=True, quiet=True)
+            reloaded = load(fpath, loc="ibw", lazy=True, quiet=True)
+            assert first.data.name == reloaded.data.name
+            _double(first)
+            result = _double(reloaded)
+
+        assert calls == [1]
+        np.testing.assert_allclose(result.values, 2 * data)
+
+
+class TestLoadConcurrentMetadata:
+    def test_concurrent_metadata_matches_serial(self, tmp_path):
+        from peaks.core.options import opts
+
+        data = np.arange(4 * 6, dtype="f4").reshape(4, 6)
+        fpath = str(tmp_path / "wave.ibw")
+        _write_ibw(fpath, data, ["eV", "theta_par"], [10, -5], [0.1, 0.5])
+        results = {}
+        for concurrent in [False, True]:
+            with opts:
+                opts.FileIO.concurrent_metadata = concurrent
+                results[concurrent] = load(fpath, loc="ibw", quiet=True)
+
+        serial, concurrent = results[False], results[True]
+        xr.testing.assert_identical(serial.drop_attrs(), concurrent.drop_attrs())
+        assert serial.attrs.keys() == concurrent.attrs.keys()
+        for key, value in serial.attrs.items():
+            if key != "_analysis_history":
+                assert concurrent.attrs[key] == value
+
+
+class TestLoadSES:
+    @pytest.fixture(autouse=True)
+    def clear_metadata_cache(self):
+        from peaks.core.fileIO.base_arpes_data_classes.base_ses_class import (
+            SESDataLoader,
+        )
+
+        SESDataLoader._metadata_cache.clear()
+        yield SESDataLoader
+        SESDataLoader._metadata_cache.clear()
+
+    @pytest.fixture
+    def ses_txt_path(self, tmp_path):
+        data = np.column_stack([np.linspace(16, 17, 5), np.arange(15).reshape(5, 3)])
+        header = [
+            "[Info]",
+            "Number of Regions=1",
+            "",
+            "[Region 1]",
+            "Region Name=FS",
+            "Dimension 1 name=Kinetic Energy [eV]",
+            "Dimension 2 name=Thickness [deg]",
+            "Dimension 2 scale=-1 0 1",
+            "Pass Energy=20",
+            "Low Energy=16",
+            "High Energy=17",
+            "",
+            "[Data 1]",
+        ]
+        fpath = tmp_path / "scan.txt"
+        with open(fpath, "w") as f:
+            f.write("\n".join(header) + "\n")
+            np.savetxt(f, data)
+        return str(fpath), data
+
+    @pytest.fixture
+    def ses_zip_path(self, tmp_path):
+        import zipfile
+
+        data = np.arange(5 * 3 * 2, dtype=np.float32).reshape(5, 3, 2)
+        spectrum_ini = [
+            "[spectrum]",
+            "width=5",
+            "widthoffset=16",
+            "widthdelta=0.25",
+            "widthlabel=Energy [eV]",
+            "height=3",
+            "heightoffset=-1",
+            "heightdelta=1",
+            "heightlabel=Thetax [deg]",
+            "depth=2",
+            "depthoffset=-4",
+            "depthdelta=8",
+            "depthlabel=Thetay [deg]",
+        ]
+        region_ini = ["[SES]", "Pass Energy=20", "Low Energy=16", "High Energy=17"]
+        fpath = tmp_path / "scan.zip"
+        with zipfile.ZipFile(fpath, "w") as z:
+            z.writestr("Spectrum_FS.ini", "\r\n".join(spectrum_ini))
+            z.writestr("Spectrum_FS.bin", data.tobytes(order="F"))
+            z.writestr("FS.ini", "\r\n".join(region_ini))
+        return str(fpath), data
+
+    def test_txt_matches_separate_parse(self, clear_metadata_cache, ses_txt_path):
+        loader = clear_metadata_cache
+        fpath, data = ses_txt_path
+        result = loader._load_data(fpath, lazy=False)
+        cached_metadata = loader._metadata_cache.pop(fpath)
+
+        # Parse the metadata and data separately from the file path
+        metadata = loader._load_metadata(fpath, return_in_SES_format=True)
+        reference = np.loadtxt(fpath, skiprows=int(metadata["metadata_lines_length"]))
+        assert cached_metadata == metadata
+        assert metadata["Pass Energy"] == "20"
+        np.testing.assert_array_equal(result["spectrum"], reference[:, 1:])
+        np.testing.assert_array_equal(result["spectrum"], data[:, 1:])
+        np.testing.assert_array_equal(result["coords"]["eV"], data[:, 0])
+        np.testing.assert_array_equal(result["coords"]["theta_par"], [-1, 0, 1])
+
+    def test_txt_metadata_from_open_file(self, clear_metadata_cache, ses_txt_path):
+        loader = clear_metadata_cache
+        fpath, data = ses_txt_path
+        with open(fpath) as f:
+            metadata_lines = loader._load_SES_metadata_txt(f)
+            # The open file is left at the start of the data
+            np.testing.assert_array_equal(np.loadtxt(f), data)
+        assert metadata_lines == loader._load_SES_metadata_txt(fpath)
+
+    def test_zip_matches_separate_parse(self, clear_metadata_cache, ses_zip_path):
+        import zipfile
+
+        loader = clear_metadata_cache
+        fpath, data = ses_zip_path
+        result = loader._load_data(fpath, lazy=False)
+        cached_metadata = loader._metadata_cache.pop(fpath)
+
+        assert cached_metadata == loader._load_metadata(fpath, return_in_SES_format=True)
+        assert cached_metadata["Pass Energy"] == "20"
+        with zipfile.ZipFile(fpath) as z:
+            assert loader._load_SES_metadata_zip(z) == loader._load_SES_metadata_zip(
+                fpath
+            )
+        np.testing.assert_array_equal(result["spectrum"], data)
+        np.testing.assert_allclose(result["coords"]["eV"], np.linspace(16, 17, 5))
+        np.testing.assert_allclose(result["coords"]["deflector_perp"], [-4, 4])
+
+
+class TestLoadMBS:
+    @pytest.fixture(autouse=True)
+    def clear_metadata_cache(self):
+        from peaks.core.fileIO.base_arpes_data_classes.base_mbs_class import (
+            MBSDataLoader,
+        )
+
+        MBSDataLoader._metadata_cache.clear()
+        yield MBSDataLoader
+        MBSDataLoader._metadata_cache.clear()
+
+    @staticmethod
+    def _header(**kwargs):
+        header = {
+            "Start K.E.": 16,
+            "End K.E.": 17,
+            "ScaleMin": -1,
+            "ScaleMax": 1,
+            "ScaleMult": 0.5,
+            "ScaleName": "Angle (deg)",
+            "Pass Energy": "PE010",
+            "MapStartX": -5,
+            "MapEndX": 5,
+        }
+        header.update(kwargs)
+        return [f"{key}\t{value}" for key, value in header.items()]
+
+    @pytest.fixture
+    def mbs_txt_path(self, tmp_path):
+        data = np.column_stack([np.linspace(16, 17, 6), np.arange(24).reshape(6, 4)])
+        fpath = tmp_path / "scan.txt"
+        with open(fpath, "w") as f:
+            f.write("\n".join(self._header() + ["DATA:"]) + "\n")
+            np.savetxt(f, data)
+        return str(fpath), data
+
+    @pytest.fixture
+    def mbs_krx_path(self, tmp_path):
+        # Two 32-bit images (a deflector map), each followed by a copy of the header
+        n_y, n_x = 3, 5
+        images = np.arange(2 * n_y * n_x, dtype="<i4").reshape(2, n_y, n_x)
+        header = ("\r\n".join(self._header()) + "\r\nDATA:\r\n").encode("ascii")
+        image_pos = [8, 8 + n_y * n_x + 1 + 500]
+        words = np.zeros(image_pos[1] + n_y * n_x + 1 + 500, dtype="<i4")
+        words[:8] = [6, image_pos[0], n_y, n_x, image_pos[1], n_y, n_x, 4]
+        content = bytearray(words.tobytes())
+        for pos, image in zip(image_pos, images, strict=True):
+            content[pos * 4 : (pos + image.size) * 4] = image.tobytes()
+            header_start = (pos + image.size + 1) * 4
+            content[header_start : header_start + len(header)] = header
+        fpath = tmp_path / "scan.krx"
+        fpath.write_bytes(bytes(content))
+        return str(fpath), images
+
+    def test_txt_matches_separate_parse(self, clear_metadata_cache, mbs_txt_path):
+        loader = clear_metadata_cache
+        fpath, data = mbs_txt_path
+        result = loader._load_data(fpath, lazy=False)
+        cached_metadata = loader._metadata_cache.pop(fpath)
+
+        # Parse the metadata and data separately from the file path
+        metadata = loader._load_metadata(fpath, return_in_MBS_format=True)
+        reference = loader._load_from_txt(fpath, metadata)
+        assert cached_metadata == metadata
+        np.testing.assert_array_equal(result["spectrum"], reference["spectrum"])
+        np.testing.assert_array_equal(result["spectrum"], data[:, 1:])
+        np.testing.assert_array_equal(result["coords"]["eV"], data[:, 0])
+        np.testing.assert_array_equal(result["coords"]["theta_par"], [-1, -0.5, 0, 0.5])
+        with open(fpath) as f:
+            assert loader._load_MBS_metadata_txt(f) == loader._load_MBS_metadata_txt(
+                fpath
+            )
+
+    def test_krx_matches_separate_parse(self, clear_metadata_cache, mbs_krx_path):
+        loader = clear_metadata_cache
+        fpath, images = mbs_krx_path
+        result = loader._load_data(fpath, lazy=False)
+        cached_metadata = loader._metadata_cache.pop(fpath)
+
+        # Parse the metadata and data separately from the file path
+        metadata = loader._load_metadata(fpath, return_in_MBS_format=True)
+        reference = loader._load_from_krx(fpath, metadata)
+        assert cached_metadata == metadata
+        assert metadata["ScaleName"] == "Angle (deg)"
+        assert result["dims"] == ["deflector_perp", "theta_par", "eV"]
+        np.testing.assert_array_equal(result["spectrum"], reference["spectrum"])
+        np.testing.assert_array_equal(result["spectrum"], images)
+        np.testing.assert_allclose(result["coords"]["deflector_perp"], [-5, 5])
+        with open(fpath, "rb") as f:
+            assert loader._load_MBS_metadata_krx(f) == loader._load_MBS_metadata_krx(
+                fpath
+            )
+
+
+class TestLoadSpecs:
+    @pytest.fixture(autouse=True)
+    def clear_metadata_cache(self):
+        from peaks.core.fileIO.base_arpes_data_classes.base_specs_class import (
+            SpecsDataLoader,
+        )
+
+        SpecsDataLoader._metadata_cache.clear()
+        yield SpecsDataLoader
+        SpecsDataLoader._metadata_cache.clear()
+
+    @pytest.fixture
+    def sp2_path(self, tmp_path):
+        data = np.arange(3 * 4).reshape(3, 4)
+        header = [
+            "P2",
+            "# Created by: SpecsLab Prodigy",
+            "# SIZE_X = 4 # energy",
+            "# SIZE_Y = 3 # angle",
+            "# X Range = [16.0 .. 17.5] eV",
+            "# Y Range = [-10.0 .. 10.0] deg",
+            "4 3 12",
+        ]
+        fpath = tmp_path / "scan.sp2"
+        fpath.write_text("\n".join(header + [str(i) for i in data.ravel()]) + "\n")
+        return str(fpath), data
+
+    def test_sp2_matches_separate_parse(self, clear_metadata_cache, sp2_path):
+        loader = clear_metadata_cache
+        fpath, data = sp2_path
+        result = loader._load_data(fpath, lazy=False)
+        cached_metadata = loader._metadata_cache.pop(fpath)
+
+        # Parse the metadata separately from the file path, and read the data from the
+        # data start line
+        metadata = loader._load_metadata(fpath, return_in_SPECS_format=True)
+        with open(fpath) as f:
+            reference = np.array(f.readlines()[metadata["data_start_line"] :], int)
+        assert cached_metadata == metadata
+        np.testing.assert_array_equal(result["spectrum"], reference.reshape(3, 4))
+        np.testing.assert_array_equal(result["spectrum"], data)
+        np.testing.assert_allclose(result["coords"]["eV"], np.linspace(16, 17.5, 4))
+        np.testing.assert_allclose(result["coords"]["y"], [-10, 0, 10])
+        with open(fpath, "rb") as f:
+            assert loader._parse_metadata_from_sp2_file(f) == metadata
+            # The open file is left at the start of the data
+            assert int(f.readline()) == data.flat[0]
+
+
+class TestLoadSGM4:
+    @pytest.fixture
+    def sgm4_path(self, tmp_path):
+        import h5py
+
+        # A partially complete knife-edge scan (10 of 4 x 3 points), and an ARPES
+        # dataset of 5 x 2 points with 4 x 3 images
+        sum_data = np.arange(10.0)
+        images = np.arange(10 * 4 * 3, dtype=np.int32).reshape(10, 4, 3)
+        fpath = tmp_path / "scan.h5"
+        with h5py.File(fpath, "w") as f:
+            scandetails = f.create_group("Entry/Data/ScanDetails")
+            scandetails["SlowAxis_names"] = [b"SamX", b"SamY"]
+            scandetails["SlowAxis_length"] = [4, 3]
+            scandetails["SlowAxis_start"] = [0.0, 10.0]
+            scandetails["SlowAxis_step"] = [1.0, 2.0]
+            f["Entry/Process/SumData"] = sum_data
+            f["Entry/Data/TransformedData"] = images
+        return str(fpath), sum_data, images
+
+    def test_lazy_matches_eager(self, sgm4_path):
+        from peaks.core.fileIO.loaders.sgm4 import SGM4NanoARPESLoader
+
+        fpath, _, images = sgm4_path
+        key = "Entry/Data/TransformedData"
+        lazy = SGM4NanoARPESLoader._read_scan_dataset(fpath, key, (5, 2), (4, 3), True)
+        eager = SGM4NanoARPESLoader._read_scan_dataset(fpath, key, (5, 2), (4, 3), False)
+        assert isinstance(lazy, dask.array.Array)
+        assert isinstance(eager, np.ndarray)
+        assert lazy.dtype == eager.dtype == np.int32
+        np.testing.assert_array_equal(lazy.compute(), eager)
+        np.testing.assert_array_equal(eager, images.reshape(5, 2, 4, 3))
+
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_partial_scan_is_padded_with_nan(self, sgm4_path, lazy):
+        from peaks.core.fileIO.loaders.sgm4 import SGM4NanoARPESLoader
+
+        fpath, sum_data, images = sgm4_path
+        key = "Entry/Data/TransformedData"
+        result = np.asarray(
+            SGM4NanoARPESLoader._read_scan_dataset(fpath, key, (4, 3), (4, 3), lazy)
+        )
+        assert result.shape == (4, 3, 4, 3)
+        np.testing.assert_array_equal(result.reshape(12, 4, 3)[:10], images)
+        assert np.isnan(result[3, 1:]).all()
+
+        # The legacy `Lazy` keyword is still supported
+        data = SGM4NanoARPESLoader._load_data(fpath, Lazy=lazy)
+        assert isinstance(data.data.magnitude, dask.array.Array) == lazy
+        assert data.dims == ("x2", "x1")
+        np.testing.assert_array_equal(data.x1, [0, 1, 2, 3])
+        np.testing.assert_array_equal(data.x2, [10, 12, 14])
+        values = np.asarray(data.data.magnitude)
+        np.testing.assert_array_equal(values.ravel()[:10], sum_data)
+        assert np.isnan(values[2, 2:]).all()
+
+
+class TestLoadFeSuMa:
+    @pytest.fixture
+    def fesuma_path(self, tmp_path):
+        import h5py
+
+        # A kinetic energy scan of 3 steps, repeated over 2 sweeps
+        rng = np.random.default_rng(0)
+        images = rng.random((2, 3, 4, 5))  # sweep, step, detector_x, detector_y
+        fpath = tmp_path / "scan.h5"
+        with h5py.File(fpath, "w") as f:
+            for sweep in range(2):
+                for step in range(3):
+                    group = f.create_group(f"{3 * sweep + step:03d}")
+                    image = group.create_dataset(
+                        "analysisImage", data=images[sweep, step]
+                    )
+                    image.attrs.update(
+                        {
+                            "DimOffsetX": 0.0,
+                            "DimDeltaX": 1.0,
+                            "ScaleUnitsX": b"mm",
+                            "DimOffsetY": -2.0,
+                            "DimDeltaY": 1.0,
+                            "ScaleUnitsY": b"mm",
+                        }
+                    )
+                    group["AcquisitionCurrentStep"] = [step]
+                    group["AcquisitionCurrentSweep"] = [sweep]
+            f["AcquisitionCoordinateNice"] = [b"Kinetic Energy"]
+            f["AcquisitionEkinStart"] = [10.0]
+            f["AcquisitionEkinStep"] = [0.5]
+        return str(fpath), images.mean(axis=0)
+
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_sweeps_are_averaged(self, fesuma_path, lazy):
+        from peaks.core.fileIO.base_arpes_data_classes.base_fesuma_class import (
+            BaseFeSuMaDataLoader,
+        )
+
+        fpath, expected = fesuma_path
+        result = BaseFeSuMaDataLoader._load_data(fpath, lazy=lazy)
+        assert isinstance(result["spectrum"], dask.array.Array) == lazy
+        assert result["dims"] == ("eV", "detector_x", "detector_y")
+        np.testing.assert_allclose(np.asarray(result["spectrum"]), expected)
+        np.testing.assert_allclose(result["coords"]["eV"], [10, 10.5, 11])
+
+    def test_integer_step_index(self, fesuma_path):
+        from peaks.core.fileIO.base_arpes_data_classes.base_fesuma_class import (
+            _FeSuMaImageCube,
+        )
+
+        fpath, expected = fesuma_path
+        cube = _FeSuMaImageCube(fpath)
+        np.testing.assert_allclose(cube[1], expected[1])
+        np.testing.assert_allclose(cube[-1, 2:], expected[-1, 2:])
+        np.testing.assert_allclose(cube[np.int64(0), :, 3], expected[0, :, 3])
+        np.testing.assert_allclose(cube[1:, 1], expected[1:, 1])
+        np.testing.assert_allclose(cube[()], expected)
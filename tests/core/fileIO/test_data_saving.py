@@ -1,6 +1,20 @@
+import json
+
+import h5py
+import numpy as np
 import pytest
+import xarray as xr
+import zarr
 
 from peaks.core.fileIO.data_loading import load
+from peaks.core.fileIO.data_saving import _METADATA_SCHEMA_VERSION, ZarrWriter, save
+from peaks.core.fileIO.loc_registry import LOC_REGISTRY
+from peaks.core.metadata.base_metadata_models import (
+    BaseScanMetadataModel,
+    PhotonMetadataModel,
+    _get_manipulator_metadata_model,
+    ureg,
+)
 from peaks.core.metadata.metadata_methods import display_metadata
 from peaks.core.utils.sample_data import ExampleData
 
@@ -23,3 +37,198 @@ class TestSave:
     def test_save_with_wrong_extension_raises(self, disp, tmp_path):
         with pytest.raises(ValueError, match="File path must have a .nc extension"):
             disp.save(str(tmp_path / "disp.zarr"))
+
+
+class TestSaveProfile:
+    @pytest.fixture
+    def fermi_map(self):
+        return xr.DataArray(
+            np.random.default_rng(0).random((20, 50, 40), dtype="float32"),
+            dims=("eV", "theta_par", "polar"),
+            coords={"eV": np.linspace(16.5, 16.9, 20)},
+            name="fermi_map",
+        )
+
+    def test_netcdf_profile_chunks_and_compresses(self, fermi_map, tmp_path):
+        fpath = str(tmp_path / "fermi_map.nc")
+        save(fermi_map.copy(), fpath, profile="fermi_surface")
+        with h5py.File(fpath, "r") as f:
+            assert f["fermi_map"].chunks[1:] == (50, 40)
+            assert f["fermi_map"].compression == "gzip"
+        np.testing.assert_array_equal(load(fpath).values, fermi_map.values)
+
+    def test_zarr_profile_shards_and_compresses(self, fermi_map, tmp_path):
+        fpath = str(tmp_path / "fermi_map.zarr")
+        dt = xr.DataTree.from_dict({"/scan": fermi_map.to_dataset()})
+        save(dt, fpath, profile="edc")
+        array = zarr.open(fpath, mode="r")["scan/fermi_map"]
+        assert array.chunks[0] == 20
+        assert array.shards is not None
+        np.testing.assert_array_equal(
+            load(fpath, lazy=False)["scan/fermi_map"].values, fermi_map.values
+        )
+
+    def test_unknown_profile_raises(self, fermi_map, tmp_path):
+        with pytest.raises(ValueError, match="Unknown storage profile"):
+            save(fermi_map, str(tmp_path / "fermi_map.nc"), profile="unknown")
+
+
+class TestZarrWriter:
+    @pytest.fixture
+    def hv_scan(self):
+        return xr.DataArray(
+            np.random.default_rng(0).random((4, 20, 30)),
+            dims=("hv", "eV", "theta_par"),
+            coords={"hv": np.linspace(20, 23, 4), "eV": np.linspace(15, 19, 20)},
+            name="hv_scan",
+        )
+
+    def test_append_slices(self, hv_scan, tmp_path):
+        fpath = str(tmp_path / "hv_scan.zarr")
+        with ZarrWriter(fpath, append_dim="hv") as writer:
+            for hv in hv_scan.hv:
+                writer.append(hv_scan.sel(hv=hv))
+        result = load(fpath, lazy=False)["hv_scan"].data
+        np.testing.assert_array_equal(result.values, hv_scan.values)
+        np.testing.assert_array_equal(result.hv.values, hv_scan.hv.values)
+        assert "appending along hv" in result.history.get(-1)["record"]
+
+    def test_save_append_dim_extends_existing_file(self, hv_scan, tmp_path):
+        fpath = str(tmp_path / "hv_scan.zarr")
+        save(hv_scan.isel(hv=slice(0, 2)), fpath, append_dim="hv")
+        save(hv_scan.isel(hv=slice(2, None)), fpath, append_dim="hv")
+        result = load(fpath, lazy=False)["hv_scan"].data
+        np.testing.assert_array_equal(result.values, hv_scan.values)
+
+    def test_missing_append_dim_raises(self, hv_scan, tmp_path):
+        with pytest.raises(ValueError, match="as a dimension or co-ordinate"):
+            with ZarrWriter(str(tmp_path / "hv_scan.zarr"), "polar") as writer:
+                writer.append(hv_scan)
+
+
+class TestSaveMetadataRoundtrip:
+    @pytest.fixture
+    def data(self):
+        loader = LOC_REGISTRY["MAXIV_Bloch_A"]
+        ManipulatorMetadataModel = _get_manipulator_metadata_model(
+            tuple(loader._manipulator_axes)
+        )
+        data = xr.DataArray(
+            np.zeros((3, 4)),
+            dims=("eV", "theta_par"),
+            attrs={
+                "_scan": BaseScanMetadataModel(
+                    name="scan", filepath="scan.ibw", loc=loader._loc_name, timestamp=""
+                ),
+                "_manipulator": ManipulatorMetadataModel(
+                    polar={"local_name": "P", "value": (1.5, "deg")}
+                ),
+                "_photon": PhotonMetadataModel(hv=(21.2, "eV")),
+            },
+        )
+        data.history.add("Test data created")
+        return data
+
+    def test_metadata_models_restored(self, data, tmp_path):
+        fpath = str(tmp_path / "scan.nc")
+        save(data, fpath)
+        result = load(fpath)
+
+        assert result.attrs["_scan"] == data.attrs["_scan"]
+        assert result.attrs["_photon"].hv == data.attrs["_photon"].hv
+        assert result.attrs["_manipulator"].polar.value == (1.5 * ureg("deg"))
+        assert type(result.attrs["_manipulator"]) is type(data.attrs["_manipulator"])
+        assert (
+            result.attrs["_analysis_history"]
+            .records[1]
+            .record.startswith("Data saved as a NetCDF file")
+        )
+
+    def test_save_does_not_modify_data(self, data, tmp_path):
+        attrs = dict(data.attrs)
+        save(data, str(tmp_path / "scan.nc"))
+        assert data.attrs == attrs
+        assert len(data.attrs["_analysis_history"].records) == 1
+
+        tree = xr.DataTree.from_dict(
+            {"scan": data.to_dataset(name="data", promote_attrs=False)}
+        )
+        save(tree, str(tmp_path / "scan.zarr"))
+        assert tree["scan"]["data"].attrs == attrs
+        assert len(tree["scan"]["data"].attrs["_analysis_history"].records) == 1
+        result = load(str(tmp_path / "scan.zarr"))["scan"]["data"]
+        assert (
+            result.attrs["_analysis_history"]
+            .records[1]
+            .record.startswith("Data saved as part of a DataTree Zarr file")
+        )
+
+    def test_datatree_nodes_roundtrip(self, data, tmp_path):
+        scans = {
+            f"sample{i // 3}/scan{i}": (data + i)
+            .chunk()
+            .to_dataset(name="data", promote_attrs=False)
+            for i in range(6)
+        }
+        tree = xr.DataTree.from_dict(scans)
+        fpath = str(tmp_path / "scans.zarr")
+        save(tree, fpath, profile="edc")
+        result = load(fpath, lazy=False)
+
+        assert set(zarr.open_consolidated(fpath).keys()) == {"sample0", "sample1"}
+        for path in scans:
+            xr.testing.assert_equal(result[path]["data"], tree[path]["data"])
+            assert result[path]["data"].attrs["_scan"] == data.attrs["_scan"]
+
+    def test_metadata_saved_as_versioned_document(self, data, tmp_path):
+        fpath = str(tmp_path / "scan.nc")
+        data.attrs["notes"] = {"sample": "Bi2Se3"}
+        save(data, fpath)
+        with xr.open_dataarray(fpath) as saved:
+            document = json.loads(saved.attrs["peaks_metadata"])
+            assert "metadata_models" not in saved.attrs
+        assert document["schema_version"] == _METADATA_SCHEMA_VERSION
+        assert document["attrs"]["notes"] == {
+            "model": "json",
+            "value": {"sample": "Bi2Se3"},
+        }
+
+        result = load(fpath)
+        assert result.attrs["notes"] == {"sample": "Bi2Se3"}
+        assert list(result.attrs)[: len(data.attrs)] == list(data.attrs)
+
+    def test_schema_version_1_loads(self, data, tmp_path):
+        fpath = str(tmp_path / "scan_v1.nc")
+        attrs = {
+            attr_name: attr.model_dump_json(by_alias=True)
+            for attr_name, attr in data.attrs.items()
+        }
+        attrs["notes"] = json.dumps({"sample": "Bi2Se3"})
+        metadata_models = {
+            attr_name: f"{attr.__class__.__module__}.{attr.__class__.__name__}"
+            for attr_name, attr in data.attrs.items()
+        }
+        attrs["metadata_models"] = json.dumps(metadata_models | {"notes": "json"})
+        data.copy(data=data.values).assign_attrs(attrs).to_netcdf(fpath)
+        result = load(fpath)
+
+        assert result.attrs["_scan"] == data.attrs["_scan"]
+        assert result.attrs["_manipulator"].polar.value == (1.5 * ureg("deg"))
+        assert result.attrs["notes"] == {"sample": "Bi2Se3"}
+        assert "metadata_models" not in result.attrs
+
+    def test_later_schema_version_left_unparsed(self, data, tmp_path):
+        fpath = str(tmp_path / "scan_future.nc")
+        document = {
+            "schema_version": _METADATA_SCHEMA_VERSION + 1,
+            "peaks_version": "99.0",
+            "attrs": {"_scan": {"model": "new.Model", "value": {}}},
+        }
+        xr.DataArray(
+            np.zeros((3, 4)),
+            dims=("eV", "theta_par"),
+            attrs={"peaks_metadata": json.dumps(document)},
+        ).to_netcdf(fpath)
+        result = load(fpath)
+
+        assert json.loads(result.attrs["peaks_metadata"]) == document
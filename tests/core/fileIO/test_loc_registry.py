@@ -1,5 +1,11 @@
+import os
+import zipfile
+
+import pytest
+
 from peaks.core.fileIO.loc_registry import (
     LOC_REGISTRY,
+    IdentifyLoc,
     locs,
 )
 
@@ -39,3 +45,64 @@ class TestLocsRegistry:
     def test_registry_values_are_classes(self):
         for name, loader in LOC_REGISTRY.items():
             assert isinstance(loader, type), f"{name} is not a class"
+
+
+class TestIdentifyLoc:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        IdentifyLoc.clear_cache()
+        yield
+        IdentifyLoc.clear_cache()
+
+    @pytest.mark.parametrize(
+        "location, expected",
+        [
+            ("MAX IV Bloch", "MAXIV_Bloch_A"),
+            ("Elettra APE", "Elettra_APE_LE"),
+            ("SOLEIL Cassiopee", "Soleil_Casiopee_ARPES"),
+        ],
+    )
+    def test_ses_txt_location(self, tmp_path, location, expected):
+        fpath = tmp_path / "scan.txt"
+        fpath.write_text(
+            f"[Info]\nNumber of Regions=1\n\n[Region 1]\nLocation={location}\n\n[Data 1]\n"
+        )
+        assert IdentifyLoc.identify(str(fpath)) == expected
+
+    def test_mbs_txt(self, tmp_path):
+        fpath = tmp_path / "scan.txt"
+        fpath.write_text("Lines\t100\nInfo Lines\t20\n")
+        assert IdentifyLoc.identify(str(fpath)) == "StA_MBS"
+
+    def test_ses_zip_location(self, tmp_path):
+        fpath = tmp_path / "map.zip"
+        with zipfile.ZipFile(fpath, "w") as z:
+            z.writestr("Spectrum_map.ini", "[spectrum]\nwidth=10\n")
+            z.writestr("map.ini", "[SES]\nLocation=Diamond i05\n")
+        assert IdentifyLoc.identify(str(fpath)) == "Diamond I05-nano"
+
+    def test_specs_xy(self, tmp_path):
+        fpath = tmp_path / "scan.xy"
+        fpath.write_text("# Created by:        SpecsLab Prodigy\n# Comment\n")
+        assert IdentifyLoc.identify(str(fpath)) == "StA_Phoibos"
+
+    def test_unknown_extension(self, tmp_path):
+        fpath = tmp_path / "scan.unknown"
+        fpath.write_text("")
+        with pytest.raises(ValueError):
+            IdentifyLoc.identify(str(fpath))
+
+    def test_cache_invalidated_on_modification(self, tmp_path):
+        fpath = tmp_path / "scan.txt"
+        fpath.write_text("[Info]\nLocation=Bloch\n")
+        assert IdentifyLoc.identify(str(fpath)) == "MAXIV_Bloch_A"
+
+        # Cached result is returned without re-reading the file
+        mtime = os.stat(fpath).st_mtime_ns
+        fpath.write_text("[Info]\nLocation=Elett\n")  # Same size
+        os.utime(fpath, ns=(mtime, mtime))
+        assert IdentifyLoc.identify(str(fpath)) == "MAXIV_Bloch_A"
+
+        # Modified file is re-identified
+        fpath.write_text("[Info]\nLocation=Elettra\n")
+        assert IdentifyLoc.identify(str(fpath)) == "Elettra_APE_LE"
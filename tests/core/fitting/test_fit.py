@@ -6,8 +6,21 @@ import pint_xarray
 import pytest
 import xarray as xr
 
+from peaks.core.fitting.batch_fit import supports_batch_fit
 from peaks.core.fitting.fit import _estimate_EF  # type: ignore
-from peaks.core.fitting.models import GaussianModel  # type: ignore
+from peaks.core.fitting.fit_functions import (
+    FIT_CONVERGED,
+    FIT_NOT_CONVERGED,
+    FIT_SKIPPED,
+)
+from peaks.core.fitting.lineshapes import doniach
+from peaks.core.fitting.models import (  # type: ignore
+    ExponentialModel,
+    FastDoniachModel,
+    GaussianModel,
+    LinearDosFermiModel,
+    LinearModel,
+)
 from peaks.core.utils.sample_data import ExampleData
 
 matplotlib.use("Agg")  # suppress plots
@@ -74,6 +87,31 @@ def fake_disp():
     return da
 
 
+@pytest.fixture
+def fake_gold():
+    # A resolution-broadened Fermi edge with a quadratic variation of the Fermi level along theta_par
+    from scipy.ndimage import gaussian_filter1d
+
+    from peaks.core.fitting.fit_functions import _linear_dos_fermi
+
+    eV = np.linspace(16.5, 17, 300)
+    theta_par = np.linspace(-10, 10, 20)
+    sigma_pxl = 0.012 / (abs(eV[-1] - eV[0]) / len(eV))
+    values = np.stack(
+        [
+            gaussian_filter1d(
+                _linear_dos_fermi(eV, 16.8 + 1e-4 * theta**2, 10, -50, 1500, 5, 20),
+                sigma_pxl,
+            )
+            for theta in theta_par
+        ],
+        axis=1,
+    )
+    rng = np.random.default_rng(seed=42)
+    values += rng.normal(0, 5, values.shape)
+    return _simulate_fake_scan(values, y=eV, x=theta_par)
+
+
 @pytest.fixture
 def poly_gold():
     return ExampleData.gold_reference4().sel(
@@ -102,6 +140,87 @@ class TestFit:
         )
         assert "sigma_stderr" in result.data_vars
 
+    def test_parallel_sequential_fit_matches_serial(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.34, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-7, 7))
+        serial_result = data.fit(model, params, independent_var="eV")
+        parallel_result = data.fit(model, params, independent_var="eV", n_workers=3)
+        xr.testing.assert_allclose(
+            parallel_result.drop_vars("fit_model"),
+            serial_result.drop_vars("fit_model"),
+            rtol=1e-4,
+        )
+        assert parallel_result["fit_model"].isel(theta_par=-1).item().success
+
+    def test_fit_with_process_scheduler(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-2, 2))
+        expected = data.fit(model, params, independent_var="eV", sequential=False)
+        result = data.fit(
+            model,
+            params,
+            independent_var="eV",
+            sequential=False,
+            scheduler="processes",
+            n_workers=2,
+        )
+        xr.testing.assert_allclose(
+            result.drop_vars("fit_model"), expected.drop_vars("fit_model")
+        )
+        assert result["fit_model"].isel(theta_par=0).item().success
+
+    def test_fit_returns_fit_statistics(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        result = fake_disp.sel(theta_par=slice(-7, 7)).fit(
+            model, params, independent_var="eV"
+        )
+        fit_model = result["fit_model"].isel(theta_par=0).item()
+        np.testing.assert_allclose(
+            result["redchi"].isel(theta_par=0), fit_model.redchi, rtol=1e-6
+        )
+        covariance = result["covariance"].isel(theta_par=0)
+        assert covariance.dtype == np.float32
+        np.testing.assert_allclose(
+            covariance.sel(cov_i=fit_model.var_names, cov_j=fit_model.var_names),
+            fit_model.covar,
+            rtol=1e-5,
+        )
+        assert np.isnan(covariance.sel(cov_i="height")).all()
+
+    @pytest.mark.parametrize("keep_model, n_models", [("none", 0), ("sample", 25)])
+    def test_fit_keep_model(self, fake_disp, keep_model, n_models):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-7, 7))
+        full_result = data.fit(model, params, independent_var="eV")
+        result = data.fit(
+            model,
+            params,
+            independent_var="eV",
+            keep_model=keep_model,
+            keep_best_fit=True,
+        )
+        if n_models:
+            assert sum(m is not None for m in result["fit_model"].values) == n_models
+        else:
+            assert "fit_model" not in result.data_vars
+
+        # Best-fit curves can be regenerated from the parameters
+        expected_best_fit = np.stack(
+            [fit_model.best_fit for fit_model in full_result["fit_model"].values]
+        )
+        evaluated = result.evaluate_fit()["best_fit"].transpose("theta_par", "eV")
+        np.testing.assert_allclose(evaluated, expected_best_fit, rtol=1e-5, atol=1e-3)
+        np.testing.assert_allclose(
+            result["best_fit"].transpose("theta_par", "eV"),
+            expected_best_fit,
+            rtol=1e-5,
+            atol=1e-3,
+        )
+
     def test_fit_invalid_independent_var(self, fake_disp):
         model = GaussianModel()
         params = model.make_params(center=16.55, sigma=0.02, height=1000)
@@ -119,6 +238,127 @@ class TestFit:
         ):
             fake_disp.fit(model, params)
 
+    def test_batch_fit_recovers_gaussian_centres(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-7, 7))
+        result = data.fit(model, params, independent_var="eV", engine="batch")
+        expected_centres = 0.03 * data.theta_par + 16.55
+        np.testing.assert_allclose(
+            result["center"].values, expected_centres.values, rtol=0.005
+        )
+        assert "center_stderr" in result.data_vars
+        assert "fit_model" not in result.data_vars
+
+    def test_batch_fit_matches_lmfit(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-3, 3))
+        lmfit_result = data.fit(model, params, independent_var="eV", sequential=False)
+        batch_result = data.fit(model, params, independent_var="eV", engine="batch")
+        for param in ["center", "sigma", "amplitude", "height"]:
+            np.testing.assert_allclose(
+                batch_result[param].values, lmfit_result[param].values, rtol=1e-5
+            )
+            np.testing.assert_allclose(
+                batch_result[f"{param}_stderr"].values,
+                lmfit_result[f"{param}_stderr"].values,
+                rtol=1e-3,
+            )
+
+    def test_batch_fit_of_fermi_edges_matches_lmfit(self, fake_gold):
+        model = LinearDosFermiModel()
+        params = model.guess(fake_gold.isel(theta_par=0))
+        lmfit_result = fake_gold.fit(
+            model, params, independent_var="eV", sequential=False
+        )
+        batch_result = fake_gold.fit(model, params, independent_var="eV", engine="batch")
+        for param in ["EF", "sigma_conv"]:
+            np.testing.assert_allclose(
+                batch_result[param].values, lmfit_result[param].values, rtol=1e-5
+            )
+            np.testing.assert_allclose(
+                batch_result[f"{param}_stderr"].values,
+                lmfit_result[f"{param}_stderr"].values,
+                rtol=1e-3,
+            )
+        assert np.all(batch_result["T_stderr"].values == 0)
+
+    def test_batch_fit_of_doniach_peaks_matches_lmfit(self):
+        rng = np.random.default_rng(0)
+        eV = np.linspace(-2, 2, 400)
+        centres = np.linspace(-0.2, 0.2, 10)
+        data = xr.DataArray(
+            [doniach(eV, 10, centre, 0.3, 0.1) for centre in centres]
+            + rng.normal(scale=0.05, size=(10, 400)),
+            dims=["x", "eV"],
+            coords={"x": np.arange(10), "eV": eV},
+        )
+        model = FastDoniachModel()
+        params = model.make_params(amplitude=8, center=0, sigma=0.2, gamma=0.05)
+        lmfit_result = data.fit(model, params, independent_var="eV", sequential=False)
+        batch_result = data.fit(model, params, independent_var="eV", engine="batch")
+        for param in ["amplitude", "center", "sigma", "gamma"]:
+            np.testing.assert_allclose(
+                batch_result[param].values, lmfit_result[param].values, rtol=1e-5
+            )
+        np.testing.assert_allclose(batch_result["center"].values, centres, atol=0.01)
+
+    def test_fit_skips_screened_spectra(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-5, 5))
+        on_sample = abs(data.theta_par) < 3
+        data = data * on_sample
+        for engine in ["lmfit", "batch"]:
+            result = data.fit(
+                model, params, independent_var="eV", engine=engine, min_counts=1000
+            )
+            assert np.all(result["fit_status"].values[on_sample] == FIT_CONVERGED)
+            assert np.all(result["fit_status"].values[~on_sample] == FIT_SKIPPED)
+            assert np.all(np.isnan(result["center"].values[~on_sample]))
+            np.testing.assert_allclose(
+                result["center"].values[on_sample],
+                0.03 * data.theta_par.values[on_sample] + 16.55,
+                rtol=0.005,
+            )
+
+    def test_fit_status_with_max_nfev(self, fake_disp):
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-1, 1))
+        for engine in ["lmfit", "batch"]:
+            result = data.fit(model, params, independent_var="eV", engine=engine)
+            assert np.all(result["fit_status"].values == FIT_CONVERGED)
+            result = data.fit(
+                model, params, independent_var="eV", engine=engine, max_nfev=2
+            )
+            assert np.all(result["fit_status"].values == FIT_NOT_CONVERGED)
+
+    def test_fit_status_when_fit_cannot_improve(self, fake_disp, fake_gold):
+        # Starting far from the data, the model derivatives vanish so that no step can improve the fit
+        model = GaussianModel()
+        params = model.make_params(center=100, sigma=0.02, height=1000)
+        data = fake_disp.sel(theta_par=slice(-1, 1))
+        result = data.fit(model, params, independent_var="eV", engine="batch")
+        assert np.all(result["fit_status"].values == FIT_NOT_CONVERGED)
+
+        model = LinearDosFermiModel()
+        params = model.guess(fake_gold.isel(theta_par=0))
+        for name in params:
+            params[name].vary = name == "EF"
+        params["EF"].set(value=100, min=-np.inf, max=np.inf)
+        result = fake_gold.fit(model, params, independent_var="eV", engine="batch")
+        assert np.all(result["fit_status"].values == FIT_NOT_CONVERGED)
+
+    def test_batch_fit_unsupported_model(self, fake_disp):
+        model = ExponentialModel()
+        params = model.make_params(amplitude=1, decay=1)
+        assert not supports_batch_fit(model)
+        assert supports_batch_fit(GaussianModel() + LinearModel(prefix="bg_"))
+        with pytest.raises(NotImplementedError, match="does not support the model"):
+            fake_disp.fit(model, params, independent_var="eV", engine="batch")
+
 
 class TestEstimateEF:
     def test_estimate_EF(self):
@@ -131,6 +371,28 @@ class TestEstimateEF:
         result = _estimate_EF(values, eV)
         assert float(result) == pytest.approx(0.05, rel=0.01)
 
+    def test_estimate_EF_of_stack_matches_individual_EDCs(self):
+        from peaks.core.fitting.fit_functions import _fermi_function
+
+        eV = np.linspace(0, 0.2, 500)
+        EF = np.linspace(0.04, 0.16, 6).reshape(2, 3)
+        values = 100 * _fermi_function(eV, EF=EF[..., None], T=50)
+        rng = np.random.default_rng(seed=42)
+        values += rng.normal(0, 1, values.shape)
+        result = _estimate_EF(values, eV)
+        assert result.shape == EF.shape
+        for idx in np.ndindex(EF.shape):
+            assert result[idx] == _estimate_EF(values[idx], eV)
+        np.testing.assert_allclose(result, EF, atol=0.002)
+
+    def test_estimate_EF_along_dims(self, fake_gold):
+        result = fake_gold.estimate_EF(dims="theta_par")
+        assert isinstance(result, xr.DataArray)
+        assert result.dims == ("theta_par",)
+        np.testing.assert_array_equal(result.theta_par, fake_gold.theta_par)
+        expected = 16.8 + 1e-4 * fake_gold.theta_par.values**2
+        assert np.median(np.abs(result.values - expected)) < 0.005
+
     def test_estimate_EF_on_real_data(self, poly_gold):
         result = poly_gold.isel(theta_par=0).estimate_EF()
         assert float(result) == pytest.approx(16.767, rel=0.01)
@@ -189,6 +451,22 @@ class TestFitGold:
             16.79340882215599, rel=1e-5
         )
 
+    def test_fit_gold_global(self, fake_gold):
+        result = fake_gold.fit_gold(EF_correction_type="quadratic", engine="global")
+        EF_correction = result.attrs["EF_correction"]
+        EF_correction_stderr = result.attrs["EF_correction_stderr"]
+        assert EF_correction["c0"] == pytest.approx(16.8, abs=1e-4)
+        assert EF_correction["c1"] == pytest.approx(
+            0, abs=5 * EF_correction_stderr["c1"]
+        )
+        assert EF_correction["c2"] == pytest.approx(1e-4, rel=0.05)
+        np.testing.assert_allclose(result["sigma_conv"].values, 0.012, rtol=0.01)
+        np.testing.assert_allclose(
+            result["EF"].values,
+            16.8 + 1e-4 * fake_gold.theta_par.values**2,
+            atol=1e-4,
+        )
+
 
 class TestSaveLoadFitResults:
     @pytest.fixture
@@ -211,3 +489,23 @@ class TestSaveLoadFitResults:
             np.testing.assert_array_almost_equal(
                 fit_results[param].values, loaded[param].values
             )
+
+    def test_zarr_roundtrip_of_compact_results(self, fake_disp, tmp_path):
+        import peaks as pks
+
+        model = GaussianModel()
+        params = model.make_params(center=16.55, sigma=0.02, height=1000)
+        fit_results = fake_disp.sel(theta_par=slice(-7, 7)).fit(
+            model, params, independent_var="eV", keep_model="none"
+        )
+        tmp_file = tmp_path / "fit_results.zarr"
+        fit_results.save_fit(tmp_file)
+        loaded = pks.load_fit(tmp_file)
+        xr.testing.assert_identical(loaded, fit_results)
+        xr.testing.assert_allclose(
+            loaded.evaluate_fit()["best_fit"], fit_results.evaluate_fit()["best_fit"]
+        )
+
+    def test_zarr_requires_compact_results(self, fit_results, tmp_path):
+        with pytest.raises(ValueError, match="cannot be saved as Zarr"):
+            fit_results.save_fit(tmp_path / "fit_results.zarr")
@@ -0,0 +1,51 @@
+import lmfit.lineshapes as lm_lineshapes
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+from scipy.special import wofz
+
+from peaks.core.fitting.lineshapes import doniach, faddeeva, gaussian_filter, voigt
+
+
+class TestFaddeeva:
+    def test_matches_wofz(self):
+        rng = np.random.default_rng(0)
+        z = rng.normal(scale=5, size=1000) + 1j * np.abs(rng.normal(scale=3, size=1000))
+        z = np.concatenate([z, np.conj(z[:100]) / 10])
+        np.testing.assert_allclose(faddeeva(z), wofz(z), rtol=1e-12)
+
+
+class TestLineshapes:
+    def test_voigt_matches_lmfit(self):
+        x = np.linspace(-5, 5, 1001)
+        for gamma in [1e-6, 0.2, 2.0]:
+            np.testing.assert_allclose(
+                voigt(x, 2.0, 0.3, 0.4, gamma),
+                lm_lineshapes.voigt(x, 2.0, 0.3, 0.4, gamma),
+                rtol=1e-12,
+                atol=1e-14,
+            )
+
+    def test_doniach_matches_lmfit(self):
+        x = np.linspace(-5, 5, 1001)
+        for gamma in [0.0, 0.15, 0.4]:
+            np.testing.assert_allclose(
+                doniach(x, 2.0, 0.3, 0.4, gamma),
+                lm_lineshapes.doniach(x, 2.0, 0.3, 0.4, gamma),
+                rtol=1e-12,
+            )
+
+
+class TestGaussianFilter:
+    def test_matches_gaussian_filter1d(self):
+        data = np.random.default_rng(0).random((3, 400))
+        # Narrow kernels are applied directly, wide kernels by FFT
+        for sigma_pxl in [0.7, 5.0, 30.0]:
+            np.testing.assert_allclose(
+                gaussian_filter(data, sigma_pxl),
+                gaussian_filter1d(data, sigma_pxl),
+                atol=1e-12,
+            )
+
+    def test_zero_width_returns_data(self):
+        data = np.random.default_rng(0).random(100)
+        np.testing.assert_array_equal(gaussian_filter(data, 0), data)
@@ -49,12 +49,38 @@ class TestShirleyBG:
         result_no_offset = _shirley_bg(fake_XPS(centre=8))
         assert result_offset[-1] < result_no_offset[-1]
 
-    def test_shirley_bg_rejects_2D_input(self, fake_XPS):
+    def test_shirley_bg_rejects_scalar_input(self):
         with pytest.raises(
             Exception,
-            match="Inputted data must be a 1D numpy.ndarray, list or xarray.DataArray",
+            match="Inputted data must be an at least 1D numpy.ndarray",
         ):
-            _shirley_bg(np.array([fake_XPS(), fake_XPS()]))
+            _shirley_bg(np.array(1.0))
+
+    def test_shirley_bg_of_stack_matches_individual_spectra(self, fake_XPS):
+        spectra = np.array(
+            [fake_XPS(centre=centre) for centre in np.linspace(3, 7, 6)]
+        ).reshape(2, 3, -1)
+        result = _shirley_bg(spectra, num_avg=3, offset_end=0.1)
+        assert result.shape == spectra.shape
+        for idx in np.ndindex(spectra.shape[:-1]):
+            np.testing.assert_allclose(
+                result[idx],
+                _shirley_bg(spectra[idx], num_avg=3, offset_end=0.1),
+                rtol=1e-12,
+            )
+
+    def test_shirley_bg_of_stack_with_degenerate_spectra(self, fake_XPS):
+        nan_spectrum = fake_XPS()
+        nan_spectrum[50] = np.nan
+        spectra = np.array([fake_XPS(), np.zeros(200), nan_spectrum])
+        result = _shirley_bg(spectra, num_avg=3)
+        np.testing.assert_allclose(result[0], _shirley_bg(fake_XPS(), num_avg=3))
+        np.testing.assert_array_equal(result[1], np.zeros(200))
+        assert np.isnan(result[2]).all()
+
+    def test_shirley_bg_raises_if_not_converged(self, fake_XPS):
+        with pytest.raises(Exception, match="for 1 of 2 spectra"):
+            _shirley_bg(np.array([fake_XPS(), np.zeros(200)]), max_iterations=1)
 
 
 class TestCreateXarrayCompatibleLmfitModel:
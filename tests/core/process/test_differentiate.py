@@ -218,6 +218,35 @@ class TestCurvature:
         ):
             da.curvature()
 
+    def test_curvature_batches_over_extra_dims(self):
+        rng = np.random.default_rng(0)
+        values = rng.random((4, 30, 20))
+        da = _simulate_fake_scan(values, dims=("hv", "eV", "theta_par"))
+        result = da.curvature(theta_par=0.5, eV=2.0)
+        assert result.dims == da.dims
+        for hv in da.hv.values:
+            xr.testing.assert_allclose(
+                result.sel(hv=hv).drop_vars("hv").pint.dequantify(),
+                da.sel(hv=hv)
+                .drop_vars("hv")
+                .curvature(theta_par=0.5, eV=2.0)
+                .pint.dequantify(),
+            )
+
+    def test_curvature_lazy_data(self):
+        values = np.random.default_rng(0).random((4, 30, 20))
+        da = _simulate_fake_scan(values, dims=("hv", "eV", "theta_par"))
+        result = da.pint.chunk({"hv": 1, "eV": 10}).curvature(theta_par=0.5, eV=2.0)
+        xr.testing.assert_allclose(
+            result.compute().pint.dequantify(),
+            da.curvature(theta_par=0.5, eV=2.0).pint.dequantify(),
+        )
+
+    def test_curvature_requires_two_free_params_for_nd_data(self):
+        da = _simulate_fake_scan(np.ones((3, 10, 10)), dims=("hv", "eV", "theta_par"))
+        with pytest.raises(Exception, match="exactly two axes"):
+            da.curvature(eV=1.0)
+
 
 class TestMinGradient:
     def test_min_gradient_rejects_1D_data(self):
@@ -230,6 +259,14 @@ class TestMinGradient:
         result = da.min_gradient(theta_par=0.05, eV=0.5)
         assert result.shape == da.shape
 
+    def test_min_gradient_lazy_data(self):
+        values = np.random.default_rng(0).random((40, 30)) + 1
+        da = _simulate_fake_scan(values, dims=("eV", "theta_par"))
+        result = da.pint.chunk({"eV": 10}).min_gradient(theta_par=0.05, eV=0.5)
+        xr.testing.assert_allclose(
+            result.compute(), da.min_gradient(theta_par=0.05, eV=0.5)
+        )
+
 
 class TestDifferentiatePreservesUnits:
     def test_dEdk_preserves_units(self):
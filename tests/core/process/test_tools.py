@@ -1,3 +1,4 @@
+import dask.array as da
 import matplotlib
 import numpy as np
 import pint_xarray
@@ -141,6 +142,22 @@ class TestBgs:
         expected = disp - disp.mean("theta_par")
         xr.testing.assert_allclose(result, expected)
 
+    def test_substract_shirley_per_spectrum(self, fake_disp):
+        result = fake_disp.bgs("Shirley", num_avg=3, per_spectrum=True)
+        edc = fake_disp.isel(theta_par=0)
+        expected = edc.bgs("Shirley", num_avg=3)
+        assert result.dims == fake_disp.dims
+        assert result.data.units == fake_disp.data.units
+        xr.testing.assert_allclose(result.isel(theta_par=0), expected)
+
+    def test_substract_shirley_per_spectrum_with_empty_edc(self, fake_disp):
+        data = fake_disp.copy(deep=True)
+        data[{"theta_par": 1}] = 0 * data.data.units
+        result = data.bgs("Shirley", num_avg=3, per_spectrum=True)
+        expected = data.isel(theta_par=0).bgs("Shirley", num_avg=3)
+        assert (result.isel(theta_par=1).data.magnitude == 0).all()
+        xr.testing.assert_allclose(result.isel(theta_par=0), expected)
+
 
 class TestBinData:
     def test_bin_all_dims(self, fake_disp):
@@ -219,6 +236,18 @@ class TestSmooth:
             float(da.sum()), float(result.sum())
         )  # total intensity should be preserved ish
 
+    def test_smooth_lazy_data(self, fake_disp):
+        result = fake_disp.pint.chunk({"eV": 20}).smooth(eV=0.2, theta_par=0.5)
+        assert isinstance(result.data.magnitude, da.Array)
+        xr.testing.assert_allclose(
+            result.compute(), fake_disp.smooth(eV=0.2, theta_par=0.5)
+        )
+
+    def test_smooth_iir(self, fake_disp):
+        result = fake_disp.smooth(theta_par=5, method="iir")
+        expected = fake_disp.smooth(theta_par=5)
+        assert float(abs(result - expected).max()) < 0.05 * float(expected.max())
+
     def test_smooth_no_kwargs(self, fake_disp):
         with pytest.raises(
             Exception, match="Function requires axes to be smoothed over to be defined"
@@ -262,6 +291,14 @@ class TestRotate:
         np.testing.assert_array_equal(result.eV.values, da.eV.values)
         assert set(result.dims) == set(da.dims)
 
+    def test_rotate_lazy_data(self):
+        kx = np.linspace(-2, 2, 41)
+        values = np.random.default_rng(0).random((41, 41, 4))
+        da = _simulate_fake_scan(values, dims=("ky", "kx", "eV"), x=kx)
+        da["ky"] = kx
+        result = da.pint.chunk({"eV": 1}).rotate(25, kx=0.2, ky=0)
+        xr.testing.assert_allclose(result.compute(), da.rotate(25, kx=0.2, ky=0))
+
     def test_rotate_round_invalid_centre(self):
         kx = np.linspace(-5, 5, 51)
         ky = np.linspace(-5, 5, 51)
@@ -368,6 +405,20 @@ class TestSymNfold:
             atol=1e-2,
         )
 
+    def test_sym_nfold_batches_over_eV(self):
+        kx = np.linspace(-2, 2, 41)
+        values = np.random.default_rng(0).random((41, 41, 3))
+        da = _simulate_fake_scan(values, dims=("ky", "kx", "eV"), x=kx)
+        da["ky"] = kx
+        result = da.sym_nfold(nfold=6, kx=0, ky=0)
+        for eV in da.eV.values:
+            xr.testing.assert_allclose(
+                result.sel(eV=eV).drop_vars("eV"),
+                da.sel(eV=eV).drop_vars("eV").sym_nfold(nfold=6, kx=0, ky=0),
+            )
+        # Regions with data for only some rotations are averaged over those rotations
+        assert np.nanmax(result.pint.magnitude) <= 1
+
     def test_sym_nfold_expand_false_preserves_shape(self):
         da = _simulate_fake_scan(np.ones((10, 10)), dims=("ky", "kx"))
         result = da.sym_nfold(nfold=4, expand=False)
@@ -588,6 +639,28 @@ class TestSumSubtractData:
         ):
             _sum_or_subtract_data([fake_disp, fake_disp_2])
 
+    def test_sum_interpolation_matches_xarray(self, fake_disp):
+        offset_disp = fake_disp.assign_coords(theta_par=fake_disp.theta_par + 0.1)
+        result = _sum_or_subtract_data(
+            [fake_disp, offset_disp, offset_disp], _sum=True, quiet=True
+        )
+        interpolated = (
+            offset_disp.pint.dequantify().interp(theta_par=fake_disp.theta_par).values
+        )
+        np.testing.assert_allclose(
+            result.pint.magnitude, fake_disp.pint.magnitude + 2 * interpolated
+        )
+
+    def test_sum_lazy_data_without_modifying_inputs(self, fake_disp):
+        original = fake_disp.copy(deep=True)
+        lazy_disp = fake_disp.pint.chunk({"eV": 10})
+        result = _sum_or_subtract_data([fake_disp] + [lazy_disp] * 3, quiet=True)
+        np.testing.assert_allclose(result.pint.magnitude, 4 * original.pint.magnitude)
+        assert result.data.units == fake_disp.data.units
+        xr.testing.assert_identical(fake_disp, original)
+        assert len(fake_disp.history.get()) == len(original.history.get())
+        assert result.metadata.scan.name != fake_disp.metadata.scan.name
+
 
 class TestMergeData:
     # to-do: test merging two hv scans into one
@@ -627,6 +700,15 @@ class TestMergeData:
             result.max("eV").mean().values, da1.max("eV").mean().values
         )
 
+    def test_merge_along_eV(self):
+        eV = np.linspace(100, 110, 101)
+        XPS_1 = _simulate_fake_scan(np.ones(101), dims=("eV",), y=eV)
+        XPS_2 = _simulate_fake_scan(np.ones(101), dims=("eV",), y=eV + 5)
+        result = merge_data([XPS_1, XPS_2], dim="eV")
+        assert float(result.eV.min()) == pytest.approx(100)
+        assert float(result.eV.max()) == pytest.approx(115)
+        np.testing.assert_allclose(result.pint.magnitude, 1)
+
     def test_merge_invalid_dim(self, da1):
         with pytest.raises(
             Exception, match="is not a valid dimension of the inputted data"
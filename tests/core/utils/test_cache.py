@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from peaks.core.options import opts
+from peaks.core.utils.cache import clear_cache, peaks_cached
+
+CALLS = []
+
+
+@peaks_cached
+def _scale(data, factor=2, offset=None):
+    CALLS.append(factor)
+    result = data * factor
+    result.attrs = data.attrs.copy()
+    result.history.add(f"Scaled by {factor}")
+    return result
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with opts:
+        opts.Cache.set(enabled=True, path=str(tmp_path / "cache"))
+        CALLS.clear()
+        yield opts.Cache
+
+
+@pytest.fixture
+def data():
+    return xr.DataArray(
+        np.arange(12.0).reshape(3, 4),
+        dims=("eV", "theta_par"),
+        coords={"eV": [0.0, 0.1, 0.2], "theta_par": np.linspace(-1, 1, 4)},
+        attrs={"hv": 21.2},
+        name="disp",
+    )
+
+
+class TestPeaksCached:
+    def test_result_is_cached(self, cache, data):
+        first = _scale(data, 3)
+        second = _scale(data, factor=3)
+
+        assert CALLS == [3]
+        xr.testing.assert_identical(first.drop_attrs(), second.drop_attrs())
+        assert second.attrs["hv"] == 21.2
+        assert second.history.get(return_history=True)[-1]["record"] == "Scaled by 3"
+
+    def test_changed_inputs_are_recomputed(self, cache, data):
+        _scale(data, 3)
+        _scale(data, 4)
+        _scale(data.assign_coords(eV=[0.0, 0.2, 0.4]), 3)
+        _scale(data.assign_attrs(hv=40.0), 3)
+        _scale(data + 1, 3)
+
+        assert CALLS == [3, 4, 3, 3, 3]
+
+    def test_modified_lazy_inputs_are_recomputed(self, cache, data, tmp_path):
+        from peaks.core.metadata.base_metadata_models import BaseScanMetadataModel
+
+        # Lazy data loaded from a file
+        fpath = tmp_path / "disp.ibw"
+        fpath.write_bytes(b"data")
+        data.attrs["_scan"] = BaseScanMetadataModel(
+            name="disp",
+            filepath=str(fpath),
+            loc="St Andrews",
+            timestamp="2000-01-06 00:00:00",
+        )
+        lazy = data.chunk({"eV": 1})
+        first = _scale(lazy, 3)
+        cached = _scale(lazy, 3)
+        # Modified lazy data keep the attrs (and add no history record), but must not share the cached result
+        shifted = _scale(lazy + 5, 3)
+        masked = _scale(lazy.where(lazy > 4), 3)
+
+        assert CALLS == [3, 3, 3]
+        xr.testing.assert_allclose(cached.compute(), first.compute())
+        xr.testing.assert_allclose(shifted.compute(), (data + 5) * 3)
+        xr.testing.assert_allclose(masked.compute(), data.where(data > 4) * 3)
+
+    def test_disabled_cache_is_not_used(self, cache, data):
+        cache.enabled = False
+        _scale(data)
+        _scale(data)
+
+        assert CALLS == [2, 2]
+        assert not os.path.exists(cache.path)
+
+    def test_unhashable_arguments_are_not_cached(self, cache, data):
+        _scale(data, offset=object())
+        _scale(data, offset=object())
+
+        assert CALLS == [2, 2]
+
+    def test_lru_eviction(self, cache, data):
+        _scale(data, 1)
+        entry_size = sum(
+            os.path.getsize(os.path.join(root, file))
+            for root, _, files in os.walk(cache.path)
+            for file in files
+        )
+        cache.max_size = int(2.5 * entry_size)
+        _scale(data, 2)
+        _scale(data, 1)  # Mark the first entry as recently used
+        _scale(data, 3)  # Should evict the second entry
+        _scale(data, 1)
+        _scale(data, 2)
+
+        assert CALLS == [1, 2, 3, 2]
+
+    def test_clear_cache(self, cache, data):
+        _scale(data)
+        clear_cache()
+        _scale(data)
+
+        assert CALLS == [2, 2]
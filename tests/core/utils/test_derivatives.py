@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from peaks.core.utils.derivatives import (
+    curvature_2d,
+    mixed_derivative,
+    second_derivative,
+)
+
+
+@pytest.fixture
+def stack():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.random(40))  # Non-uniform spacing
+    y = np.linspace(-1, 1, 50)
+    return rng.random((3, 40, 50)), x, y
+
+
+def test_second_derivative_matches_numpy(stack):
+    data, _, y = stack
+    expected = np.gradient(np.gradient(data, y, axis=-1), y, axis=-1)
+    np.testing.assert_allclose(second_derivative(data, y), expected, atol=1e-9)
+
+
+def test_mixed_derivative_matches_numpy(stack):
+    data, x, y = stack
+    expected = np.gradient(np.gradient(data, x, axis=-2), y, axis=-1)
+    np.testing.assert_allclose(
+        mixed_derivative(data, x, y), expected, rtol=1e-12, atol=1e-9
+    )
+
+
+def test_curvature_matches_unfused_expression(stack):
+    data, x, y = stack
+    Cx, Cy = 0.3, 2.0
+    dx = np.gradient(data, x, axis=-2)
+    dy = np.gradient(data, y, axis=-1)
+    d2x = np.gradient(dx, x, axis=-2)
+    d2y = np.gradient(dy, y, axis=-1)
+    dxdy = np.gradient(dx, y, axis=-1)
+    expected = (
+        (1 + Cx * dx**2) * Cy * d2y
+        - 2 * Cx * Cy * dx * dy * dxdy
+        + (1 + Cy * dy**2) * Cx * d2x
+    ) / (1 + Cx * dx**2 + Cy * dy**2) ** 1.5
+    np.testing.assert_allclose(
+        curvature_2d(data, x, y, Cx, Cy), expected, rtol=1e-10, atol=1e-10
+    )
+
+
+def test_too_few_points_raises():
+    with pytest.raises(ValueError, match="at least 2 elements"):
+        second_derivative(np.ones((3, 1)), np.zeros(1))
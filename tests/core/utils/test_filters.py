@@ -0,0 +1,55 @@
+import dask.array as da
+import numpy as np
+import pytest
+from scipy.ndimage import gaussian_filter, gaussian_gradient_magnitude
+
+from peaks.core.utils import filters
+from peaks.core.utils.filters import gaussian_filter_nd, gaussian_gradient_magnitude_nd
+
+
+@pytest.fixture
+def cube():
+    return np.random.default_rng(0).random((40, 50, 30))
+
+
+class TestGaussianFilterND:
+    def test_dask_matches_scipy(self, cube):
+        sigma = (2.0, 0.3, 5.0)
+        lazy = da.from_array(cube, chunks=(10, 20, 10))
+        result = gaussian_filter_nd(lazy, sigma)
+        assert isinstance(result, da.Array)
+        np.testing.assert_allclose(
+            result.compute(), gaussian_filter(cube, sigma), atol=1e-12
+        )
+
+    def test_parallel_chunks_match_scipy(self, cube, monkeypatch):
+        monkeypatch.setattr(filters, "_PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(filters.os, "cpu_count", lambda: 4)
+        sigma = (1.0, 3.0, 0.0)
+        np.testing.assert_allclose(
+            gaussian_filter_nd(cube, sigma), gaussian_filter(cube, sigma), atol=1e-12
+        )
+
+    def test_iir_approximates_gaussian(self):
+        x = np.linspace(-50, 50, 401)
+        data = np.exp(-(x**2) / 200) + (np.abs(x) < 10)
+        for sigma in [3.0, 10.0, 30.0]:
+            result = gaussian_filter_nd(data, sigma, method="iir")
+            expected = gaussian_filter(data, sigma)
+            np.testing.assert_allclose(result, expected, atol=0.03 * expected.max())
+            assert result.sum() == pytest.approx(expected.sum(), rel=1e-3)
+
+    def test_unknown_method(self, cube):
+        with pytest.raises(ValueError, match="Unknown method"):
+            gaussian_filter_nd(cube, 1.0, method="fft")
+
+
+class TestGaussianGradientMagnitudeND:
+    def test_dask_matches_scipy(self, cube):
+        sigma = (1.5, 2.0, 0.5)
+        lazy = da.from_array(cube, chunks=(15, 25, 30))
+        np.testing.assert_allclose(
+            gaussian_gradient_magnitude_nd(lazy, sigma).compute(),
+            gaussian_gradient_magnitude(cube, sigma),
+            atol=1e-12,
+        )
@@ -3,6 +3,8 @@ import pytest
 from scipy import interpolate
 
 from peaks.core.utils.interpolation import (
+    _apply_bilinear_plans,
+    _bilinear_rectilinear_plan,
     _fast_bilinear_interpolate,
     _fast_bilinear_interpolate_rectilinear,
     _fast_trilinear_interpolate,
@@ -368,3 +370,46 @@ class TestFastBilinearInterpolate:
         valid = ~np.isnan(result_rect) & ~np.isnan(result)
         assert valid.sum() > 0.95 * result.size
         np.testing.assert_array_almost_equal(result_rect[valid], result[valid])
+
+
+class TestBilinearPlans:
+    @pytest.mark.parametrize("flip", [False, True])
+    def test_matches_rectilinear_interpolation(self, sincos_2D, flip):
+        x, y, values_2D, x_prime, y_prime, XP, YP, expected_2D = sincos_2D
+        if flip:  # Decreasing coordinates
+            x, values_2D = x[::-1], values_2D[::-1]
+        stack = np.stack([values_2D, 2 * values_2D])
+
+        plan = _bilinear_rectilinear_plan(XP, YP, x, y)
+        result, n_valid = _apply_bilinear_plans(
+            stack.reshape(2, -1), *(p[None] for p in plan[:3]), *plan[3:], False
+        )
+        expected = _fast_bilinear_interpolate_rectilinear(
+            XP, YP, x, y, values_2D
+        ).ravel()
+        # Unlike the rectilinear interpolation, positions just outside of the grid are not extrapolated
+        valid = ~np.isnan(expected) & (n_valid[0] == 1)
+        assert valid.sum() > 0.95 * expected.size
+        assert np.isnan(result[0][n_valid[0] == 0]).all()
+        np.testing.assert_allclose(result[0][valid], expected[valid], atol=1e-12)
+        np.testing.assert_allclose(result[1][valid], 2 * expected[valid], atol=1e-12)
+
+    def test_sums_plans_skipping_nan(self):
+        x = np.linspace(0, 1, 11)
+        values = np.ones((1, 11 * 11))
+        inside = _bilinear_rectilinear_plan(np.full(3, 0.55), np.full(3, 0.5), x, x)
+        outside = _bilinear_rectilinear_plan(
+            np.array([0.55, 2.0, 2.0]), np.full(3, 0.5), x, x
+        )
+        index, frac_dim0, frac_dim1 = (
+            np.stack([inside[i], outside[i]]) for i in range(3)
+        )
+        result, n_valid = _apply_bilinear_plans(
+            values, index, frac_dim0, frac_dim1, *inside[3:], True
+        )
+        np.testing.assert_allclose(result[0], [2, 1, 1])
+        np.testing.assert_array_equal(n_valid[0], [2, 1, 1])
+        result, _ = _apply_bilinear_plans(
+            values, index, frac_dim0, frac_dim1, *inside[3:], False
+        )
+        np.testing.assert_array_equal(np.isnan(result[0]), [False, True, True])